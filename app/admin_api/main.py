@@ -1,24 +1,30 @@
 # File: app/admin_api/main.py
-# Version: v0.2.0
-# Changes: add /api/runtime endpoint
-# Purpose: FastAPI Admin API entrypoint (help + settings + runtime)
+# Version: v0.3.0
+# Changes: add /api/runtime endpoint; /api/leads delivery endpoints; gzip responses
+# Purpose: FastAPI Admin API entrypoint (help + settings + runtime + leads)
 
 from __future__ import annotations
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.admin_api.routes.help import router as help_router
+from app.admin_api.routes.leads import router as leads_router
 from app.admin_api.routes.settings import router as settings_router
 from app.admin_api.routes.runtime import router as runtime_router
 
 app = FastAPI(
     title="AI Classifieds Parser - Admin API",
-    version="v0.2.0",
+    version="v0.3.0",
 )
 
+# clients sending Accept-Encoding: gzip get compressed bodies (streamed NDJSON claims included)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(help_router)
 app.include_router(settings_router)
 app.include_router(runtime_router)
+app.include_router(leads_router)
 
 
 @app.get("/healthz", tags=["health"])
@@ -0,0 +1,121 @@
+# File: app/admin_api/routes/leads.py
+# Version: v0.1.1
+# Changes: concurrent long-poll claims capped per process (429 beyond LEADS_MAX_LONG_POLLS)
+# Purpose: lead delivery endpoints for CRM clients (long-poll claim streamed as NDJSON, batch ack/fail)
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.admin_api.auth import ActorContext, require_min_role
+from app.core.config import LEADS_MAX_LONG_POLLS
+from app.admin_api.schemas import LeadAckIn, LeadAckOut, LeadFailIn, LeadPendingOut
+from app.services.leads.queue_repo import ClaimedLead, LeadsQueueRepo
+
+router = APIRouter(prefix="/api/leads", tags=["leads"])
+
+NDJSON = "application/x-ndjson"
+MAX_CLAIM = 10_000
+MAX_WAIT_S = 30.0
+_LINES_PER_CHUNK = 200  # leads per body chunk (fewer, larger writes; gzip compresses across them)
+
+# a waiting claim blocks a threadpool worker for up to MAX_WAIT_S: beyond the cap clients get 429
+_long_polls = threading.BoundedSemaphore(LEADS_MAX_LONG_POLLS)
+
+
+def get_leads_repo() -> LeadsQueueRepo:
+    """
+    Dependency (tests/load tools override it). Repos share the process-wide pool and notifier.
+    """
+    return LeadsQueueRepo()
+
+
+def _lead_line(lead: ClaimedLead) -> str:
+    return json.dumps(
+        {
+            "lead_id": lead.lead_id,
+            "created_at_utc": lead.created_at_utc.isoformat(),
+            "expires_at_utc": lead.expires_at_utc.isoformat(),
+            "payload": lead.payload,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _ndjson(claim_token: str, count: int, leads: Iterator[ClaimedLead]) -> Iterator[bytes]:
+    yield (json.dumps({"claim_token": claim_token, "count": count}) + "\n").encode("utf-8")
+    buf = []
+    for lead in leads:
+        buf.append(_lead_line(lead))
+        if len(buf) >= _LINES_PER_CHUNK:
+            yield ("\n".join(buf) + "\n").encode("utf-8")
+            buf.clear()
+    if buf:
+        yield ("\n".join(buf) + "\n").encode("utf-8")
+
+
+@router.post("/{tenant_id}/claim")
+def claim_leads(
+    tenant_id: str,
+    limit: int = Query(default=100, ge=1, le=MAX_CLAIM),
+    wait_seconds: float = Query(default=0.0, ge=0.0, le=MAX_WAIT_S),
+    repo: LeadsQueueRepo = Depends(get_leads_repo),
+    actor: ActorContext = Depends(require_min_role("system")),
+) -> StreamingResponse:
+    """
+    Claims up to `limit` NEW leads (FIFO). With wait_seconds the request long-polls until leads
+    arrive. Body (NDJSON): first line {"claim_token", "count"}, then one lead per line, read from
+    the database while the response is being sent. The claim token is also in X-Claim-Token.
+    At most LEADS_MAX_LONG_POLLS claims wait at once per process; another waiting claim gets 429.
+    """
+    waiting = wait_seconds > 0
+    if waiting and not _long_polls.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Too many waiting claims", headers={"Retry-After": "1"})
+    try:
+        claim_token, count, leads = repo.claim_stream(tenant_id=tenant_id, limit=limit, wait_seconds=wait_seconds)
+    finally:
+        if waiting:
+            _long_polls.release()
+    return StreamingResponse(
+        _ndjson(claim_token, count, leads),
+        media_type=NDJSON,
+        headers={"X-Claim-Token": claim_token, "X-Lead-Count": str(count)},
+    )
+
+
+@router.post("/{tenant_id}/ack", response_model=LeadAckOut)
+def ack_leads(
+    tenant_id: str,
+    body: LeadAckIn,
+    repo: LeadsQueueRepo = Depends(get_leads_repo),
+    actor: ActorContext = Depends(require_min_role("system")),
+) -> LeadAckOut:
+    n = repo.ack_delivered(tenant_id=tenant_id, claim_token=body.claim_token, lead_ids=body.lead_ids)
+    return LeadAckOut(requested=len(body.lead_ids), updated=n)
+
+
+@router.post("/{tenant_id}/fail", response_model=LeadAckOut)
+def fail_leads(
+    tenant_id: str,
+    body: LeadFailIn,
+    repo: LeadsQueueRepo = Depends(get_leads_repo),
+    actor: ActorContext = Depends(require_min_role("system")),
+) -> LeadAckOut:
+    n = repo.mark_failed_many(tenant_id=tenant_id, claim_token=body.claim_token, lead_ids=body.lead_ids, error=body.error)
+    return LeadAckOut(requested=len(body.lead_ids), updated=n)
+
+
+@router.get("/{tenant_id}/pending", response_model=LeadPendingOut)
+def pending_leads(
+    tenant_id: str,
+    repo: LeadsQueueRepo = Depends(get_leads_repo),
+    actor: ActorContext = Depends(require_min_role("system")),
+) -> LeadPendingOut:
+    return LeadPendingOut(tenant_id=tenant_id, pending=repo.pending_count(tenant_id=tenant_id))
+
+# END_OF_FILE
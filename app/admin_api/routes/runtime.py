@@ -1,5 +1,6 @@
 # File: app/admin_api/routes/runtime.py
-# Version: v0.1.0
+# Version: v0.1.1
+# Changes: shared Postgres pool metrics (size, waits, health-check failures)
 # Purpose: runtime info endpoints (deployment mode, config path)
 
 from __future__ import annotations
@@ -8,6 +9,7 @@ from fastapi import APIRouter
 
 from app.core.deployment import get_deployment_mode
 from app.core.runtime_config import DEFAULT_CONFIG_PATH
+from app.services.storage.pg_pool import pool_stats
 
 router = APIRouter(prefix="/api/runtime", tags=["runtime"])
 
@@ -18,6 +20,7 @@ def runtime_info() -> dict:
     return {
         "deployment_mode": mode,
         "config_path": DEFAULT_CONFIG_PATH,
+        "pg_pools": pool_stats(),
     }
 
 # END_OF_FILE
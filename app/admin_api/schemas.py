@@ -1,5 +1,6 @@
 # File: app/admin_api/schemas.py
-# Version: v0.1.0
+# Version: v0.1.1
+# Changes: lead delivery request/response schemas (ack/fail batches)
 # Purpose: API schemas for admin panel responses
 
 from __future__ import annotations
@@ -35,4 +36,26 @@ class PageHelpOut(BaseModel):
     runbook: List[str] = Field(default_factory=list)
     fields: List[FieldHelpOut] = Field(default_factory=list)
 
+# bounds a single ack/fail request (one UPDATE ... ANY(ids)); CRMs ack claims in batches of this size
+MAX_LEAD_IDS_PER_REQUEST = 50_000
+
+
+class LeadAckIn(BaseModel):
+    claim_token: str = Field(min_length=1, max_length=64)
+    lead_ids: List[str] = Field(min_length=1, max_length=MAX_LEAD_IDS_PER_REQUEST)
+
+
+class LeadFailIn(LeadAckIn):
+    error: str = Field(min_length=1, max_length=500)
+
+
+class LeadAckOut(BaseModel):
+    requested: int
+    updated: int  # leads still CLAIMED under claim_token (others were released, expired or already acked)
+
+
+class LeadPendingOut(BaseModel):
+    tenant_id: str
+    pending: int
+
 # END_OF_FILE
@@ -1,5 +1,7 @@
 # File: app/core/config.py
-# Version: v0.1.0
+# Version: v0.1.5
+# Changes: vendor-feed blacklist bloom filter sizing; phone normalize+hash LRU size; default phone region;
+#          shared Postgres connection pool sizing; cap on concurrent lead claim long-polls
 # Purpose: runtime config (tenant salt, data paths)
 
 from __future__ import annotations
@@ -14,4 +16,24 @@ LISTS_DIR = DATA_DIR / "lists"
 
 TENANT_SALT = os.environ.get("AICP_TENANT_SALT", "dev-tenant-salt-change-me")
 
+# VENDOR_FEED blacklist: Bloom filter sizing (expected phone hashes, target false-positive rate)
+VENDOR_BLOOM_CAPACITY = int(os.environ.get("AICP_VENDOR_BLOOM_CAPACITY", "10000000"))
+VENDOR_BLOOM_FP_RATE = float(os.environ.get("AICP_VENDOR_BLOOM_FP_RATE", "0.001"))
+
+# raw phone -> (e164, phone_hash) LRU entries per tenant salt (0 disables caching)
+PHONE_CACHE_SIZE = int(os.environ.get("AICP_PHONE_CACHE_SIZE", "200000"))
+
+# region used to read phones written without "+" (key of app.core.normalize.PHONE_REGIONS)
+PHONE_DEFAULT_REGION = os.environ.get("AICP_PHONE_REGION", "UA").strip().upper()
+
+# shared Postgres connection pool (per DSN, per process): size, acquire timeout, idle health check / close
+PG_POOL_MIN_SIZE = int(os.environ.get("AICP_PG_POOL_MIN_SIZE", "1"))
+PG_POOL_MAX_SIZE = int(os.environ.get("AICP_PG_POOL_MAX_SIZE", "10"))
+PG_POOL_TIMEOUT_S = float(os.environ.get("AICP_PG_POOL_TIMEOUT_S", "30"))
+PG_POOL_CHECK_IDLE_S = float(os.environ.get("AICP_PG_POOL_CHECK_IDLE_S", "30"))
+PG_POOL_MAX_IDLE_S = float(os.environ.get("AICP_PG_POOL_MAX_IDLE_S", "600"))
+
+# lead claims waiting (wait_seconds > 0) at the same time, per process; each holds a threadpool worker
+LEADS_MAX_LONG_POLLS = int(os.environ.get("AICP_LEADS_MAX_LONG_POLLS", "16"))
+
 # END_OF_FILE
@@ -1,31 +1,157 @@
 # File: app/core/normalize.py
-# Version: v0.1.0
+# Version: v0.2.0
+# Changes: country-aware normalize_phone_e164 (country codes, trunk/international prefixes from precompiled
+#          region tables), normalize_many() for bulk imports
 # Purpose: normalization helpers (phones, names, etc.)
 
 from __future__ import annotations
 
 import re
-from typing import Optional
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
 
+from app.core.config import PHONE_DEFAULT_REGION
 
-def normalize_phone_e164(phone_raw: Optional[str]) -> Optional[str]:
+
+class PhoneRegion(NamedTuple):
+    country_code: str
+    trunk_prefix: str                # national dialing prefix, dropped in E.164 ("" = none)
+    national_lengths: FrozenSet[int]  # digits after the country code
+    intl_prefixes: Tuple[str, ...]   # dialed before a foreign country code instead of "+"
+
+
+# markets we crawl; extend here (code + tests), nothing is read at call time
+PHONE_REGIONS: Dict[str, PhoneRegion] = {
+    "UA": PhoneRegion("380", "0", frozenset({9}), ("00",)),
+    "RU": PhoneRegion("7", "8", frozenset({10}), ("810", "00")),
+    "KZ": PhoneRegion("7", "8", frozenset({10}), ("810", "00")),
+    "BY": PhoneRegion("375", "80", frozenset({9}), ("810", "00")),
+    "PL": PhoneRegion("48", "", frozenset({9}), ("00",)),
+    "MD": PhoneRegion("373", "0", frozenset({8}), ("00",)),
+    "GE": PhoneRegion("995", "0", frozenset({9}), ("00",)),
+}
+
+
+class _RegionRule(NamedTuple):
+    cc: str
+    full_lengths: FrozenSet[int]   # len(cc) + national length
+    trunk: str
+    trunk_lengths: FrozenSet[int]  # len(trunk) + national length
+    national_lengths: FrozenSet[int]
+    intl_prefixes: Tuple[str, ...]
+
+
+def _compile() -> Tuple[Dict[str, _RegionRule], Dict[str, FrozenSet[int]]]:
+    rules: Dict[str, _RegionRule] = {}
+    cc_lengths: Dict[str, set] = {}
+    for name, r in PHONE_REGIONS.items():
+        rules[name] = _RegionRule(
+            cc=r.country_code,
+            full_lengths=frozenset(len(r.country_code) + n for n in r.national_lengths),
+            trunk=r.trunk_prefix,
+            trunk_lengths=frozenset(len(r.trunk_prefix) + n for n in r.national_lengths) if r.trunk_prefix else frozenset(),
+            national_lengths=r.national_lengths,
+            intl_prefixes=r.intl_prefixes,
+        )
+        cc_lengths.setdefault(r.country_code, set()).update(len(r.country_code) + n for n in r.national_lengths)
+    return rules, {cc: frozenset(v) for cc, v in cc_lengths.items()}
+
+
+_RULES, _CC_LENGTHS = _compile()
+_CC_SIZES = sorted({len(cc) for cc in _CC_LENGTHS}, reverse=True)  # longest country code first
+
+# common phone punctuation is removed with str.replace (much cheaper than str.translate or a
+# regex per call); anything else left over goes through the regex
+_NON_DIGITS = re.compile(r"\D+")
+
+_E164_MIN, _E164_MAX = 8, 15
+
+
+def _known_cc(digits: str) -> bool:
+    """
+    digits start with a country code from the tables and have that country's length.
     """
-    Minimal placeholder (country-agnostic):
-    - keep digits only
-    - strip leading zeros
-    - if plausible length -> return "+<digits>"
+    n = len(digits)
+    for size in _CC_SIZES:
+        lengths = _CC_LENGTHS.get(digits[:size])
+        if lengths is not None:
+            return n in lengths
+    return False
+
 
-    NOTE: real implementation should be country-aware (region rules).
+def _rule(region: str) -> _RegionRule:
+    rule = _RULES.get(region)
+    if rule is None:
+        raise ValueError(f"unknown phone region {region!r} (known: {sorted(_RULES)})")
+    return rule
+
+
+def _normalize(phone_raw: str, rule: _RegionRule) -> Optional[str]:
+    s = phone_raw.strip().replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    intl = s.startswith("+")
+    if intl:
+        s = s[1:]
+    if not (s.isascii() and s.isdigit()):
+        s = _NON_DIGITS.sub("", s)
+        if not s:
+            return None
+    n = len(s)
+
+    if intl:
+        return "+" + s if _known_cc(s) or _E164_MIN <= n <= _E164_MAX else None
+
+    # 1) own country code written without "+": 380991234567
+    if n in rule.full_lengths and s.startswith(rule.cc):
+        return "+" + s
+    # 2) international dialing prefix: 00 48 ..., 810 380 ...
+    for p in rule.intl_prefixes:
+        if s.startswith(p) and _known_cc(s[len(p):]):
+            return "+" + s[len(p):]
+    # 3) national format with trunk prefix: 0991234567, 8 916 ...
+    if rule.trunk and n in rule.trunk_lengths and s.startswith(rule.trunk):
+        return "+" + rule.cc + s[len(rule.trunk):]
+    # 4) national significant number only: 991234567
+    if n in rule.national_lengths:
+        return "+" + rule.cc + s
+    # 5) another tabled country without "+"
+    if _known_cc(s):
+        return "+" + s
+    # 6) unknown market: pre-v0.2.0 behaviour (digits, leading zeros stripped)
+    s = s.lstrip("0")
+    return "+" + s if 9 <= len(s) <= _E164_MAX else None
+
+
+def normalize_phone_e164(phone_raw: Optional[str], *, region: str = PHONE_DEFAULT_REGION) -> Optional[str]:
+    """
+    Raw phone -> E.164 ("+380991234567") or None.
+
+    `region` (ISO 3166 alpha-2, a key of PHONE_REGIONS) decides how numbers without "+" are read:
+    own country code, international prefix (00/810), trunk prefix (0/8) or bare national number.
+    Numbers with "+" keep their country code. Numbers that fit no table fall back to the
+    country-agnostic rule (digits only, leading zeros stripped, >= 9 digits).
     """
     if not phone_raw:
         return None
-    digits = re.sub(r"\D+", "", phone_raw)
-    if not digits:
-        return None
-    digits = digits.lstrip("0")
-    if len(digits) < 9:
-        return None
-    return "+" + digits
+    return _normalize(phone_raw, _rule(region))
+
+
+def normalize_many(phones_raw: Iterable[Optional[str]], *, region: str = PHONE_DEFAULT_REGION) -> List[Optional[str]]:
+    """
+    Batch variant for imports: region rule resolved once, repeated raw values normalized once.
+    Output order == input order.
+    """
+    rule = _rule(region)
+    seen: Dict[str, Optional[str]] = {}
+    out: List[Optional[str]] = []
+    append = out.append
+    for raw in phones_raw:
+        if not raw:
+            append(None)
+            continue
+        v = seen.get(raw, seen)
+        if v is seen:
+            v = seen[raw] = _normalize(raw, rule)
+        append(v)  # type: ignore[arg-type]
+    return out
 
 
 def normalize_name(name_raw: Optional[str]) -> Optional[str]:
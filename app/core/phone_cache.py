@@ -0,0 +1,112 @@
+# File: app/core/phone_cache.py
+# Version: v0.1.0
+# Purpose: bounded, thread-safe LRU memo over normalize_phone_e164 + phone_hash_e164 (keyed by the raw phone string)
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import PHONE_CACHE_SIZE, TENANT_SALT
+from app.core.crypto import phone_hash_e164
+from app.core.normalize import normalize_phone_e164
+
+# (phone_e164, phone_hash); both None when the raw value does not normalize
+PhoneKey = Tuple[Optional[str], Optional[str]]
+
+_NONE: PhoneKey = (None, None)
+
+
+class PhoneHashCache:
+    """
+    One cache per tenant salt: the salt is fixed per instance, so a hash computed under one
+    tenant is never served to another (get_phone_cache() keeps the per-salt registry).
+
+    Raw strings are cached as-is: "+380 99 123" and "099123..." are separate entries that map
+    to the same result. Failed normalizations are cached too (junk phones repeat as well).
+
+    All access goes through one lock (OrderedDict.move_to_end is not atomic with the lookup);
+    the critical section is a dict probe, far cheaper than the re.sub + sha256 it replaces.
+    """
+
+    def __init__(self, *, maxsize: int = PHONE_CACHE_SIZE, tenant_salt: str = TENANT_SALT) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.tenant_salt = tenant_salt
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, PhoneKey]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compute(self, phone_raw: str) -> PhoneKey:
+        phone_e164 = normalize_phone_e164(phone_raw)
+        if not phone_e164:
+            return _NONE
+        return phone_e164, phone_hash_e164(phone_e164, tenant_salt=self.tenant_salt)
+
+    def lookup(self, phone_raw: Optional[str]) -> PhoneKey:
+        """
+        raw phone -> (phone_e164, phone_hash), same results as calling the two functions directly.
+        """
+        if not phone_raw:
+            return _NONE
+        with self._lock:
+            v = self._data.get(phone_raw)
+            if v is not None:
+                self._data.move_to_end(phone_raw)
+                self.hits += 1
+                return v
+            self.misses += 1
+        # computed outside the lock: two threads may race on one miss, both get the same value
+        v = self._compute(phone_raw)
+        if self.maxsize:
+            with self._lock:
+                self._data[phone_raw] = v
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return v
+
+    def phone_hash(self, phone_raw: Optional[str]) -> Optional[str]:
+        return self.lookup(phone_raw)[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_caches: Dict[str, PhoneHashCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_phone_cache(tenant_salt: str = TENANT_SALT) -> PhoneHashCache:
+    """
+    Process-wide cache for a tenant salt (created on first use, size from AICP_PHONE_CACHE_SIZE).
+    """
+    cache = _caches.get(tenant_salt)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(tenant_salt, PhoneHashCache(tenant_salt=tenant_salt))
+    return cache
+
+# END_OF_FILE
@@ -1,13 +1,17 @@
 # File: app/main.py
-# Version: v0.1.1
-# Changes: integrate whitelist/blacklist matching into decide()
+# Version: v0.2.2
+# Changes:
+#  - integrate whitelist/blacklist matching into decide()
+#  - add process_batch() (batch canonize -> identity -> decide, shared guards/meta)
+#  - phone normalize+hash through the shared LRU (app.core.phone_cache)
+#  - identity_cluster(_batch) accept an IdentityEngine (multi-signal incremental clustering)
 # Purpose: smoke pipeline (raw -> canon -> identity -> decision)
 
 from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.contracts import (
     Decision,
@@ -22,8 +26,9 @@ from app.core.contracts import (
     Meta,
     guard_iface,
 )
-from app.core.crypto import phone_hash_e164
-from app.core.normalize import normalize_name, normalize_phone_e164
+from app.core.normalize import normalize_name
+from app.core.phone_cache import get_phone_cache
+from app.services.identity.engine import IdentityEngine
 from app.services.lists.blacklist_store import BlacklistStore
 from app.services.lists.whitelist_store import WhitelistStore
 
@@ -40,27 +45,22 @@ IFACE_DECISION_ID = "IFACE-DECISION-001"
 IFACE_DECISION_VER = "v0.1.0"
 
 
-def canonize(raw_pkt: ListingRawPacket) -> ListingCanonicalPacket:
-    guard_iface(raw_pkt.meta, IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER, mode="STRICT")
-
-    r = raw_pkt.data
-    listing_uid = f"{r.source}:{r.source_listing_id}"
+def _to_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if not dt:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
-    phone_e164 = normalize_phone_e164(r.phone_raw)
-    phone_hash = phone_hash_e164(phone_e164)
 
-    pub_utc: Optional[datetime] = None
-    if r.published_at:
-        pub_utc = r.published_at.astimezone(timezone.utc) if r.published_at.tzinfo else r.published_at.replace(tzinfo=timezone.utc)
-
-    canon = ListingCanonical(
-        listing_uid=listing_uid,
+def _canonical_from_raw(r: ListingRaw) -> ListingCanonical:
+    phone_e164, phone_hash = get_phone_cache().lookup(r.phone_raw)
+    return ListingCanonical(
+        listing_uid=f"{r.source}:{r.source_listing_id}",
         source=r.source,
         source_listing_id=r.source_listing_id,
         url=r.url,
         title=r.title or "",
         description=r.description or "",
-        published_at_utc=pub_utc,
+        published_at_utc=_to_utc(r.published_at),
         price=r.price,
         currency=r.currency,
         phone_e164=phone_e164,
@@ -68,6 +68,63 @@ def canonize(raw_pkt: ListingRawPacket) -> ListingCanonicalPacket:
         contact_name_norm=normalize_name(r.contact_name),
     )
 
+
+def _phone_cluster(phone_hash: Optional[str]) -> Tuple[Optional[str], float]:
+    if not phone_hash:
+        return None, 0.0
+    return "cl_" + phone_hash[:16], 0.95
+
+
+def _identity_for(c: ListingCanonical, engine: Optional[IdentityEngine] = None) -> IdentityResult:
+    if engine is not None:
+        return engine.assign(c)
+    cluster_id, confidence = _phone_cluster(c.phone_hash)
+    signals = ["PHONE_HASH_PRESENT"] if cluster_id else []
+    return IdentityResult(cluster_id=cluster_id, confidence=confidence, signals=signals)
+
+
+def _baseline_decision(cluster_id: Optional[str], confidence: float) -> Decision:
+    evidence = []
+    if cluster_id and confidence >= 0.9:
+        evidence.append(f"cluster_id={cluster_id} conf={confidence}")
+    return Decision(action=DecisionAction.ALLOW, risk_score=0.05, reasons=["BASELINE_OK"], evidence=evidence)
+
+
+def _decision_for(
+    listing: ListingCanonical,
+    ident: IdentityResult,
+    *,
+    blacklist: Optional[BlacklistStore],
+    whitelist: Optional[WhitelistStore],
+) -> Decision:
+    reasons = []
+    evidence = []
+
+    # 1) Whitelist wins (internal agents)
+    if whitelist:
+        w = whitelist.match_listing(listing)
+        if w.matched:
+            reasons.extend(w.reasons)
+            evidence.extend(w.evidence)
+            return Decision(action=DecisionAction.ALLOW, risk_score=0.0, reasons=reasons, evidence=evidence)
+
+    # 2) Blacklist blocks
+    if blacklist:
+        b = blacklist.match_listing(listing)
+        if b.matched:
+            reasons.extend(b.reasons)
+            evidence.extend(b.evidence)
+            return Decision(action=DecisionAction.BLOCK, risk_score=1.0, reasons=reasons, evidence=evidence)
+
+    # 3) Baseline fallback (MVP)
+    return _baseline_decision(ident.cluster_id, ident.confidence)
+
+
+def canonize(raw_pkt: ListingRawPacket) -> ListingCanonicalPacket:
+    guard_iface(raw_pkt.meta, IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER, mode="STRICT")
+
+    canon = _canonical_from_raw(raw_pkt.data)
+
     meta = Meta.now(
         iface_id=IFACE_PROCESS_CANON_ID,
         iface_version=IFACE_PROCESS_CANON_VER,
@@ -77,26 +134,19 @@ def canonize(raw_pkt: ListingRawPacket) -> ListingCanonicalPacket:
     return ListingCanonicalPacket(meta=meta, data=canon)
 
 
-def identity_cluster(canon_pkt: ListingCanonicalPacket) -> IdentityResultPacket:
+def identity_cluster(canon_pkt: ListingCanonicalPacket, *, engine: Optional[IdentityEngine] = None) -> IdentityResultPacket:
+    """
+    engine=None: stateless phone-hash cluster ("cl_" + phone_hash[:16]).
+    """
     guard_iface(canon_pkt.meta, IFACE_PROCESS_CANON_ID, IFACE_PROCESS_CANON_VER, mode="STRICT")
 
-    c = canon_pkt.data
-    cluster_id = None
-    confidence = 0.0
-    signals = []
-
-    if c.phone_hash:
-        cluster_id = "cl_" + c.phone_hash[:16]
-        confidence = 0.95
-        signals.append("PHONE_HASH_PRESENT")
-
     meta = Meta.now(
         iface_id=IFACE_IDENTITY_ID,
         iface_version=IFACE_IDENTITY_VER,
         trace_id=canon_pkt.meta.trace_id,
         producer="identity_cluster",
     )
-    return IdentityResultPacket(meta=meta, data=IdentityResult(cluster_id=cluster_id, confidence=confidence, signals=signals))
+    return IdentityResultPacket(meta=meta, data=_identity_for(canon_pkt.data, engine))
 
 
 def decide(
@@ -109,58 +159,171 @@ def decide(
     guard_iface(canon_pkt.meta, IFACE_PROCESS_CANON_ID, IFACE_PROCESS_CANON_VER, mode="STRICT")
     guard_iface(ident_pkt.meta, IFACE_IDENTITY_ID, IFACE_IDENTITY_VER, mode="STRICT")
 
-    listing: ListingCanonical = canon_pkt.data
-    reasons = []
-    evidence = []
+    decision = _decision_for(canon_pkt.data, ident_pkt.data, blacklist=blacklist, whitelist=whitelist)
 
-    # 1) Whitelist wins (internal agents)
-    if whitelist:
-        w = whitelist.match_listing(listing)
-        if w.matched:
-            reasons.extend(w.reasons)
-            evidence.extend(w.evidence)
-            meta = Meta.now(
-                iface_id=IFACE_DECISION_ID,
-                iface_version=IFACE_DECISION_VER,
-                trace_id=canon_pkt.meta.trace_id,
-                producer="decision_engine",
-            )
-            return DecisionPacket(
-                meta=meta,
-                data=Decision(action=DecisionAction.ALLOW, risk_score=0.0, reasons=reasons, evidence=evidence),
+    meta = Meta.now(
+        iface_id=IFACE_DECISION_ID,
+        iface_version=IFACE_DECISION_VER,
+        trace_id=canon_pkt.meta.trace_id,
+        producer="decision_engine",
+    )
+    return DecisionPacket(meta=meta, data=decision)
+
+
+# ---- batch pipeline ----
+
+
+class _BatchMeta:
+    """
+    One Meta per (stage, trace_id) for the whole batch.
+    All packets of a stage share a single created_at (batch timestamp); crawler pages
+    usually carry one trace_id, so this collapses N Meta builds into one.
+    """
+
+    def __init__(self, *, iface_id: str, iface_version: str, producer: str, created_at: datetime) -> None:
+        self.iface_id = iface_id
+        self.iface_version = iface_version
+        self.producer = producer
+        self.created_at = created_at
+        self._by_trace: Dict[str, Meta] = {}
+
+    def for_trace(self, trace_id: str) -> Meta:
+        m = self._by_trace.get(trace_id)
+        if m is None:
+            m = Meta(
+                iface_id=self.iface_id,
+                iface_version=self.iface_version,
+                trace_id=trace_id,
+                created_at=self.created_at,
+                producer=self.producer,
             )
+            self._by_trace[trace_id] = m
+        return m
 
-    # 2) Blacklist blocks
-    if blacklist:
-        b = blacklist.match_listing(listing)
-        if b.matched:
-            reasons.extend(b.reasons)
-            evidence.extend(b.evidence)
-            meta = Meta.now(
-                iface_id=IFACE_DECISION_ID,
-                iface_version=IFACE_DECISION_VER,
-                trace_id=canon_pkt.meta.trace_id,
-                producer="decision_engine",
-            )
-            return DecisionPacket(
-                meta=meta,
-                data=Decision(action=DecisionAction.BLOCK, risk_score=1.0, reasons=reasons, evidence=evidence),
-            )
 
-    # 3) Baseline fallback (MVP)
-    risk = 0.05
-    reasons.append("BASELINE_OK")
+def _guard_many(metas: Sequence[Meta], expected_id: str, expected_version: str) -> None:
+    """
+    Interface guard for a batch: each distinct (iface_id, iface_version) pair is checked once.
+    """
+    seen: set[Tuple[str, str]] = set()
+    for m in metas:
+        key = (m.iface_id, m.iface_version)
+        if key in seen:
+            continue
+        guard_iface(m, expected_id, expected_version, mode="STRICT")
+        seen.add(key)
 
-    if ident_pkt.data.cluster_id and ident_pkt.data.confidence >= 0.9:
-        evidence.append(f"cluster_id={ident_pkt.data.cluster_id} conf={ident_pkt.data.confidence}")
 
-    meta = Meta.now(
+def canonize_batch(raw_pkts: Sequence[ListingRawPacket]) -> List[ListingCanonicalPacket]:
+    _guard_many([p.meta for p in raw_pkts], IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER)
+
+    metas = _BatchMeta(
+        iface_id=IFACE_PROCESS_CANON_ID,
+        iface_version=IFACE_PROCESS_CANON_VER,
+        producer="canonizer",
+        created_at=datetime.now(timezone.utc),
+    )
+    return [
+        ListingCanonicalPacket(meta=metas.for_trace(p.meta.trace_id), data=_canonical_from_raw(p.data))
+        for p in raw_pkts
+    ]
+
+
+def identity_cluster_batch(
+    canon_pkts: Sequence[ListingCanonicalPacket],
+    *,
+    engine: Optional[IdentityEngine] = None,
+) -> List[IdentityResultPacket]:
+    _guard_many([p.meta for p in canon_pkts], IFACE_PROCESS_CANON_ID, IFACE_PROCESS_CANON_VER)
+
+    metas = _BatchMeta(
+        iface_id=IFACE_IDENTITY_ID,
+        iface_version=IFACE_IDENTITY_VER,
+        producer="identity_cluster",
+        created_at=datetime.now(timezone.utc),
+    )
+    return [
+        IdentityResultPacket(meta=metas.for_trace(p.meta.trace_id), data=_identity_for(p.data, engine))
+        for p in canon_pkts
+    ]
+
+
+def decide_batch(
+    canon_pkts: Sequence[ListingCanonicalPacket],
+    ident_pkts: Sequence[IdentityResultPacket],
+    *,
+    blacklist: Optional[BlacklistStore] = None,
+    whitelist: Optional[WhitelistStore] = None,
+) -> List[DecisionPacket]:
+    if len(canon_pkts) != len(ident_pkts):
+        raise ValueError(f"decide_batch: length mismatch canon={len(canon_pkts)} identity={len(ident_pkts)}")
+
+    _guard_many([p.meta for p in canon_pkts], IFACE_PROCESS_CANON_ID, IFACE_PROCESS_CANON_VER)
+    _guard_many([p.meta for p in ident_pkts], IFACE_IDENTITY_ID, IFACE_IDENTITY_VER)
+
+    metas = _BatchMeta(
+        iface_id=IFACE_DECISION_ID,
+        iface_version=IFACE_DECISION_VER,
+        producer="decision_engine",
+        created_at=datetime.now(timezone.utc),
+    )
+    return [
+        DecisionPacket(
+            meta=metas.for_trace(c.meta.trace_id),
+            data=_decision_for(c.data, i.data, blacklist=blacklist, whitelist=whitelist),
+        )
+        for c, i in zip(canon_pkts, ident_pkts)
+    ]
+
+
+def process_batch(
+    raw_pkts: Sequence[ListingRawPacket],
+    *,
+    blacklist: Optional[BlacklistStore] = None,
+    whitelist: Optional[WhitelistStore] = None,
+) -> List[DecisionPacket]:
+    """
+    Batch entry point: raw -> canon -> identity -> decision for a whole crawler page.
+
+    Same decisions as calling canonize/identity_cluster/decide per listing, but fused:
+      - interface guard runs once per distinct iface pair, not per packet
+      - one Meta per trace_id (shared batch timestamp)
+      - phone normalize+hash is memoized within the batch (agents repost the same phone)
+      - intermediate canon/identity packets are not materialized; a full canonical listing
+        is only built on a whitelist/blacklist hit (evidence comes from the matched entry)
+    Use canonize_batch/identity_cluster_batch/decide_batch when intermediate packets are needed.
+    Result order == input order.
+    """
+    _guard_many([p.meta for p in raw_pkts], IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER)
+
+    metas = _BatchMeta(
         iface_id=IFACE_DECISION_ID,
         iface_version=IFACE_DECISION_VER,
-        trace_id=canon_pkt.meta.trace_id,
         producer="decision_engine",
+        created_at=datetime.now(timezone.utc),
     )
-    return DecisionPacket(meta=meta, data=Decision(action=DecisionAction.ALLOW, risk_score=risk, reasons=reasons, evidence=evidence))
+    phones: Dict[Optional[str], Optional[str]] = {}
+    phone_cache = get_phone_cache()
+
+    out: List[DecisionPacket] = []
+    for p in raw_pkts:
+        r = p.data
+        if r.phone_raw in phones:
+            phone_hash = phones[r.phone_raw]
+        else:
+            phone_hash = phones[r.phone_raw] = phone_cache.phone_hash(r.phone_raw)
+
+        listed = (whitelist is not None and whitelist.is_whitelisted_phone_hash(phone_hash)) or (
+            blacklist is not None and blacklist.is_blacklisted_phone_hash(phone_hash)
+        )
+        if listed:
+            canon = _canonical_from_raw(r)
+            decision = _decision_for(canon, _identity_for(canon), blacklist=blacklist, whitelist=whitelist)
+        else:
+            decision = _baseline_decision(*_phone_cluster(phone_hash))
+
+        out.append(DecisionPacket(meta=metas.for_trace(p.meta.trace_id), data=decision))
+    return out
 
 
 def demo() -> DecisionPacket:
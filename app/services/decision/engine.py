@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from app.services.decision.lists_facade import ListsFacade
-from app.services.decision.models import DecisionResult
+from app.services.decision.models import DecisionBatch, DecisionResult
+from app.services.decision.rule_packs import RulePack, RulePackHolder
 
 RC_BLACKLIST_PHONE = "BLACKLIST_PHONE_MATCH"
 RC_WHITELIST_OWN = "WHITELIST_OWN_PHONE"
@@ -13,12 +14,29 @@ RC_AGENT_TEXT = "AGENT_TEXT_PATTERN"
 RC_FRAUD_TEXT = "FRAUD_TEXT_PATTERN"
 
 
+_WS_RE = re.compile(r"\s+")
+
+
 def _norm_text(s: str) -> str:
     s = (s or "").strip().lower()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s
 
 
+_SEP = "\x00"
+
+
+def _norm_texts(texts: List[str]) -> List[str]:
+    """
+    Same result as [_norm_text(t) for t in texts], done as one lower() + one regex pass
+    over the joined batch. Falls back to per-item if a text contains the separator.
+    """
+    if any(_SEP in t for t in texts):
+        return [_norm_text(t) for t in texts]
+    joined = _WS_RE.sub(" ", _SEP.join(texts).lower())
+    return [t.strip() for t in joined.split(_SEP)]
+
+
 @dataclass(frozen=True)
 class DecisionConfig:
     soft_block_threshold: float = 0.70
@@ -40,21 +58,35 @@ FRAUD_PATTERNS = [
 ]
 
 
-def _pattern_hit(text: str, patterns: list[str]) -> Optional[str]:
-    for p in patterns:
-        if re.search(p, text, flags=re.IGNORECASE):
-            return p
-    return None
+BUILTIN_RULE_PACK_VERSION = "builtin"
+
+
+def builtin_rule_pack() -> RulePack:
+    return RulePack.build(version=BUILTIN_RULE_PACK_VERSION, agent=AGENT_PATTERNS, fraud=FRAUD_PATTERNS)
 
 
 class DecisionEngine:
-    def __init__(self, lists: ListsFacade, *, cfg: Optional[DecisionConfig] = None) -> None:
+    """
+    rule_packs: shared RulePackHolder; swapping a pack there is picked up by every engine
+    on its next decide() without restart. Default = builtin AGENT/FRAUD patterns.
+    """
+
+    def __init__(
+        self,
+        lists: ListsFacade,
+        *,
+        cfg: Optional[DecisionConfig] = None,
+        rule_packs: Optional[RulePackHolder] = None,
+    ) -> None:
         self.lists = lists
         self.cfg = cfg or DecisionConfig()
+        self.rule_packs = rule_packs or RulePackHolder(builtin_rule_pack())
 
     def decide(self, listing: Dict[str, Any]) -> DecisionResult:
         phone = (listing.get("phone_e164") or "").strip()
         text = _norm_text(str(listing.get("text") or ""))
+        # one snapshot read per decision: a concurrent swap never mixes two packs
+        pack = self.rule_packs.current
 
         # 1) Whitelist own -> drop (не лид)
         if phone and self.lists.is_whitelisted_phone(phone):
@@ -64,6 +96,7 @@ class DecisionEngine:
                 reason_codes=[RC_WHITELIST_OWN],
                 evidence={"phone_e164": phone},
                 hard_block=True,
+                rule_pack_version=pack.version,
             )
 
         # 2) Blacklist -> drop (жёстко)
@@ -74,24 +107,11 @@ class DecisionEngine:
                 reason_codes=[RC_BLACKLIST_PHONE],
                 evidence={"phone_e164": phone},
                 hard_block=True,
+                rule_pack_version=pack.version,
             )
 
         # 3) Soft text signals
-        score = 0.0
-        reason_codes: list[str] = []
-        evidence: Dict[str, Any] = {}
-
-        hit_agent = _pattern_hit(text, AGENT_PATTERNS) if text else None
-        if hit_agent:
-            score = max(score, self.cfg.agent_text_weight)
-            reason_codes.append(RC_AGENT_TEXT)
-            evidence["agent_pattern"] = hit_agent
-
-        hit_fraud = _pattern_hit(text, FRAUD_PATTERNS) if text else None
-        if hit_fraud:
-            score = max(score, self.cfg.fraud_text_weight)
-            reason_codes.append(RC_FRAUD_TEXT)
-            evidence["fraud_pattern"] = hit_fraud
+        score, reason_codes, evidence = self._text_signals(pack, text)
 
         if score >= self.cfg.soft_block_threshold:
             return DecisionResult(
@@ -100,6 +120,7 @@ class DecisionEngine:
                 reason_codes=reason_codes,
                 evidence=evidence,
                 soft_block=True,
+                rule_pack_version=pack.version,
             )
 
         return DecisionResult(
@@ -107,4 +128,62 @@ class DecisionEngine:
             score=min(1.0, score),
             reason_codes=reason_codes,
             evidence=evidence,
+            rule_pack_version=pack.version,
         )
+
+    def _text_signals(self, pack: RulePack, text: str) -> Tuple[float, List[str], Dict[str, Any]]:
+        score = 0.0
+        reason_codes: List[str] = []
+        evidence: Dict[str, Any] = {}
+
+        hits = pack.matcher.first_hits(text)
+
+        hit_agent = hits["agent"]
+        if hit_agent:
+            score = max(score, self.cfg.agent_text_weight)
+            reason_codes.append(RC_AGENT_TEXT)
+            evidence["agent_pattern"] = hit_agent
+
+        hit_fraud = hits["fraud"]
+        if hit_fraud:
+            score = max(score, self.cfg.fraud_text_weight)
+            reason_codes.append(RC_FRAUD_TEXT)
+            evidence["fraud_pattern"] = hit_fraud
+
+        return score, reason_codes, evidence
+
+    def decide_many(self, listings: Sequence[Dict[str, Any]]) -> DecisionBatch:
+        """
+        Batch variant of decide() with identical per-listing results:
+          - one rule-pack snapshot for the whole batch
+          - list lookups in bulk: one set-intersection pass per list over the distinct phones
+          - text normalization in one sweep
+          - columnar DecisionBatch; DecisionResult models are only built when indexed
+        """
+        pack = self.rule_packs.current
+        n = len(listings)
+        phones = [(x.get("phone_e164") or "").strip() for x in listings]
+
+        distinct = {p for p in phones if p}
+        white = self.lists.whitelisted_many(distinct) if distinct else set()
+        black = self.lists.blacklisted_many(distinct - white) if distinct else set()
+
+        out = DecisionBatch.empty(n, rule_pack_version=pack.version)
+        text_idx: List[int] = []
+        for i, phone in enumerate(phones):
+            if phone in white:
+                out.set(i, action="DROP", score=0.0, reason_codes=[RC_WHITELIST_OWN], evidence={"phone_e164": phone}, hard_block=True)
+            elif phone in black:
+                out.set(i, action="DROP", score=1.0, reason_codes=[RC_BLACKLIST_PHONE], evidence={"phone_e164": phone}, hard_block=True)
+            else:
+                text_idx.append(i)
+
+        texts = _norm_texts([str(listings[i].get("text") or "") for i in text_idx])
+        threshold = self.cfg.soft_block_threshold
+        for i, text in zip(text_idx, texts):
+            score, reason_codes, evidence = self._text_signals(pack, text)
+            if score >= threshold:
+                out.set(i, action="DROP", score=min(1.0, score), reason_codes=reason_codes, evidence=evidence, soft_block=True)
+            else:
+                out.set(i, action="ACCEPT", score=min(1.0, score), reason_codes=reason_codes, evidence=evidence)
+        return out
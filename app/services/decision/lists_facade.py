@@ -1,11 +1,16 @@
 # File: app/services/decision/lists_facade.py
-# Version: v0.1.0
+# Version: v0.2.1
+# Changes: bulk blacklisted_many/whitelisted_many (used by DecisionEngine.decide_many);
+#          StoreListsFacade resolves store lookups once at construction (no per-call getattr probing);
+#          methods are bound only when a probe call returns bool; empty set attributes stay live
 # Purpose: abstraction layer for blacklist/whitelist checks (fast & swappable)
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Optional, Protocol
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional, Protocol, Sequence, Set
+
+from app.core.crypto import phone_hash_e164
 
 
 class ListsFacade(Protocol):
@@ -15,6 +20,8 @@ class ListsFacade(Protocol):
     """
     def is_blacklisted_phone(self, phone_e164: str) -> bool: ...
     def is_whitelisted_phone(self, phone_e164: str) -> bool: ...
+    def blacklisted_many(self, phones_e164: Iterable[str]) -> Set[str]: ...
+    def whitelisted_many(self, phones_e164: Iterable[str]) -> Set[str]: ...
 
 
 @dataclass
@@ -28,47 +35,133 @@ class InMemoryListsFacade:
     def is_whitelisted_phone(self, phone_e164: str) -> bool:
         return phone_e164 in self.white_phones
 
+    def blacklisted_many(self, phones_e164: Iterable[str]) -> Set[str]:
+        return self.black_phones.intersection(phones_e164)
+
+    def whitelisted_many(self, phones_e164: Iterable[str]) -> Set[str]:
+        return self.white_phones.intersection(phones_e164)
+
+
+BLACKLIST_PHONE_METHODS = ("is_phone_blocked", "is_blacklisted_phone", "contains_phone", "has_phone", "match_phone_e164", "match_phone")
+WHITELIST_PHONE_METHODS = ("is_phone_whitelisted", "is_whitelisted_phone", "contains_phone", "has_phone", "match_phone_e164", "match_phone")
+BLACKLIST_HASH_METHODS = ("is_blacklisted_phone_hash",)
+WHITELIST_HASH_METHODS = ("is_whitelisted_phone_hash",)
+
+
+_PROBE_PHONE = "+380000000000"  # well-formed E.164, never assigned
+
+
+def _never(_phone_e164: str) -> bool:
+    return False
 
-def _try_call(obj: Any, method: str, *args: Any) -> Optional[Any]:
-    fn = getattr(obj, method, None)
-    if callable(fn):
-        return fn(*args)
+
+def _first_callable(obj: Any, methods: Sequence[str]) -> Optional[Callable[..., Any]]:
+    for m in methods:
+        fn = getattr(obj, m, None)
+        if callable(fn):
+            return fn
+    return None
+
+
+def _first_bool_method(obj: Any, methods: Sequence[str]) -> Optional[Callable[..., Any]]:
+    """
+    First method whose probe call returns a bool. Methods returning anything else (match_phone
+    returning an entry or None, ...) are skipped, as the per-call isinstance(v, bool) check did.
+    """
+    for m in methods:
+        fn = getattr(obj, m, None)
+        if not callable(fn):
+            continue
+        try:
+            if isinstance(fn(_PROBE_PHONE), bool):
+                return fn
+        except Exception:
+            continue
     return None
 
 
+@dataclass
+class PhoneLookup:
+    """
+    One list side with its lookup resolved up front.
+      contains(phone)        -> bound callable, no reflection per call
+      contains_many(phones)  -> set of members (set intersection when the store exposes a set)
+    """
+    contains: Callable[[str], bool]
+    phone_set: Optional[Set[str]] = None
+    kind: str = "none"  # method | set | hash_method | none
+
+    def contains_many(self, phones_e164: Iterable[str]) -> Set[str]:
+        if self.phone_set is not None:
+            return self.phone_set.intersection(phones_e164)
+        if self.contains is _never:
+            return set()
+        fn = self.contains
+        return {p for p in phones_e164 if fn(p)}
+
+
+def resolve_phone_lookup(store: Any, *, phone_methods: Sequence[str], hash_methods: Sequence[str]) -> PhoneLookup:
+    """
+    Resolution order (done once):
+      1) store method taking phone_e164 (legacy names, first one that answers a probe with a bool)
+      2) set attribute phone_e164_set / phones_e164 (bound to the set object, so later adds match)
+      3) store method taking phone_hash (BlacklistStore/WhitelistStore): phone is hashed per call
+      4) nothing -> always False
+    """
+    if store is None:
+        return PhoneLookup(contains=_never)
+
+    fn = _first_bool_method(store, phone_methods)
+    if fn is not None:
+        return PhoneLookup(contains=fn, kind="method")
+
+    idx = getattr(store, "phone_e164_set", None)
+    if idx is None:
+        idx = getattr(store, "phones_e164", None)
+    if isinstance(idx, set):
+        return PhoneLookup(contains=idx.__contains__, phone_set=idx, kind="set")
+
+    hash_fn = _first_callable(store, hash_methods)
+    if hash_fn is not None:
+        def contains_by_hash(phone_e164: str) -> bool:
+            return bool(hash_fn(phone_hash_e164(phone_e164)))
+        return PhoneLookup(contains=contains_by_hash, kind="hash_method")
+
+    return PhoneLookup(contains=_never)
+
+
 @dataclass
 class StoreListsFacade:
     """
     Adapter for existing stores in app/services/lists/*.
     We intentionally support several possible method names to avoid refactors.
+
+    The lookup is resolved once in __post_init__ and bound straight onto the instance, so
+    is_blacklisted_phone()/is_whitelisted_phone() cost a single call into the store.
+    Replacing a store object means building a new facade.
     """
     blacklist_store: Any
     whitelist_store: Any
+    black: PhoneLookup = field(init=False, repr=False)
+    white: PhoneLookup = field(init=False, repr=False)
 
-    def is_blacklisted_phone(self, phone_e164: str) -> bool:
-        # common method patterns
-        for m in ("is_phone_blocked", "is_blacklisted_phone", "contains_phone", "has_phone", "match_phone_e164", "match_phone"):
-            v = _try_call(self.blacklist_store, m, phone_e164)
-            if isinstance(v, bool):
-                return v
-
-        # fallback: try known attributes
-        idx = getattr(self.blacklist_store, "phone_e164_set", None) or getattr(self.blacklist_store, "phones_e164", None)
-        if isinstance(idx, set):
-            return phone_e164 in idx
+    def __post_init__(self) -> None:
+        self.black = resolve_phone_lookup(self.blacklist_store, phone_methods=BLACKLIST_PHONE_METHODS, hash_methods=BLACKLIST_HASH_METHODS)
+        self.white = resolve_phone_lookup(self.whitelist_store, phone_methods=WHITELIST_PHONE_METHODS, hash_methods=WHITELIST_HASH_METHODS)
+        # instance attributes shadow the methods below: the hot path skips one Python frame
+        self.is_blacklisted_phone = self.black.contains  # type: ignore[method-assign]
+        self.is_whitelisted_phone = self.white.contains  # type: ignore[method-assign]
 
-        return False
+    def is_blacklisted_phone(self, phone_e164: str) -> bool:
+        return self.black.contains(phone_e164)
 
     def is_whitelisted_phone(self, phone_e164: str) -> bool:
-        for m in ("is_phone_whitelisted", "is_whitelisted_phone", "contains_phone", "has_phone", "match_phone_e164", "match_phone"):
-            v = _try_call(self.whitelist_store, m, phone_e164)
-            if isinstance(v, bool):
-                return v
+        return self.white.contains(phone_e164)
 
-        idx = getattr(self.whitelist_store, "phone_e164_set", None) or getattr(self.whitelist_store, "phones_e164", None)
-        if isinstance(idx, set):
-            return phone_e164 in idx
+    def blacklisted_many(self, phones_e164: Iterable[str]) -> Set[str]:
+        return self.black.contains_many(phones_e164)
 
-        return False
+    def whitelisted_many(self, phones_e164: Iterable[str]) -> Set[str]:
+        return self.white.contains_many(phones_e164)
 
 # END_OF_FILE
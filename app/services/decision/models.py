@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Literal, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -18,3 +19,69 @@ class DecisionResult(BaseModel):
 
     hard_block: bool = False
     soft_block: bool = False
+
+    rule_pack_version: Optional[str] = None  # text rule pack used for this decision
+
+
+@dataclass
+class DecisionBatch:
+    """
+    Columnar result of DecisionEngine.decide_many(): parallel lists, one slot per listing.
+    Scan columns directly for bulk work (e.g. count DROPs); indexing/iterating builds
+    DecisionResult models lazily, only for the rows actually read.
+    """
+    action: List[DecisionAction]
+    score: List[float]
+    reason_codes: List[List[str]]
+    evidence: List[Dict[str, Any]]
+    hard_block: List[bool]
+    soft_block: List[bool]
+    rule_pack_version: Optional[str] = None
+
+    @classmethod
+    def empty(cls, n: int, *, rule_pack_version: Optional[str] = None) -> "DecisionBatch":
+        return cls(
+            action=["ACCEPT"] * n,
+            score=[0.0] * n,
+            reason_codes=[[] for _ in range(n)],
+            evidence=[{} for _ in range(n)],
+            hard_block=[False] * n,
+            soft_block=[False] * n,
+            rule_pack_version=rule_pack_version,
+        )
+
+    def set(
+        self,
+        i: int,
+        *,
+        action: DecisionAction,
+        score: float,
+        reason_codes: List[str],
+        evidence: Dict[str, Any],
+        hard_block: bool = False,
+        soft_block: bool = False,
+    ) -> None:
+        self.action[i] = action
+        self.score[i] = score
+        self.reason_codes[i] = reason_codes
+        self.evidence[i] = evidence
+        self.hard_block[i] = hard_block
+        self.soft_block[i] = soft_block
+
+    def __len__(self) -> int:
+        return len(self.action)
+
+    def __getitem__(self, i: int) -> DecisionResult:
+        return DecisionResult(
+            action=self.action[i],
+            score=self.score[i],
+            reason_codes=self.reason_codes[i],
+            evidence=self.evidence[i],
+            hard_block=self.hard_block[i],
+            soft_block=self.soft_block[i],
+            rule_pack_version=self.rule_pack_version,
+        )
+
+    def __iter__(self) -> Iterator[DecisionResult]:
+        for i in range(len(self)):
+            yield self[i]
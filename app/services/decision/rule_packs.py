@@ -0,0 +1,114 @@
+# File: app/services/decision/rule_packs.py
+# Version: v0.1.0
+# Purpose: versioned text rule packs (JSON file / tenant_settings) + lock-free hot swap for engines
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.services.decision.rules import CompiledPatternSet
+
+RULE_GROUPS: Tuple[str, ...] = ("agent", "fraud")
+
+
+@dataclass(frozen=True)
+class RulePack:
+    """
+    Immutable compiled snapshot. Engines never see a half-built pack: a pack is compiled
+    completely before it is published to a RulePackHolder.
+
+    JSON shape (file or tenant_settings value):
+      {"version": "2026-10-18.1", "agent": ["\\\\bриелтор\\\\b", ...], "fraud": [...]}
+    """
+    version: str
+    patterns: Dict[str, Tuple[str, ...]]
+    matcher: CompiledPatternSet
+
+    @classmethod
+    def build(cls, *, version: str, agent: Sequence[str], fraud: Sequence[str]) -> "RulePack":
+        version = str(version or "").strip()
+        if not version:
+            raise ValueError("rule pack: version is required")
+        patterns = {"agent": tuple(str(p) for p in agent), "fraud": tuple(str(p) for p in fraud)}
+        for group, ps in patterns.items():
+            for p in ps:
+                try:
+                    re.compile(p)
+                except re.error as e:
+                    raise ValueError(f"rule pack {version}: bad {group} pattern {p!r}: {e}") from e
+        return cls(version=version, patterns=patterns, matcher=CompiledPatternSet(patterns))
+
+    @classmethod
+    def from_json_obj(cls, raw: Any) -> "RulePack":
+        if not isinstance(raw, dict):
+            raise ValueError("rule pack must be a JSON object")
+        unknown = set(raw) - set(RULE_GROUPS) - {"version"}
+        if unknown:
+            raise ValueError(f"rule pack: unknown keys {sorted(unknown)}")
+        return cls.build(version=raw.get("version", ""), agent=raw.get("agent") or [], fraud=raw.get("fraud") or [])
+
+    def to_json_obj(self) -> Dict[str, Any]:
+        return {"version": self.version, **{g: list(ps) for g, ps in self.patterns.items()}}
+
+
+def load_rule_pack_json(path: Path) -> RulePack:
+    return RulePack.from_json_obj(json.loads(path.read_text(encoding="utf-8")))
+
+
+class RulePackHolder:
+    """
+    Versioned snapshot slot shared by engines.
+
+    Readers (DecisionEngine.decide) do a single attribute read of `current` - no lock on the
+    hot path; rebinding one reference is atomic in CPython. Writers compile the new pack
+    first and then swap; the writer lock only serializes concurrent reloads.
+    """
+
+    def __init__(self, pack: RulePack) -> None:
+        self.current: RulePack = pack
+        self._write_lock = threading.Lock()
+        self._file_sig: Optional[Tuple[float, int]] = None
+
+    def swap(self, pack: RulePack) -> RulePack:
+        """
+        Publishes `pack`; returns the previous one.
+        """
+        with self._write_lock:
+            prev = self.current
+            self.current = pack
+            return prev
+
+    def reload_file_if_changed(self, path: Path) -> bool:
+        """
+        Re-reads the JSON file when its mtime/size changed. A broken file keeps the running pack
+        (raises ValueError so the caller can alert) - workers never fall back to "no rules".
+        """
+        st = path.stat()
+        sig = (st.st_mtime, st.st_size)
+        if sig == self._file_sig:
+            return False
+        pack = load_rule_pack_json(path)
+        self._file_sig = sig
+        if pack.version == self.current.version:
+            return False
+        self.swap(pack)
+        return True
+
+    def reload_from_settings(self, repo: Any, *, tenant_id: str, key: str) -> bool:
+        """
+        repo: SettingsRepo (get_json). Missing key -> keep current pack.
+        """
+        raw = repo.get_json(tenant_id=tenant_id, key=key)
+        if raw is None:
+            return False
+        if isinstance(raw, dict) and str(raw.get("version", "")).strip() == self.current.version:
+            return False
+        self.swap(RulePack.from_json_obj(raw))
+        return True
+
+# END_OF_FILE
@@ -0,0 +1,152 @@
+# File: app/services/decision/rules.py
+# Version: v0.1.1
+# Changes: stems are found by one trie-shaped regex scan of the text (was one substring test per pattern);
+#          case folding follows re.IGNORECASE ("İ", "ſ", "ᲀ"...), which str.lower() does not
+# Purpose: compiled text rule matcher (literal-stem prefilter + precompiled patterns, built once)
+
+from __future__ import annotations
+
+import re
+from re._casefix import _EXTRA_CASES  # the equivalences re.IGNORECASE adds to simple lowercase
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Set, Tuple
+
+# one representative per re.IGNORECASE class ("ſ" -> "s", "ı" -> "i", "σ" -> "ς", "ᲀ" -> "в", ...)
+_FOLD_EXTRA = {c: min(c, *others) for c, others in _EXTRA_CASES.items() if min(c, *others) != c}
+_NEEDS_FOLD = re.compile("[" + "".join(map(chr, _FOLD_EXTRA)) + "]")
+
+
+def fold_case(text: str) -> str:
+    """
+    Case fold under which two strings are equal iff re.IGNORECASE matches one against the other,
+    one char per char: lowercase, "İ" -> "i" (str.lower() gives two chars), then the extra
+    classes re knows about. Plain text costs one lower() and one char-class scan.
+    """
+    if "İ" in text:
+        text = text.replace("İ", "i")
+    low = text.lower()
+    return low.translate(_FOLD_EXTRA) if _NEEDS_FOLD.search(low) else low
+
+
+def _trie_regex(words: Sequence[str]) -> str:
+    # alternation shaped as a trie: at each position the engine follows one branch per char, and
+    # greedy "(...)?" after a word end prefers the longest word starting there
+    trie: Dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return emit(trie)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def literal_stem(pattern: str, *, min_len: int = 3) -> Optional[str]:
+    """
+    Leading literal run every match of `pattern` must contain, as written (callers fold its case
+    together with the text), e.g.
+      r"\\bагент(ство)?\\b" -> "агент", r"\\bперевод\\b.*\\bна\\s*карт" -> "перевод".
+    Returns None when no safe stem exists (top-level "|", leading group/class, too short);
+    such patterns are always evaluated.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    i = 2 if pattern.startswith("\\b") else 0
+    buf: List[str] = []
+    while i < len(pattern) and pattern[i].isalnum():
+        buf.append(pattern[i])
+        i += 1
+    if buf and i < len(pattern) and pattern[i] in "?*{":
+        buf.pop()  # last literal is optional/repeated -> not guaranteed
+    stem = "".join(buf)
+    return stem if len(stem) >= min_len else None
+
+
+class CompiledPatternSet:
+    """
+    Rule groups (e.g. agent/fraud) compiled once at engine construction.
+
+    Matching a text:
+      1) literal-stem prefilter: the case-folded text is scanned by one trie-shaped regex of all
+         distinct stems, which reports the longest stem at each position where one starts (the
+         next search resumes one char later, so overlapping stems are found too); a found stem
+         also marks every stem it contains. Cost grows with the text, not the number of patterns.
+      2) only patterns whose stem was found, plus patterns without a stem, run their
+         precompiled regex, in list order
+
+    With re.IGNORECASE, stems and text go through fold_case(), which equates exactly what the
+    patterns' own matching does (lowercasing would miss "ISTANBUL" for a stem "İstanbul").
+
+    first_hits() keeps the legacy semantics exactly: for each group, the first pattern
+    *in list order* that matches anywhere in the text (or None). Clean texts usually end
+    at step 1 without running a single regex.
+    """
+
+    def __init__(self, groups: Mapping[str, Sequence[str]], *, flags: int = re.IGNORECASE) -> None:
+        self.groups: Dict[str, Tuple[str, ...]] = {g: tuple(ps) for g, ps in groups.items()}
+        self._fold = fold_case if flags & re.IGNORECASE else str
+        stem_ids: Dict[str, int] = {}  # folded stem -> id
+        self._compiled: Dict[str, List[Tuple[str, Optional[int], re.Pattern[str]]]] = {}
+        for g, ps in self.groups.items():
+            rows: List[Tuple[str, Optional[int], re.Pattern[str]]] = []
+            for p in ps:
+                stem = literal_stem(p)
+                sid = None if stem is None else stem_ids.setdefault(self._fold(stem), len(stem_ids))
+                rows.append((p, sid, re.compile(p, flags)))
+            self._compiled[g] = rows
+
+        self._stems: Optional[re.Pattern[str]] = re.compile(_trie_regex(list(stem_ids))) if stem_ids else None
+        # found stem -> ids of all stems it contains (itself included)
+        self._implied: Dict[str, FrozenSet[int]] = {s: frozenset(i for t, i in stem_ids.items() if t in s) for s in stem_ids}
+
+    def first_hits(self, text: str) -> Dict[str, Optional[str]]:
+        out: Dict[str, Optional[str]] = {g: None for g in self.groups}
+        if not text:
+            return out
+
+        present: Set[int] = set()
+        if self._stems is not None:
+            folded, implied = self._fold(text), self._implied
+            m = self._stems.search(folded)
+            while m is not None:
+                present |= implied[m.group()]
+                m = self._stems.search(folded, m.start() + 1)
+        for g, compiled in self._compiled.items():
+            for p, sid, rx in compiled:
+                if sid is not None and sid not in present:
+                    continue
+                if rx.search(text):
+                    out[g] = p
+                    break
+        return out
+
+# END_OF_FILE
@@ -0,0 +1,329 @@
+# File: app/services/identity/engine.py
+# Version: v0.1.3
+# Changes: optional MinHash/LSH near-duplicate index as the "text" signal (saved next to the union-find state);
+#          weak signals (contact name) never merge two clusters on their own;
+#          save() copies the arrays under the assign lock and compresses/writes outside it;
+#          hub-guard degree counts distinct listings (a re-crawled listing_uid does not bump it), state format v2
+# Purpose: incremental multi-signal seller clustering (phone hash, contact name, near-dup text, URL/image
+#          fingerprints) over a persisted union-find
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from app.core.contracts import IdentityResult, ListingCanonical
+from app.services.identity.minhash import LshIndex
+from app.services.identity.union_find import UnionFind
+
+# magic, version, elements, keys, saved_at (epoch s); v2 appends a listing-key count + keys
+_HEADER = struct.Struct("<8sHQQd")
+_COUNT = struct.Struct("<Q")
+_MAGIC = b"AICPIDN1"
+_VERSION = 2
+
+_WORD = re.compile(r"[^\W\d_]{3,}")
+
+
+@dataclass(frozen=True)
+class SignalPolicy:
+    """
+    weight:     confidence contributed when the signal links the listing to earlier ones
+    max_degree: a key seen on more distinct listings stops merging clusters (hub guard: a common name
+                or a boilerplate text must not glue unrelated sellers together); 0 = unlimited
+    weak:       links a listing to a cluster only when no other signal places it elsewhere: a weak
+                signal alone never merges two clusters (two sellers named "Іван" stay apart; a
+                shared name on top of a shared phone/text/URL is just corroboration)
+    """
+    weight: float
+    max_degree: int = 0
+    weak: bool = False
+
+
+# signal kind -> (explainability signal, policy)
+DEFAULT_POLICIES: Dict[str, Tuple[str, SignalPolicy]] = {
+    "phone": ("PHONE_HASH_SHARED", SignalPolicy(weight=0.95, max_degree=0)),
+    "image": ("IMAGE_FP_SHARED", SignalPolicy(weight=0.9, max_degree=200)),
+    "url": ("URL_FP_SHARED", SignalPolicy(weight=0.85, max_degree=50)),
+    "text": ("TEXT_NEAR_DUP", SignalPolicy(weight=0.8, max_degree=200)),
+    "name": ("CONTACT_NAME_SHARED", SignalPolicy(weight=0.5, max_degree=20, weak=True)),
+}
+
+
+def _key(kind: str, value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{kind}:{value}".encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def text_fingerprint(title: str, description: str, *, min_words: int = 6) -> Optional[str]:
+    """
+    Near-duplicate text key: set of lowercase words (3+ letters, digits dropped), order-free.
+    Survives reordering, punctuation, price/phone/date edits; None for texts too short to be
+    distinctive.
+    """
+    words = set(_WORD.findall(f"{title} {description}".lower()))
+    if len(words) < min_words:
+        return None
+    return hashlib.blake2b(" ".join(sorted(words)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def url_fingerprint(url: Optional[str]) -> Optional[str]:
+    """
+    host (no www.) + path without trailing slash; scheme, query and fragment are tracking noise.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").removeprefix("www.")
+    path = parts.path.rstrip("/")
+    if not host or not path:
+        return None
+    return f"{host}{path}"
+
+
+def near_dup_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lsh")
+
+
+class IdentityEngine:
+    """
+    Incremental seller clustering. Every distinct signal value (phone hash, name, text/URL/image
+    fingerprint) is one union-find element keyed by a 64-bit hash; a listing unions all of its
+    signal elements, and its cluster is the root of that set. Assigning a listing is a handful of
+    dict probes + near-constant finds, independent of how many listings came before.
+
+    Memory is per distinct signal value (~12 bytes of arrays + ~100 bytes of dict entry), plus one
+    64-bit key per distinct listing_uid (~70 bytes with its set entry) so a listing re-crawled many
+    times counts once towards the hub guard. Cluster ids are "cl_" + the root key: stable until the cluster is merged into
+    a larger one (the larger one keeps its id).
+
+    State is persisted with save() / persist_if_due() (atomic tmp + rename) and restored with
+    load(). assign() calls are serialized by one lock; save() holds it only to copy the arrays
+    (memcpy) and compresses + writes the copy outside it, so assignment keeps running meanwhile.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Optional[Path] = None,
+        persist_every_s: float = 300.0,
+        policies: Optional[Dict[str, Tuple[str, SignalPolicy]]] = None,
+        near_dup: Optional[LshIndex] = None,
+    ) -> None:
+        """
+        near_dup: MinHash/LSH index; when set, the "text" signal is the listing's near-duplicate
+        group (edited reposts link) instead of the exact word-set fingerprint.
+        """
+        self.path = path
+        self.persist_every_s = persist_every_s
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.near_dup = near_dup
+        self._uf = UnionFind()
+        self._eid_by_key: Dict[int, int] = {}
+        self._key_by_eid = array("Q")
+        self._degree = array("I")  # distinct listings seen per signal element
+        self._listing_keys = array("Q")  # listings assigned so far (persisted; the set is the index)
+        self._listings: Set[int] = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one writer of the state file at a time
+        self._last_persist = time.monotonic()
+        self.assigned = 0
+
+    def __len__(self) -> int:
+        return len(self._uf)
+
+    # ---- signals ----
+
+    def signals_for(self, listing: ListingCanonical, *, image_fingerprints: Iterable[str] = ()) -> List[Tuple[str, str]]:
+        out: List[Tuple[str, str]] = []
+        if listing.phone_hash:
+            out.append(("phone", listing.phone_hash))
+        for fp in image_fingerprints:
+            out.append(("image", fp))
+        url_fp = url_fingerprint(listing.url)
+        if url_fp:
+            out.append(("url", url_fp))
+        if self.near_dup is not None:
+            res = self.near_dup.observe(listing.listing_uid, f"{listing.title}\n{listing.description}")
+            text_fp = res.group if res is not None else None
+        else:
+            text_fp = text_fingerprint(listing.title, listing.description)
+        if text_fp:
+            out.append(("text", text_fp))
+        if listing.contact_name_norm:
+            out.append(("name", listing.contact_name_norm))
+        return [s for s in out if s[0] in self.policies]
+
+    def _element(self, key: int) -> Tuple[int, bool]:
+        eid = self._eid_by_key.get(key)
+        if eid is not None:
+            return eid, False
+        eid = self._uf.add()
+        self._eid_by_key[key] = eid
+        self._key_by_eid.append(key)
+        self._degree.append(0)
+        return eid, True
+
+    # ---- assignment ----
+
+    def assign_signals(self, signals: Iterable[Tuple[str, str]], *, listing_uid: Optional[str] = None) -> IdentityResult:
+        """
+        signals: (kind, value) pairs of one listing. Strongest signal first gives the best
+        surviving root when nothing merges.
+        listing_uid: a listing assigned before does not bump the degree of signals it already
+        counted towards (re-crawls); without it every call counts as a new listing.
+        """
+        with self._lock:
+            uf, degree = self._uf, self._degree
+            repeat = False
+            if listing_uid is not None:
+                lkey = _key("listing", listing_uid)
+                repeat = lkey in self._listings
+                if not repeat:
+                    self._listings.add(lkey)
+                    self._listing_keys.append(lkey)
+            root: Optional[int] = None
+            confidence = 0.0
+            fired: List[str] = []
+            roots_before: Set[int] = set()
+            weak: List[Tuple[str, float, int, bool]] = []
+
+            for kind, value in signals:
+                label, policy = self.policies[kind]
+                eid, created = self._element(_key(kind, value))
+                if kind == "phone" and "PHONE_HASH_PRESENT" not in fired:
+                    fired.append("PHONE_HASH_PRESENT")
+                    confidence = max(confidence, policy.weight)
+                # listings on this element, this one included; a repeat already counted itself (a
+                # signal it did not carry before is undercounted by one, harmless for the guard)
+                d = degree[eid]
+                if created or not repeat:
+                    d += 1
+                    degree[eid] = d
+                if policy.max_degree and d > policy.max_degree:
+                    fired.append(f"{label}_HUB_IGNORED")
+                    continue
+                if policy.weak:
+                    weak.append((label, policy.weight, eid, created))
+                    continue
+                if not created:
+                    fired.append(label)
+                    confidence = max(confidence, policy.weight)
+                r = uf.find(eid)
+                if not created:
+                    roots_before.add(r)
+                root = r if root is None else uf.union(root, r)
+
+            # weak signals after the strong ones: they may join the listing's cluster, never bridge two
+            for label, weight, eid, created in weak:
+                r = uf.find(eid)
+                if not created and root is not None and r != uf.find(root):
+                    fired.append(f"{label}_NOT_MERGED")
+                    continue
+                if not created:
+                    fired.append(label)
+                    confidence = max(confidence, weight)
+                    roots_before.add(r)
+                root = r if root is None else uf.union(root, r)
+
+            self.assigned += 1
+            if len(roots_before) > 1:
+                fired.append("CLUSTERS_MERGED")
+            if root is None:
+                return IdentityResult(cluster_id=None, confidence=0.0, signals=fired)
+            cluster_id = f"cl_{self._key_by_eid[uf.find(root)]:016x}"
+        self.persist_if_due()
+        return IdentityResult(cluster_id=cluster_id, confidence=round(confidence, 4), signals=fired)
+
+    def assign(self, listing: ListingCanonical, *, image_fingerprints: Iterable[str] = ()) -> IdentityResult:
+        return self.assign_signals(self.signals_for(listing, image_fingerprints=image_fingerprints), listing_uid=listing.listing_uid)
+
+    def cluster_size(self, kind: str, value: str) -> int:
+        eid = self._eid_by_key.get(_key(kind, value))
+        return 0 if eid is None else self._uf.set_size(eid)
+
+    # ---- persistence ----
+
+    def persist_if_due(self) -> bool:
+        """
+        Skips (False) while another thread is saving.
+        """
+        if self.path is None or time.monotonic() - self._last_persist < self.persist_every_s:
+            return False
+        if not self._save_lock.acquire(blocking=False):
+            return False
+        try:
+            self._save(self.path)
+        finally:
+            self._save_lock.release()
+        return True
+
+    def save(self, path: Path) -> None:
+        with self._save_lock:
+            self._save(path)
+
+    def _save(self, path: Path) -> None:
+        with self._lock:  # assign() waits for the array copies only
+            uf = self._uf.copy()
+            key_by_eid = self._key_by_eid[:]
+            degree = self._degree[:]
+            listing_keys = self._listing_keys[:]
+        uf.compress()
+        n = len(uf)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, n, len(key_by_eid), datetime.now(timezone.utc).timestamp()))
+            uf.write(f)
+            key_by_eid.tofile(f)
+            degree.tofile(f)
+            f.write(_COUNT.pack(len(listing_keys)))
+            listing_keys.tofile(f)
+        os.replace(tmp, path)
+        if self.near_dup is not None:
+            self.near_dup.save(near_dup_path(path))
+        self._last_persist = time.monotonic()
+
+    @classmethod
+    def load(cls, path: Path, *, with_near_dup: bool = False, **kwargs: Any) -> "IdentityEngine":
+        """
+        Missing file -> empty engine bound to `path` (first run).
+        with_near_dup: also restore the LSH index saved next to `path`.
+        v1 files (no listing keys) load too; their listings count again once when re-crawled.
+        """
+        if with_near_dup:
+            kwargs["near_dup"] = LshIndex.load(near_dup_path(path))
+        engine = cls(path=path, **kwargs)
+        if not path.exists():
+            return engine
+        with path.open("rb") as f:
+            magic, ver, n, keys, _saved_at = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or ver not in (1, _VERSION):
+                raise ValueError(f"identity state {path}: unsupported format")
+            if keys != n:
+                raise ValueError(f"identity state {path}: element/key count mismatch")
+            try:
+                engine._uf = UnionFind.read(f, n)
+                engine._key_by_eid.fromfile(f, n)
+                engine._degree.fromfile(f, n)
+                if ver >= 2:
+                    count = f.read(_COUNT.size)
+                    if len(count) < _COUNT.size:
+                        raise EOFError
+                    engine._listing_keys.fromfile(f, _COUNT.unpack(count)[0])
+            except EOFError:
+                raise ValueError(f"identity state {path}: truncated")
+        engine._eid_by_key = {k: i for i, k in enumerate(engine._key_by_eid)}
+        engine._listings = set(engine._listing_keys)
+        return engine
+
+# END_OF_FILE
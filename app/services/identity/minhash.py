@@ -0,0 +1,349 @@
+# File: app/services/identity/minhash.py
+# Version: v0.1.1
+# Changes: band merges splice the sorted delta into the base arrays (bisect + slice copies, no re-sort
+#          of the whole band); delta capped at _MAX_DELTA; at most one band merges per insert
+# Purpose: MinHash signatures over shingled listing text + banded LSH index (typed arrays, persisted to disk)
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+# magic, version, num_perm, bands, count, uid block bytes
+_HEADER = struct.Struct("<8sHHHQQ")
+_MAGIC = b"AICPMHL1"
+_VERSION = 1
+_U64 = struct.Struct("<Q")
+
+_EMPTY = 0xFFFFFFFF
+
+# band delta size that triggers a merge: a quarter of the base, within [_MIN_DELTA, _MAX_DELTA]
+_MIN_DELTA = 1024
+_MAX_DELTA = 32768
+
+
+def shingles(text: str, *, width: int = 3) -> Set[str]:
+    """
+    Word `width`-grams of the lowercased token stream; texts shorter than `width` words give
+    their token set.
+    """
+    toks = _TOKEN.findall(text.lower())
+    if len(toks) < width:
+        return set(toks)
+    return {" ".join(toks[i:i + width]) for i in range(len(toks) - width + 1)}
+
+
+class MinHasher:
+    """
+    One-permutation MinHash (Li et al.): each shingle is hashed once (crc32); the low bits pick
+    one of num_perm bins and the rest is the value kept as that bin's minimum. Empty bins are
+    filled by rotation from the next non-empty bin (plus a per-distance offset), so two texts
+    agree on a bin with probability ~ Jaccard similarity - at O(shingles + num_perm) instead of
+    the classic O(shingles * num_perm).
+    """
+
+    def __init__(self, *, num_perm: int = 64, shingle_width: int = 3) -> None:
+        if num_perm < 2 or num_perm & (num_perm - 1) or num_perm > 256:
+            raise ValueError("num_perm must be a power of two in [2, 256]")
+        self.num_perm = num_perm
+        self.shingle_width = shingle_width
+        self._bits = num_perm.bit_length() - 1
+        self._offset = 1 << (32 - self._bits)  # rotation offset per bin of distance
+
+    def signature(self, text: str) -> Optional[array]:
+        """
+        array('I') of num_perm values, or None when the text has no tokens.
+        """
+        sh = shingles(text, width=self.shingle_width)
+        if not sh:
+            return None
+        k, bits, mask = self.num_perm, self._bits, self.num_perm - 1
+        mins = [_EMPTY] * k
+        for s in sh:
+            h = zlib.crc32(s.encode("utf-8"))
+            b = h & mask
+            v = h >> bits
+            if v < mins[b]:
+                mins[b] = v
+        if _EMPTY in mins:
+            filled = list(mins)
+            for j in range(k):
+                if mins[j] != _EMPTY:
+                    continue
+                for dist in range(1, k):
+                    src = mins[(j + dist) & mask]
+                    if src != _EMPTY:
+                        filled[j] = src + dist * self._offset
+                        break
+            mins = filled
+        return array("I", mins)
+
+
+def similarity(a: array, b: array) -> float:
+    """
+    Estimated Jaccard similarity of two signatures (share of equal positions).
+    """
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class _Band:
+    """
+    One LSH band: sorted base arrays (bisect) + an unsorted in-memory delta. The delta is
+    merged into the base once due() (a quarter of the base, capped at _MAX_DELTA entries);
+    save() writes base and delta as they are, so persisting never pays for a merge.
+    """
+
+    def __init__(self) -> None:
+        self.keys = array("q")
+        self.ids = array("I")
+        self.delta: Dict[int, List[int]] = {}
+        self.delta_n = 0
+
+    def add(self, key: int, doc: int) -> None:
+        self.delta.setdefault(key, []).append(doc)
+        self.delta_n += 1
+
+    def due(self) -> bool:
+        return self.delta_n > max(_MIN_DELTA, min(len(self.keys) >> 2, _MAX_DELTA))
+
+    def get(self, key: int) -> Iterable[int]:
+        keys = self.keys
+        i = bisect_left(keys, key)
+        n = len(keys)
+        while i < n and keys[i] == key:
+            yield self.ids[i]
+            i += 1
+        yield from self.delta.get(key, ())
+
+    def merge(self) -> None:
+        """
+        Splices the sorted delta keys into the base: one bisect per delta key, the base runs
+        in between are copied as array slices (memcpy), never unpacked into Python objects.
+        """
+        if not self.delta_n:
+            return
+        keys, ids = self.keys, self.ids
+        out_keys, out_ids = array("q"), array("I")
+        lo = 0
+        for key in sorted(self.delta):
+            hi = bisect_left(keys, key, lo)
+            if hi > lo:
+                out_keys += keys[lo:hi]
+                out_ids += ids[lo:hi]
+                lo = hi
+            docs = self.delta[key]
+            out_keys.extend([key] * len(docs))
+            out_ids.extend(docs)
+        out_keys += keys[lo:]
+        out_ids += ids[lo:]
+        self.keys, self.ids = out_keys, out_ids
+        self.delta.clear()
+        self.delta_n = 0
+
+    def write(self, f: BinaryIO) -> None:
+        f.write(_U64.pack(len(self.keys)))
+        self.keys.tofile(f)
+        self.ids.tofile(f)
+        dkeys, dids = array("q"), array("I")
+        for key, docs in self.delta.items():
+            for d in docs:
+                dkeys.append(key)
+                dids.append(d)
+        f.write(_U64.pack(len(dkeys)))
+        dkeys.tofile(f)
+        dids.tofile(f)
+
+    def read(self, f: BinaryIO) -> None:
+        for sorted_part in (True, False):
+            (n,) = _U64.unpack(f.read(_U64.size))
+            keys, ids = array("q"), array("I")
+            keys.fromfile(f, n)
+            ids.fromfile(f, n)
+            if sorted_part:
+                self.keys, self.ids = keys, ids
+            else:
+                for key, d in zip(keys, ids):
+                    self.delta.setdefault(key, []).append(d)
+                self.delta_n = n
+
+
+@dataclass(frozen=True)
+class NearDupMatch:
+    doc_id: str
+    similarity: float
+
+
+@dataclass(frozen=True)
+class NearDupResult:
+    """
+    group: doc_id of the first listing of this near-duplicate group (== doc_id for originals).
+    """
+    doc_id: str
+    group: str
+    duplicate_of: Optional[NearDupMatch] = None
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.duplicate_of is not None
+
+
+class LshIndex:
+    """
+    Banded LSH over MinHash signatures: `bands` x `rows` = num_perm. Two texts become candidates
+    when any band matches; candidates are verified on the full signature against `threshold`.
+    With 16 x 4 a pair at Jaccard 0.8 collides in some band with p > 0.999, at 0.3 with p ~ 0.12.
+
+    Storage is flat typed arrays: signatures (4 * num_perm bytes per doc), per band sorted
+    (int64 key, uint32 doc) pairs, and a uint32 group id per doc. save()/load() write and read
+    them as raw arrays, so a restart reads the history back instead of re-hashing it.
+    """
+
+    def __init__(self, *, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, shingle_width: int = 3) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = MinHasher(num_perm=num_perm, shingle_width=shingle_width)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._sigs = array("I")
+        self._group = array("I")
+        self._uids: List[str] = []
+        self._doc_by_uid: Dict[str, int] = {}
+        self._bands = [_Band() for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._uids)
+
+    def _band_keys(self, sig: array) -> List[int]:
+        r = self.rows
+        return [
+            int.from_bytes(hashlib.blake2b(sig[i * r:(i + 1) * r].tobytes(), digest_size=8).digest(), "little", signed=True)
+            for i in range(self.bands)
+        ]
+
+    def _sig(self, doc: int) -> array:
+        k = self.num_perm
+        return self._sigs[doc * k:(doc + 1) * k]
+
+    def query_signature(self, sig: array, *, threshold: Optional[float] = None, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        (internal doc, estimated similarity) for verified candidates, best first.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        cand: Set[int] = set()
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            cand.update(band.get(key))
+        scored = [(d, similarity(sig, self._sig(d))) for d in cand]
+        scored = [x for x in scored if x[1] >= threshold]
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:limit]
+
+    def query(self, text: str, *, threshold: Optional[float] = None, limit: int = 10) -> List[NearDupMatch]:
+        sig = self.hasher.signature(text)
+        if sig is None:
+            return []
+        return [NearDupMatch(self._uids[d], round(s, 4)) for d, s in self.query_signature(sig, threshold=threshold, limit=limit)]
+
+    def observe(self, doc_id: str, text: str) -> Optional[NearDupResult]:
+        """
+        Query + insert in one step (the pipeline dedup stage). Re-observing a known doc_id
+        returns its stored group without indexing it again. None when the text has no tokens.
+        """
+        if "\n" in doc_id:
+            raise ValueError("doc_id must not contain newlines")
+        known = self._doc_by_uid.get(doc_id)
+        if known is not None:
+            return NearDupResult(doc_id=doc_id, group=self._uids[self._group[known]])
+        sig = self.hasher.signature(text)
+        if sig is None:
+            return None
+        with self._lock:
+            return self._insert(doc_id, sig)
+
+    def _insert(self, doc_id: str, sig: array) -> NearDupResult:
+        known = self._doc_by_uid.get(doc_id)  # another thread may have indexed it meanwhile
+        if known is not None:
+            return NearDupResult(doc_id=doc_id, group=self._uids[self._group[known]])
+        best = self.query_signature(sig, limit=1)
+        doc = len(self._uids)
+        group = self._group[best[0][0]] if best else doc
+        self._uids.append(doc_id)
+        self._doc_by_uid[doc_id] = doc
+        self._sigs.extend(sig)
+        self._group.append(group)
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            band.add(key, doc)
+        # the bands fill at the same rate: merging every due band here would stall this one
+        # observe() for all of them, so at most one merges per insert (the rest on the next ones)
+        for band in self._bands:
+            if band.due():
+                band.merge()
+                break
+        dup = NearDupMatch(self._uids[best[0][0]], round(best[0][1], 4)) if best else None
+        return NearDupResult(doc_id=doc_id, group=self._uids[group], duplicate_of=dup)
+
+    # ---- persistence ----
+
+    def save(self, path: Path) -> None:
+        """
+        Atomic (tmp + rename).
+        """
+        with self._lock:
+            uid_block = "\n".join(self._uids).encode("utf-8")
+            self._write(path, uid_block)
+
+    def _write(self, path: Path, uid_block: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.num_perm, self.bands, len(self._uids), len(uid_block)))
+            self._sigs.tofile(f)
+            self._group.tofile(f)
+            for band in self._bands:
+                band.write(f)
+            f.write(uid_block)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, *, threshold: float = 0.7, shingle_width: int = 3) -> "LshIndex":
+        """
+        Missing file -> empty index. num_perm/bands come from the file.
+        """
+        if not path.exists():
+            return cls(threshold=threshold, shingle_width=shingle_width)
+        with path.open("rb") as f:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                raise ValueError(f"lsh index {path}: truncated header")
+            magic, ver, num_perm, bands, n, uid_len = _HEADER.unpack(head)
+            if magic != _MAGIC or ver != _VERSION:
+                raise ValueError(f"lsh index {path}: unsupported format")
+            idx = cls(num_perm=num_perm, bands=bands, threshold=threshold, shingle_width=shingle_width)
+            try:
+                idx._sigs.fromfile(f, n * num_perm)
+                idx._group.fromfile(f, n)
+                for band in idx._bands:
+                    band.read(f)
+            except EOFError:
+                raise ValueError(f"lsh index {path}: truncated")
+            uid_block = f.read(uid_len)
+        idx._uids = uid_block.decode("utf-8").split("\n") if n else []
+        if len(idx._uids) != n:
+            raise ValueError(f"lsh index {path}: doc id block does not match count")
+        idx._doc_by_uid = {u: i for i, u in enumerate(idx._uids)}
+        return idx
+
+# END_OF_FILE
@@ -0,0 +1,86 @@
+# File: app/services/identity/union_find.py
+# Version: v0.1.1
+# Changes: copy() (persist a snapshot outside the caller's lock)
+# Purpose: array-backed union-find (union by size + path compression) with a flat binary dump
+
+from __future__ import annotations
+
+from array import array
+from typing import BinaryIO
+
+
+class UnionFind:
+    """
+    Elements are dense ints 0..n-1. parent/size live in typed arrays (12 bytes per element),
+    not in per-element Python objects, so tens of millions of elements stay affordable.
+    find() is iterative with full path compression; union() attaches the smaller tree under
+    the larger one, which together give amortized near-constant (inverse Ackermann) cost.
+    """
+
+    def __init__(self) -> None:
+        self._parent = array("q")
+        self._size = array("I")
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def add(self) -> int:
+        x = len(self._parent)
+        self._parent.append(x)
+        self._size.append(1)
+        return x
+
+    def find(self, x: int) -> int:
+        parent = self._parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        """
+        Merges the sets of a and b; returns the surviving root (the larger set's root).
+        """
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        size = self._size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        size[ra] += size[rb]
+        return ra
+
+    def set_size(self, x: int) -> int:
+        return self._size[self.find(x)]
+
+    def copy(self) -> "UnionFind":
+        """
+        Independent copy (two array memcpys): compress and write it while the original keeps changing.
+        """
+        uf = UnionFind()
+        uf._parent = self._parent[:]
+        uf._size = self._size[:]
+        return uf
+
+    def compress(self) -> None:
+        """
+        Points every element straight at its root (before persisting: reloads start flat).
+        """
+        for x in range(len(self._parent)):
+            self.find(x)
+
+    def write(self, f: BinaryIO) -> None:
+        self._parent.tofile(f)
+        self._size.tofile(f)
+
+    @classmethod
+    def read(cls, f: BinaryIO, n: int) -> "UnionFind":
+        uf = cls()
+        uf._parent.fromfile(f, n)
+        uf._size.fromfile(f, n)
+        return uf
+
+# END_OF_FILE
@@ -0,0 +1,128 @@
+# File: app/services/leads/notifier.py
+# Version: v0.1.0
+# Purpose: one LISTEN connection per process that wakes long-polling lead consumers on NOTIFY leads_queue_new
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import psycopg
+
+CHANNEL = "leads_queue_new"  # sent by the leads_queue triggers (infra/postgres/init/009_leads_notify.sql)
+
+
+class LeadNotifier:
+    """
+    Shares a single autocommit LISTEN connection between every waiting consumer of the process:
+    100 blocked claim_batch(wait_seconds=...) calls hold one idle socket, not 100 pool connections.
+
+    Each tenant has a sequence number bumped per notification. A waiter reads the sequence
+    *before* its (empty) claim and then waits for it to change, so a lead committed between the
+    claim and the wait still wakes it. The listener thread reconnects with backoff; while it is
+    down, waits simply time out and callers fall back to polling.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        reconnect_s: float = 1.0,
+        connect: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.dsn = dsn
+        self.reconnect_s = reconnect_s
+        self._connect = connect or psycopg.connect
+        self._seq: Dict[str, int] = {}
+        self._epoch = 0  # bumped when the listener dropped: every waiter re-checks
+        self._cond = threading.Condition()
+        self._listening = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.notifications = 0
+        self.reconnects = 0
+
+    @property
+    def listening(self) -> bool:
+        return self._listening.is_set()
+
+    def start(self, *, ready_timeout_s: float = 2.0) -> bool:
+        """
+        Starts the listener thread (idempotent). Returns whether LISTEN is active; only the call
+        that starts the thread waits (up to ready_timeout_s) for it.
+        """
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return self._listening.is_set()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="lead-notifier", daemon=True)
+            self._thread.start()
+        return self._listening.wait(ready_timeout_s)
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        t = self._thread
+        if t is not None:
+            t.join(timeout=5.0)
+
+    def _seq_of(self, tenant_id: str) -> int:
+        return self._epoch + self._seq.get(tenant_id, 0)
+
+    def seq(self, tenant_id: str) -> int:
+        with self._cond:
+            return self._seq_of(tenant_id)
+
+    def wait(self, tenant_id: str, since: int, timeout_s: float) -> bool:
+        """
+        Blocks until a notification for tenant_id arrives after `since` (a seq() value) or
+        timeout_s passes. True when notified.
+        """
+        with self._cond:
+            woke = self._cond.wait_for(lambda: self._seq_of(tenant_id) != since or self._stop.is_set(), timeout_s)
+        return woke and not self._stop.is_set()
+
+    def _bump(self, tenant_id: str) -> None:
+        with self._cond:
+            self._seq[tenant_id] = self._seq.get(tenant_id, 0) + 1
+            self.notifications += 1
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self._connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    self._listening.set()
+                    while not self._stop.is_set():
+                        for n in conn.notifies(timeout=1.0):
+                            self._bump(n.payload)
+            except Exception:
+                pass
+            finally:
+                if self._listening.is_set():
+                    self._listening.clear()
+                    self._wake_all()  # notifications may have been missed: let waiters re-check
+            if not self._stop.is_set():
+                self.reconnects += 1
+                self._stop.wait(self.reconnect_s)
+
+    def _wake_all(self) -> None:
+        with self._cond:
+            self._epoch += 1
+            self._cond.notify_all()
+
+
+_NOTIFIERS: Dict[str, LeadNotifier] = {}
+_NOTIFIERS_LOCK = threading.Lock()
+
+
+def get_notifier(dsn: str) -> LeadNotifier:
+    with _NOTIFIERS_LOCK:
+        n = _NOTIFIERS.get(dsn)
+        if n is None:
+            n = _NOTIFIERS[dsn] = LeadNotifier(dsn)
+        return n
+
+# END_OF_FILE
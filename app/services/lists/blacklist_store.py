@@ -1,17 +1,22 @@
 # File: app/services/lists/blacklist_store.py
-# Version: v0.1.0
+# Version: v0.1.5
+# Changes: save_json dumps in JSON mode (datetime added_at_utc was not serializable);
+#          __len__/phone_hashes()/entries() (bloom filter rebuilds, compact store conversion);
+#          get_profile()/remove_phone_hash() (delta imports); version counter (content-fingerprint cache);
+#          version is a content hash (ContentDigest), stable across processes and restarts
 # Purpose: Blacklist storage + matching against ListingCanonical.
 
 from __future__ import annotations
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.contracts import ListingCanonical
 from app.core.crypto import phone_hash_e164
+from app.services.lists.content_digest import ContentDigest, entry_hash
 
 
 class BlacklistEntry(BaseModel):
@@ -43,6 +48,21 @@ class BlacklistMatch(BaseModel):
 class BlacklistStore:
     def __init__(self) -> None:
         self._by_phone_hash: Dict[str, BlacklistEntry] = {}
+        self._digest = ContentDigest()
+
+    @property
+    def version(self) -> str:
+        # content hash: part of the pipeline content fingerprint (equal lists -> equal version)
+        return self._digest.version
+
+    def _put(self, entry: BlacklistEntry) -> None:
+        old = self._by_phone_hash.get(entry.phone_hash)
+        new_h = entry_hash(entry.phone_hash, (entry.category, entry.notes, entry.source, entry.confidence))
+        if old is None:
+            self._digest.add(new_h)
+        else:
+            self._digest.replace(entry_hash(old.phone_hash, (old.category, old.notes, old.source, old.confidence)), new_h)
+        self._by_phone_hash[entry.phone_hash] = entry
 
     def add_phone(
         self,
@@ -65,11 +85,31 @@ class BlacklistStore:
             source=source,
             confidence=confidence,
         )
-        self._by_phone_hash[phash] = entry
+        self._put(entry)
         return entry
 
     def add_entry(self, entry: BlacklistEntry) -> None:
-        self._by_phone_hash[entry.phone_hash] = entry
+        self._put(entry)
+
+    def __len__(self) -> int:
+        return len(self._by_phone_hash)
+
+    def phone_hashes(self) -> Iterator[str]:
+        return iter(self._by_phone_hash)
+
+    def entries(self) -> Iterator[BlacklistEntry]:
+        return iter(self._by_phone_hash.values())
+
+    def get_profile(self, phone_hash: Optional[str]) -> Optional[Tuple[str, str, str, float]]:
+        e = self._by_phone_hash.get(phone_hash) if phone_hash else None
+        return (e.category, e.notes, e.source, e.confidence) if e is not None else None
+
+    def remove_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        e = self._by_phone_hash.pop(phone_hash, None) if phone_hash else None
+        if e is None:
+            return False
+        self._digest.remove(entry_hash(e.phone_hash, (e.category, e.notes, e.source, e.confidence)))
+        return True
 
     def is_blacklisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
         return bool(phone_hash) and (phone_hash in self._by_phone_hash)
@@ -90,7 +130,7 @@ class BlacklistStore:
 
     def save_json(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        data = [e.model_dump() for e in self._by_phone_hash.values()]
+        data = [e.model_dump(mode="json") for e in self._by_phone_hash.values()]
         path.write_text(__import__("json").dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
     @classmethod
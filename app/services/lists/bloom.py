@@ -0,0 +1,234 @@
+# File: app/services/lists/bloom.py
+# Version: v0.1.3
+# Changes: BloomFrontedBlacklist.version (content-fingerprint cache);
+#          exact store defaults to CompactBlacklistStore; file format 2 stores a checksum of the exact key set,
+#          load_filter compares it (a key count said nothing about which keys, and counted duplicate adds);
+#          exact store defaults to BlacklistStore again (compact lookups are slower than a dict probe)
+# Purpose: compact Bloom filter over phone hashes + bloom-fronted blacklist (vendor feed lists)
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+from app.core.contracts import ListingCanonical
+from app.core.crypto import phone_hash_e164
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistMatch, BlacklistStore
+
+_MAGIC = b"AICPBLM1"
+_FORMAT_VERSION = 2
+# magic, format version, k, m (bits), n (added keys), capacity, fp_rate, key-set size, key-set checksum
+_HEADER = struct.Struct("<8sHHQQQdQQ")
+_U64 = (1 << 64) - 1
+_NO_KEYSET = (_U64, 0)  # saved without a key-set checksum: never matches a store
+
+
+def bloom_params(capacity: int, fp_rate: float) -> Tuple[int, int]:
+    """
+    Optimal (m bits, k hashes) for `capacity` keys at false-positive rate `fp_rate`.
+    """
+    if capacity <= 0:
+        raise ValueError("bloom: capacity must be > 0")
+    if not 0.0 < fp_rate < 1.0:
+        raise ValueError("bloom: fp_rate must be in (0, 1)")
+    m = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    k = max(1, round(m / capacity * math.log(2)))
+    return m, k
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    """
+    Phone hashes are already sha256 hex: the two 64-bit halves of the first 128 bits are used
+    directly (no re-hashing). Anything else goes through blake2b.
+    """
+    if len(key) == 64:
+        try:
+            return int(key[:16], 16), int(key[16:32], 16) | 1
+        except ValueError:
+            pass
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+
+
+def keyset_checksum(keys: Iterable[str]) -> Tuple[int, int]:
+    """
+    (count, sum of each key's first hash half mod 2^64) over distinct keys: order-independent
+    fingerprint of the key set a filter was built from. Phone hashes are sha256 hex, so this is one
+    int parse per key.
+    """
+    n = 0
+    total = 0
+    for key in keys:
+        total += _hash_pair(key)[0]
+        n += 1
+    return n, total & _U64
+
+
+class BloomFilter:
+    """
+    Classic Bloom filter with Kirsch-Mitzenmacher double hashing (bit_i = h1 + i*h2 mod m).
+    No false negatives; false positives ~fp_rate while len(self) <= capacity.
+    ~1.2 bytes per key at 1% and ~1.8 bytes per key at 0.1%.
+
+    len() counts add() calls (a key added twice counts twice); `keyset` is the keyset_checksum()
+    the filter was saved with, if any.
+    """
+
+    def __init__(self, *, capacity: int, fp_rate: float = 0.001) -> None:
+        self.capacity = int(capacity)
+        self.fp_rate = float(fp_rate)
+        self.m, self.k = bloom_params(self.capacity, self.fp_rate)
+        self._bits = bytearray((self.m + 7) // 8)
+        self._n = 0
+        self.keyset: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def saturated(self) -> bool:
+        """
+        More keys than planned capacity: the real false-positive rate is above fp_rate (rebuild).
+        """
+        return self._n > self.capacity
+
+    def add(self, key: str) -> None:
+        h1, h2 = _hash_pair(key)
+        m, bits = self.m, self._bits
+        for i in range(self.k):
+            idx = (h1 + i * h2) % m
+            bits[idx >> 3] |= 1 << (idx & 7)
+        self._n += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _hash_pair(key)
+        m, bits = self.m, self._bits
+        for i in range(self.k):
+            idx = (h1 + i * h2) % m
+            if not bits[idx >> 3] & (1 << (idx & 7)):
+                return False
+        return True
+
+    def save(self, path: Path, *, keyset: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Atomic write (tmp + rename) so a reader never maps a half-written filter.
+        keyset: keyset_checksum() of the keys the filter was built from (stored in the header).
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        ks_n, ks_sum = keyset or _NO_KEYSET
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, self.k, self.m, self._n, self.capacity, self.fp_rate, ks_n, ks_sum))
+            f.write(self._bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        raw = path.read_bytes()
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"bloom {path}: truncated header")
+        magic, ver, k, m, n, capacity, fp_rate, ks_n, ks_sum = _HEADER.unpack_from(raw, 0)
+        if magic != _MAGIC or ver != _FORMAT_VERSION:
+            raise ValueError(f"bloom {path}: unsupported format")
+        bits = raw[_HEADER.size:]
+        if len(bits) != (m + 7) // 8:
+            raise ValueError(f"bloom {path}: bit array size mismatch")
+        bf = cls.__new__(cls)
+        bf.capacity, bf.fp_rate, bf.m, bf.k, bf._n = capacity, fp_rate, m, k, n
+        bf._bits = bytearray(bits)
+        bf.keyset = None if (ks_n, ks_sum) == _NO_KEYSET else (ks_n, ks_sum)
+        return bf
+
+
+class BloomFrontedBlacklist:
+    """
+    Blacklist provider for VENDOR_FEED: Bloom filter in front of an exact store.
+
+    Negative lookups (the vast majority of listings) are answered by the filter alone and never
+    touch the exact store; only filter hits are confirmed there, so false positives cost one
+    exact probe and never a wrong match. Same public surface as BlacklistStore
+    (add_phone/add_entry/is_blacklisted_phone_hash/match_listing), so callers do not change.
+
+    exact: any store with add_entry/is_blacklisted_phone_hash/match_listing/phone_hashes/__len__
+    (default BlacklistStore; pass a CompactBlacklistStore when memory matters more than the
+    latency of filter hits - its lookups are several times slower than a dict probe).
+    """
+
+    def __init__(self, *, capacity: int, fp_rate: float = 0.001, exact: Any = None) -> None:
+        self.exact = exact if exact is not None else BlacklistStore()
+        self.filter = BloomFilter(capacity=capacity, fp_rate=fp_rate)
+        self.filter.update(self.exact.phone_hashes())
+        # counters: lookups answered by the filter alone / confirmed in exact / filter false positives
+        self.filter_negatives = 0
+        self.exact_probes = 0
+        self.false_positives = 0
+
+    def add_phone(self, *, phone_e164: str, **kwargs: Any) -> BlacklistEntry:
+        entry = self.exact.add_phone(phone_e164=phone_e164, **kwargs)
+        self.filter.add(entry.phone_hash)
+        return entry
+
+    def add_entry(self, entry: BlacklistEntry) -> None:
+        self.exact.add_entry(entry)
+        self.filter.add(entry.phone_hash)
+
+    @property
+    def version(self) -> object:
+        return getattr(self.exact, "version", None)
+
+    def is_blacklisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        if not phone_hash:
+            return False
+        if phone_hash not in self.filter:
+            self.filter_negatives += 1
+            return False
+        self.exact_probes += 1
+        hit = self.exact.is_blacklisted_phone_hash(phone_hash)
+        if not hit:
+            self.false_positives += 1
+        return hit
+
+    def is_blacklisted_phone(self, phone_e164: str) -> bool:
+        return self.is_blacklisted_phone_hash(phone_hash_e164(phone_e164))
+
+    def match_listing(self, listing: ListingCanonical) -> BlacklistMatch:
+        if not self.is_blacklisted_phone_hash(listing.phone_hash):
+            return BlacklistMatch(matched=False)
+        return self.exact.match_listing(listing)
+
+    def rebuild_filter(self, *, capacity: Optional[int] = None, fp_rate: Optional[float] = None) -> None:
+        """
+        Re-sizes the filter from the exact store (after bulk growth past capacity).
+        """
+        bf = BloomFilter(capacity=capacity or max(len(self.exact), self.filter.capacity), fp_rate=fp_rate or self.filter.fp_rate)
+        bf.update(self.exact.phone_hashes())
+        self.filter = bf
+
+    def save_filter(self, path: Path) -> None:
+        self.filter.save(path, keyset=keyset_checksum(self.exact.phone_hashes()))
+
+    def load_filter(self, path: Path) -> None:
+        """
+        Loads a filter saved for the same exact key set (startup without setting k bits per key).
+        A filter built from other keys would give false negatives: the key-set checksum in the
+        file must match the exact store's, else ValueError (rebuild_filter() instead).
+        """
+        bf = BloomFilter.load(path)
+        current = keyset_checksum(self.exact.phone_hashes())
+        if bf.keyset != current:
+            raise ValueError(f"bloom {path}: key set {bf.keyset} != exact store {current} (stale filter)")
+        self.filter = bf
+
+# END_OF_FILE
@@ -0,0 +1,676 @@
+# File: app/services/lists/compact_store.py
+# Version: v0.1.7
+# Changes: remove_phone_hash (backward-shift deletion) + get_profile, for delta imports;
+#          version counter (content-fingerprint cache);
+#          version is a content hash (ContentDigest), stable across processes and restarts;
+#          PhoneHashIndex: bitmap prefilter + sorted key array searched with bisect (was a linear-probing
+#          table probed in Python), copy-and-swap merges, bulk() load path;
+#          add_hash writes the metadata row before the index publishes the entry id (concurrent readers);
+#          removed entry ids (digest + metadata slots) are reused by later adds;
+#          keys are the digest's first 8 bytes + a parallel id array (was the per-process seeded str hash)
+# Purpose: compact array-backed blacklist/whitelist stores (raw digests + parallel arrays), drop-in for the dict stores
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain, repeat
+from operator import and_, eq, lshift, or_, rshift
+from pathlib import Path
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from app.core.contracts import ListingCanonical
+from app.core.crypto import phone_hash_e164
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistMatch
+from app.services.lists.content_digest import ContentDigest, entry_hash
+from app.services.lists.whitelist_store import WhitelistEntry, WhitelistMatch
+
+DIGEST_SIZE = 32  # sha256
+_MAX_IDS = 1 << 32  # entry ids are array('I') items
+_ID_MASK = _MAX_IDS - 1
+_MIN_DELTA = 4096  # entries added since the last merge before a merge is considered
+_DELTA_ENTRY_BYTES = 150  # approx: dict slot + 64-char str key + int
+_FANOUT = 1 << 16
+_BITS_PER_KEY = 16  # bitmap size target; resized (at the next merge) below 8 bits per key
+_MIN_BITS_LOG2 = 13
+_MAX_BITS_LOG2 = 36
+
+
+def _empty_bits(n: int) -> Tuple[bytearray, int]:
+    """
+    Zeroed bitmap for n keys and the shift that maps a 64-bit key to its bit number.
+    """
+    log2 = max(_MIN_BITS_LOG2, min(_MAX_BITS_LOG2, (n * _BITS_PER_KEY).bit_length()))
+    return bytearray(1 << (log2 - 3)), 64 - log2
+
+
+def digest_from_hex(phone_hash: str) -> Optional[bytes]:
+    """
+    64-char hex phone hash -> 32 raw bytes; anything else -> None.
+    """
+    if len(phone_hash) != DIGEST_SIZE * 2:
+        return None
+    try:
+        return bytes.fromhex(phone_hash)
+    except ValueError:
+        return None
+
+
+class PhoneHashIndex:
+    """
+    Set of 32-byte digests, probed from C (bytearray index, bisect, dict) with as few Python
+    operations per lookup as possible:
+
+      _digests: one contiguous bytearray, entry i at [i*32, i*32+32) (insertion order = entry id)
+      bits:     bitmap, ~16 bits per entry, one bit per key prefix: most misses end here
+      keys:     sorted array('Q') of the digests' first 8 bytes (big-endian, = int(hex[:16], 16))
+      ids:      array('I'), entry id of keys[i]
+      fanout:   array('I'), 2^16 + 1 offsets into keys by the top 16 key bits: bisect runs over
+                one bucket (~300 keys at 20M entries), not the whole array
+      delta:    dict hex digest -> entry id of the entries added since the last merge; merged into
+                new keys/ids/fanout arrays once it outgrows len(keys) / 8
+      _dead:    1 byte per entry id, set by remove(); dead keys are dropped by the next merge
+      _free:    removed ids with no key left in the sorted array, handed out again by insert() (the
+                store reuses their metadata slots): a list that churns does not grow
+
+    Everything is derived from the digest bytes themselves (no per-process hash seed), so the
+    index pickles and can be rebuilt or shared by another process as is. A key hit is confirmed
+    against the full digest, so prefix collisions cost a compare, never a false positive.
+
+    One writer, any number of reader threads: readers take (keys, ids, fanout, delta, bits, shift)
+    from one tuple; merges build the next arrays aside and swap the tuple in a single assignment,
+    and insert() sets its bit before the entry becomes visible, so a lookup never sees a
+    half-built table (an entry that is present is never reported missing while the index grows).
+
+    bulk() skips the delta for loads: rows are appended unchecked and sorted once when the block
+    exits (in 256 buckets, so only 1/256 of the keys are Python ints at a time); duplicate digests
+    keep their last row.
+
+    ~47 bytes per key (32 digest + 8 key + 4 id + 2 bitmap + 1 dead flag) + 256 KiB fanout + the
+    delta. Lookups parse 16 hex chars per call, so they are slower than a dict probe (see
+    tools/bench_compact_store.py); the point of this store is memory, not latency.
+    """
+
+    def __init__(self) -> None:
+        self._digests = bytearray()
+        self._dead = bytearray()
+        self._n = 0       # entry ids handed out (including removed)
+        self._live = 0
+        self._stale = 0   # removed entries whose keys are still in the sorted array
+        self._free: List[int] = []         # reusable ids
+        self._free_after_merge: List[int] = []  # removed ids whose keys the next merge drops
+        self._bulk: Optional[array] = None  # ids appended inside bulk(), sorted on exit
+        self._state: Tuple[array, array, array, Dict[str, int], bytearray, int] = (
+            array("Q"),
+            array("I"),
+            array("I", bytes(4 * (_FANOUT + 1))),
+            {},
+            *_empty_bits(0),
+        )
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def nbytes(self) -> int:
+        keys, ids, fanout, delta, bits, _shift = self._state
+        return (
+            len(self._digests) + len(self._dead) + len(bits) + keys.itemsize * len(keys)
+            + ids.itemsize * len(ids) + fanout.itemsize * len(fanout) + _DELTA_ENTRY_BYTES * len(delta)
+        )
+
+    def contains_hex(self, phone_hash: Optional[str]) -> bool:
+        """
+        find_hex(phone_hash) >= 0 in one Python frame; a miss usually costs one 16-char hex parse
+        and one bitmap byte.
+        """
+        if not phone_hash or len(phone_hash) != DIGEST_SIZE * 2:
+            return False
+        keys, ids, fanout, delta, bits, shift = self._state
+        try:
+            p = int(phone_hash[:16], 16)  # non-hex that int() still takes (sign, "_") fails the digest compare
+        except ValueError:
+            return False
+        if bits[p >> shift + 3] >> (p >> shift & 7) & 1:
+            if delta and phone_hash in delta:
+                return True
+            b = p >> 48
+            hi = fanout[b + 1]
+            i = bisect_left(keys, p, fanout[b], hi)
+            if i < hi and keys[i] == p:
+                eid = ids[i]
+                o = eid * DIGEST_SIZE
+                if self._digests[o:o + DIGEST_SIZE].hex() == phone_hash and not self._dead[eid]:
+                    return True
+                return self._confirm(keys, ids, i, p, phone_hash) >= 0  # dead entry / prefix collision
+        return False
+
+    def find_hex(self, phone_hash: Optional[str]) -> int:
+        """
+        Entry id of a 64-char lower-case hex digest (what phone_hash_e164 produces; like the dict
+        stores, lookups are case-sensitive), or -1. Entries added inside an open bulk() block are
+        not visible yet.
+        """
+        if not phone_hash or len(phone_hash) != DIGEST_SIZE * 2:
+            return -1
+        keys, ids, fanout, delta, bits, shift = self._state
+        try:
+            p = int(phone_hash[:16], 16)
+        except ValueError:
+            return -1
+        eid = -1
+        if bits[p >> shift + 3] >> (p >> shift & 7) & 1:
+            eid = delta.get(phone_hash, -1) if delta else -1
+            if eid < 0:
+                b = p >> 48
+                eid = self._confirm(keys, ids, bisect_left(keys, p, fanout[b], fanout[b + 1]), p, phone_hash)
+        return eid
+
+    def _confirm(self, keys: array, ids: array, i: int, p: int, phone_hash: str) -> int:
+        # walks the keys equal to p from position i; a key counts only when the full digest matches
+        digest = None
+        n = len(keys)
+        while i < n and keys[i] == p:
+            eid = ids[i]
+            if not self._dead[eid]:
+                if digest is None:
+                    try:
+                        digest = bytes.fromhex(phone_hash)
+                    except ValueError:
+                        return -1
+                # startswith(prefix, start) compares in place: no slice allocation
+                if self._digests.startswith(digest, eid * DIGEST_SIZE):
+                    return eid
+            i += 1
+        return -1
+
+    def find(self, digest: bytes) -> int:
+        """
+        Entry id of `digest`, or -1.
+        """
+        return self.find_hex(digest.hex()) if len(digest) == DIGEST_SIZE else -1
+
+    def next_id(self) -> int:
+        """
+        Entry id the next insert() hands out (a freed id, or a new one at the end).
+        """
+        return self._free[-1] if self._free and self._bulk is None else self._n
+
+    def _new_id(self, digest: bytes) -> int:
+        # bulk() resolves duplicates by "highest id = last row", so ids are only reused outside it
+        if self._free and self._bulk is None:
+            eid = self._free.pop()
+            o = eid * DIGEST_SIZE
+            self._digests[o:o + DIGEST_SIZE] = digest
+            self._dead[eid] = 0
+            self._live += 1
+            return eid
+        eid = self._n
+        if eid >= _MAX_IDS:
+            raise OverflowError(f"PhoneHashIndex holds at most {_MAX_IDS} entry ids")
+        self._digests += digest
+        self._dead.append(0)
+        self._n += 1
+        self._live += 1
+        return eid
+
+    @property
+    def loading(self) -> bool:
+        """
+        True inside a bulk() block.
+        """
+        return self._bulk is not None
+
+    def add(self, digest: bytes) -> Tuple[int, bool]:
+        """
+        Returns (entry id, created). Inside bulk() every row is created (duplicates are resolved on exit).
+        """
+        if self._bulk is None:
+            eid = self.find(digest)
+            if eid >= 0:
+                return eid, False
+        return self.insert(digest), True
+
+    def insert(self, digest: bytes) -> int:
+        """
+        Adds a digest the caller has already looked up (absent), or any row inside bulk();
+        returns its entry id, which becomes visible to lookups when this returns.
+        """
+        eid = self._new_id(digest)
+        if self._bulk is not None:
+            self._bulk.append(eid)
+            return eid
+        keys, _ids, _fanout, delta, bits, shift = self._state
+        p = int.from_bytes(digest[:8], "big")
+        bits[p >> shift + 3] |= 1 << (p >> shift & 7)  # before the entry is visible in delta
+        delta[digest.hex()] = eid
+        if len(delta) > max(_MIN_DELTA, len(keys) >> 3) or self._live * _BITS_PER_KEY > 2 * 8 * len(bits):
+            self._merge()
+        return eid
+
+    def remove(self, digest: bytes) -> int:
+        """
+        Removes `digest`; returns its (now dead) entry id or -1. Its bitmap bit stays set until the
+        next merge (a few more misses reach the bisect).
+        """
+        hx = digest.hex()
+        eid = self.find_hex(hx)
+        if eid < 0:
+            return -1
+        self._dead[eid] = 1
+        if self._state[3].pop(hx, None) is None:
+            self._stale += 1
+            self._free_after_merge.append(eid)
+        else:
+            self._free.append(eid)  # only the delta knew it
+        self._live -= 1
+        if self._bulk is None and self._stale > max(_MIN_DELTA, len(self._state[0]) >> 3):
+            self._merge()  # drops the dead keys, so their ids become reusable
+        return eid
+
+    @contextmanager
+    def bulk(self) -> Iterator[List[int]]:
+        """
+        Load block: adds skip the lookup and the delta. Yields a list that receives, on exit, the
+        ids of rows overwritten by a later row with the same digest (already marked dead).
+        """
+        if self._bulk is not None:
+            raise RuntimeError("bulk() blocks do not nest")
+        self._bulk = array("I")
+        dropped: List[int] = []
+        try:
+            yield dropped
+        finally:
+            dropped.extend(self._merge())
+
+    def _prefixes(self) -> array:
+        # first 8 bytes of every digest as big-endian ints, indexed by entry id (one C pass)
+        with memoryview(self._digests) as mv, mv.cast("Q") as words, words[::DIGEST_SIZE // 8] as firsts:
+            out = array("Q", firsts.tobytes())
+        if sys.byteorder == "little":
+            out.byteswap()
+        return out
+
+    def _merge(self) -> List[int]:
+        keys, ids, _fanout, delta, _bits, _shift = self._state
+        extra = self._bulk if self._bulk is not None else array("I")
+        self._bulk = None
+        check_dups = len(extra) > 0  # bulk rows were never looked up
+        extra.extend(delta.values())
+        prefixes = self._prefixes()
+        dead = self._dead
+        # sort items: key << 32 | entry id (ints sort faster than tuples; equal keys stay adjacent)
+        buckets: List[List[int]] = [[] for _ in range(256)]
+        for eid in extra:
+            p = prefixes[eid]
+            buckets[p >> 56].append(p << 32 | eid)
+        del prefixes
+        out, out_ids = array("Q"), array("I")
+        dropped: List[int] = []
+        lo = 0
+        for b in range(256):
+            hi = bisect_left(keys, (b + 1) << 56, lo) if b < 255 else len(keys)
+            old = map(or_, map(lshift, keys[lo:hi], repeat(32)), ids[lo:hi])
+            run = sorted(chain(old, buckets[b]))  # timsort: one sorted run + a small one
+            buckets[b] = []
+            lo = hi
+            if self._stale:
+                run = [v for v in run if not dead[v & _ID_MASK]]
+            run_keys = list(map(rshift, run, repeat(32)))
+            if check_dups and len(run) > 1 and any(map(eq, run_keys[1:], run_keys[:-1])):
+                run = self._drop_duplicates(run, dropped)
+                run_keys = list(map(rshift, run, repeat(32)))
+            out.extend(run_keys)
+            out_ids.extend(map(and_, run, repeat(_ID_MASK)))
+        fanout = array("I", (bisect_left(out, b << 48) for b in range(_FANOUT)))
+        fanout.append(len(out))
+        bits, shift = _empty_bits(len(out))
+        for k in out:
+            bits[k >> shift + 3] |= 1 << (k >> shift & 7)
+        self._stale = 0
+        self._state = (out, out_ids, fanout, {}, bits, shift)
+        # no key refers to these ids any more
+        self._free += self._free_after_merge
+        self._free += dropped
+        self._free_after_merge = []
+        return dropped
+
+    def _drop_duplicates(self, run: List[int], dropped: List[int]) -> List[int]:
+        # items with equal keys are adjacent; among equal digests the highest id (last row) wins
+        keep: List[int] = []
+        i, n = 0, len(run)
+        while i < n:
+            j = i + 1
+            while j < n and run[j] >> 32 == run[i] >> 32:
+                j += 1
+            last: Dict[bytes, int] = {}
+            for v in run[i:j]:
+                eid = v & _ID_MASK
+                d = self.digest(eid)
+                prev = last.get(d)
+                if prev is None or (prev & _ID_MASK) < eid:
+                    if prev is not None:
+                        dropped.append(prev & _ID_MASK)
+                    last[d] = v
+                else:
+                    dropped.append(eid)
+            keep.extend(sorted(last.values()))
+            i = j
+        for eid in dropped:
+            if not self._dead[eid]:
+                self._dead[eid] = 1
+                self._live -= 1
+        return keep
+
+    def digest(self, eid: int) -> bytes:
+        o = eid * DIGEST_SIZE
+        return bytes(self._digests[o:o + DIGEST_SIZE])
+
+    def iter_ids(self) -> Iterator[int]:
+        dead = self._dead
+        for eid in range(self._n):
+            if not dead[eid]:
+                yield eid
+
+    def iter_digests(self) -> Iterator[bytes]:
+        for eid in self.iter_ids():
+            yield self.digest(eid)
+
+
+class _Interner:
+    """
+    Distinct value tuples -> small ints. Vendor/agency lists repeat the same
+    (category, notes, source, confidence) combination across most rows.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[Tuple[Any, ...]] = []
+        self._ids: Dict[Tuple[Any, ...], int] = {}
+
+    def intern(self, value: Tuple[Any, ...]) -> int:
+        i = self._ids.get(value)
+        if i is None:
+            i = len(self.values)
+            self._ids[value] = i
+            self.values.append(value)
+        return i
+
+
+E = TypeVar("E", BlacklistEntry, WhitelistEntry)
+
+
+class _CompactListStore(Generic[E]):
+    """
+    Per entry: digest (PhoneHashIndex) + profile id ('I') + added_at epoch seconds ('d').
+    phone_e164 is kept only for entries that store it (sparse dict).
+    Entries are rebuilt as pydantic models only on demand (get_entry/save_json).
+    """
+
+    _entry_cls: Type[E]
+    _label_field: str  # "category" (blacklist) / "label" (whitelist)
+    _lookup_attr: str  # "is_blacklisted_phone_hash" / "is_whitelisted_phone_hash"
+
+    def __init__(self) -> None:
+        self._index = PhoneHashIndex()
+        self._profile = array("I")
+        self._added_at = array("d")
+        self._profiles = _Interner()
+        self._phone_e164: Dict[int, str] = {}
+        self._digest = ContentDigest()
+        # instance attributes shadow the lookup methods below: the hot path is one call into the index
+        self.contains_phone_hash = self._index.contains_hex  # type: ignore[method-assign]
+        setattr(self, self._lookup_attr, self._index.contains_hex)
+
+    @property
+    def version(self) -> str:
+        # content hash: part of the pipeline content fingerprint (equal lists -> equal version)
+        return self._digest.version
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Load path for a store that is not serving lookups yet (load_json/from_store, Postgres bulk
+        load): add_hash() skips the per-row lookup and the index is sorted once on exit. Rows added
+        inside the block are not visible to lookups until it exits; a later row wins over an earlier
+        one with the same hash, as with per-row adds.
+        """
+        dropped: List[int] = []
+        try:
+            with self._index.bulk() as dropped:
+                yield
+        finally:
+            for eid in dropped:  # overwritten by a later row: take it out of the content hash
+                self._digest.remove(entry_hash(self._index.digest(eid).hex(), self._profiles.values[self._profile[eid]]))
+                self._phone_e164.pop(eid, None)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory of the bulk arrays (excludes interned profiles and sparse phone_e164).
+        """
+        return self._index.nbytes + self._profile.itemsize * len(self._profile) + self._added_at.itemsize * len(self._added_at)
+
+    def add_hash(
+        self,
+        phone_hash: str,
+        *,
+        label: str,
+        notes: str = "",
+        source: str = "manual",
+        confidence: float = 1.0,
+        added_at_utc: Optional[datetime] = None,
+        phone_e164: Optional[str] = None,
+    ) -> None:
+        """
+        Bulk-load path: no pydantic model per row. `label` is category (blacklist) or label (whitelist).
+        Re-adding a hash overwrites its metadata, like the dict stores.
+        """
+        digest = digest_from_hex(phone_hash)
+        if digest is None:
+            raise ValueError(f"invalid phone_hash: {phone_hash!r}")
+        eid = -1 if self._index.loading else self._index.find(digest)
+        profile = (label, notes, source, float(confidence))
+        phone_hash = digest.hex()  # canonical lower-case form for the content hash
+        pid = self._profiles.intern(profile)
+        ts = (added_at_utc or datetime.now(timezone.utc)).timestamp()
+        if eid < 0:
+            # metadata row first: a reader thread can find the new id as soon as insert() returns
+            self._digest.add(entry_hash(phone_hash, profile))
+            eid = self._index.next_id()
+            if eid == len(self._profile):
+                self._profile.append(pid)
+                self._added_at.append(ts)
+            else:  # slot of a removed entry
+                self._profile[eid] = pid
+                self._added_at[eid] = ts
+            self._index.insert(digest)
+        else:
+            self._digest.replace(entry_hash(phone_hash, self._profiles.values[self._profile[eid]]), entry_hash(phone_hash, profile))
+            self._profile[eid] = pid
+            self._added_at[eid] = ts
+        if phone_e164:
+            self._phone_e164[eid] = phone_e164
+        else:
+            self._phone_e164.pop(eid, None)
+
+    def add_entry(self, entry: E) -> None:
+        self.add_hash(
+            entry.phone_hash,
+            label=getattr(entry, self._label_field),
+            notes=entry.notes,
+            source=entry.source,
+            confidence=entry.confidence,
+            added_at_utc=entry.added_at_utc,
+            phone_e164=entry.phone_e164,
+        )
+
+    def _add_phone(self, phone_e164: str, *, store_phone_e164: bool, **fields: Any) -> E:
+        phash = phone_hash_e164(phone_e164)
+        if not phash:
+            raise ValueError("Invalid phone_e164 for hashing")
+        entry = self._entry_cls(phone_hash=phash, phone_e164=(phone_e164 if store_phone_e164 else None), **fields)
+        self.add_entry(entry)
+        return entry
+
+    def _eid(self, phone_hash: Optional[str]) -> int:
+        return self._index.find_hex(phone_hash)
+
+    def contains_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._eid(phone_hash) >= 0
+
+    def remove_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        digest = digest_from_hex(phone_hash or "")
+        if digest is None:
+            return False
+        eid = self._index.remove(digest)
+        if eid < 0:
+            return False
+        self._digest.remove(entry_hash(digest.hex(), self._profiles.values[self._profile[eid]]))
+        self._phone_e164.pop(eid, None)
+        return True
+
+    def get_profile(self, phone_hash: Optional[str]) -> Optional[Tuple[str, str, str, float]]:
+        """
+        (category|label, notes, source, confidence) without building a model (diffs, evidence).
+        """
+        eid = self._eid(phone_hash)
+        return self._profiles.values[self._profile[eid]] if eid >= 0 else None  # type: ignore[return-value]
+
+    def phone_hashes(self) -> Iterator[str]:
+        for d in self._index.iter_digests():
+            yield d.hex()
+
+    def _entry(self, eid: int) -> E:
+        label, notes, source, confidence = self._profiles.values[self._profile[eid]]
+        return self._entry_cls(
+            phone_hash=self._index.digest(eid).hex(),
+            phone_e164=self._phone_e164.get(eid),
+            notes=notes,
+            source=source,
+            confidence=confidence,
+            added_at_utc=datetime.fromtimestamp(self._added_at[eid], tz=timezone.utc),
+            **{self._label_field: label},
+        )
+
+    def get_entry(self, phone_hash: Optional[str]) -> Optional[E]:
+        eid = self._eid(phone_hash)
+        return self._entry(eid) if eid >= 0 else None
+
+    def entries(self) -> Iterator[E]:
+        for eid in self._index.iter_ids():
+            yield self._entry(eid)
+
+    def save_json(self, path: Path) -> None:
+        """
+        Same file format as the dict stores (files are interchangeable).
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = [e.model_dump(mode="json") for e in self.entries()]
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load_json(cls, path: Path) -> Any:
+        store = cls()
+        if not path.exists():
+            return store
+        with store.bulk():
+            for item in json.loads(path.read_text(encoding="utf-8")):
+                store.add_entry(store._entry_cls(**item))
+        return store
+
+    @classmethod
+    def from_store(cls, store: Any) -> Any:  # BlacklistStore -> CompactBlacklistStore, WhitelistStore -> CompactWhitelistStore
+        """
+        Converts a dict-backed BlacklistStore/WhitelistStore.
+        """
+        out = cls()
+        with out.bulk():
+            for entry in store.entries():
+                out.add_entry(entry)
+        return out
+
+
+class CompactBlacklistStore(_CompactListStore[BlacklistEntry]):
+    """
+    Drop-in for BlacklistStore (same add_phone/add_entry/is_blacklisted_phone_hash/match_listing
+    and JSON format) for lists of tens of millions of hashes.
+    """
+
+    _entry_cls = BlacklistEntry
+    _label_field = "category"
+    _lookup_attr = "is_blacklisted_phone_hash"
+
+    def add_phone(
+        self,
+        *,
+        phone_e164: str,
+        category: str = "UNKNOWN",
+        notes: str = "",
+        source: str = "manual",
+        confidence: float = 1.0,
+        store_phone_e164: bool = False,
+    ) -> BlacklistEntry:
+        return self._add_phone(
+            phone_e164, store_phone_e164=store_phone_e164, category=category, notes=notes, source=source, confidence=confidence
+        )
+
+    def is_blacklisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._eid(phone_hash) >= 0
+
+    def match_listing(self, listing: ListingCanonical) -> BlacklistMatch:
+        eid = self._eid(listing.phone_hash)
+        if eid < 0:
+            return BlacklistMatch(matched=False)
+        category, _notes, source, confidence = self._profiles.values[self._profile[eid]]
+        return BlacklistMatch(
+            matched=True,
+            reasons=["BLACKLIST_PHONE"],
+            evidence=[f"category={category} conf={confidence} source={source}"],
+        )
+
+
+class CompactWhitelistStore(_CompactListStore[WhitelistEntry]):
+    """
+    Drop-in for WhitelistStore.
+    """
+
+    _entry_cls = WhitelistEntry
+    _label_field = "label"
+    _lookup_attr = "is_whitelisted_phone_hash"
+
+    def add_phone(
+        self,
+        *,
+        phone_e164: str,
+        label: str = "INTERNAL_AGENT",
+        notes: str = "",
+        source: str = "manual",
+        confidence: float = 1.0,
+        store_phone_e164: bool = False,
+    ) -> WhitelistEntry:
+        return self._add_phone(
+            phone_e164, store_phone_e164=store_phone_e164, label=label, notes=notes, source=source, confidence=confidence
+        )
+
+    def is_whitelisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._eid(phone_hash) >= 0
+
+    def match_listing(self, listing: ListingCanonical) -> WhitelistMatch:
+        eid = self._eid(listing.phone_hash)
+        if eid < 0:
+            return WhitelistMatch(matched=False)
+        label, _notes, source, confidence = self._profiles.values[self._profile[eid]]
+        return WhitelistMatch(
+            matched=True,
+            reasons=["WHITELIST_PHONE"],
+            evidence=[f"label={label} conf={confidence} source={source}"],
+        )
+
+# END_OF_FILE
@@ -0,0 +1,54 @@
+# File: app/services/lists/content_digest.py
+# Version: v0.1.0
+# Purpose: order-independent content hash of a list store (stable list version across restarts)
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Tuple
+
+_MASK = (1 << 64) - 1
+_SEP = "\x1f"
+
+
+def entry_hash(phone_hash: str, profile: Tuple[Any, ...]) -> int:
+    """
+    64-bit hash of one entry: phone hash + (category|label, notes, source, confidence).
+    added_at_utc / phone_e164 do not change a decision and are left out.
+    """
+    label, notes, source, confidence = profile
+    text = _SEP.join((phone_hash, str(label), str(notes), str(source), repr(float(confidence))))
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ContentDigest:
+    """
+    Sum (mod 2^64) of entry_hash over the current entries, kept up to date on add/replace/remove.
+
+    Depends only on what the list contains, not on insertion order or on how many mutations led
+    there, so the same list loaded in another process (or after a restart) has the same version -
+    content fingerprints persisted in Postgres stay valid exactly as long as the list is unchanged.
+    """
+
+    __slots__ = ("_sum", "_n")
+
+    def __init__(self) -> None:
+        self._sum = 0
+        self._n = 0
+
+    def add(self, h: int) -> None:
+        self._sum = (self._sum + h) & _MASK
+        self._n += 1
+
+    def remove(self, h: int) -> None:
+        self._sum = (self._sum - h) & _MASK
+        self._n -= 1
+
+    def replace(self, old: int, new: int) -> None:
+        self._sum = (self._sum - old + new) & _MASK
+
+    @property
+    def version(self) -> str:
+        return f"{self._n}:{self._sum:016x}"
+
+# END_OF_FILE
@@ -0,0 +1,165 @@
+# File: app/services/lists/import_delta.py
+# Version: v0.1.1
+# Changes: rows whose hash is stored under another source are conflicts (reported, not written)
+# Purpose: delta (diff) mode for agency list re-uploads: compare a CSV against the current store, apply only the changes
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from app.core.config import TENANT_SALT
+from app.services.lists.import_stream import ImportReport, ImportRow, ImportSink, ImportTarget, iter_normalized_chunks
+
+
+@dataclass
+class ListDiff:
+    """
+    adds/changes are keyed by phone_hash (last row in the file wins, like a full import).
+    removes: hashes present in the store under the import's source but missing from the file.
+    conflicts: hashes in the file that the store holds under another source (manual entry, other
+    agency); they are left as they are, so a re-upload never takes over someone else's entry.
+    """
+    adds: Dict[str, ImportRow] = field(default_factory=dict)
+    changes: Dict[str, ImportRow] = field(default_factory=dict)
+    removes: List[str] = field(default_factory=list)
+    conflicts: Set[str] = field(default_factory=set)
+    unchanged: int = 0
+    report: ImportReport = field(default_factory=ImportReport)
+
+    @property
+    def writes(self) -> int:
+        return len(self.adds) + len(self.changes) + len(self.removes)
+
+    def rows(self) -> List[ImportRow]:
+        return [*self.adds.values(), *self.changes.values()]
+
+    def summary(self) -> Dict[str, Any]:
+        r = self.report
+        return {
+            "read": r.read,
+            "rejected": r.rejected,
+            "added": len(self.adds),
+            "changed": len(self.changes),
+            "removed": len(self.removes),
+            "unchanged": self.unchanged,
+            "conflicts": len(self.conflicts),
+            "elapsed_s": round(r.elapsed_s, 3),
+            "workers": r.workers,
+        }
+
+    def format(self) -> str:
+        return " ".join(f"{k}={v}" for k, v in self.summary().items())
+
+
+def _profile_getter(store: Any) -> Any:
+    get_profile = getattr(store, "get_profile", None)
+    if get_profile is not None:
+        return get_profile
+
+    label_field = "category" if hasattr(store, "is_blacklisted_phone_hash") else "label"
+
+    def from_entry(phone_hash: str) -> Any:
+        e = store.get_entry(phone_hash)
+        return (getattr(e, label_field), e.notes, e.source, e.confidence) if e is not None else None
+
+    return from_entry
+
+
+def compute_diff(
+    chunks: Iterable[Sequence[ImportRow]],
+    store: Any,
+    *,
+    source: str,
+    remove_missing: bool = True,
+    diff: Optional[ListDiff] = None,
+) -> ListDiff:
+    """
+    One pass over the normalized rows with a hashed-key lookup per row; nothing is written.
+
+    A row is a change when category/label or notes differ from the stored entry. Only entries
+    whose source equals `source` are changed or removed: manual entries and other agencies'
+    uploads survive a re-upload that mentions them (diff.conflicts) or does not.
+    """
+    diff = diff if diff is not None else ListDiff()
+    get_profile = _profile_getter(store)
+    adds, changes = diff.adds, diff.changes
+    seen: Set[bytes] = set()  # raw digests: half the memory of hex strings at millions of rows
+
+    for rows in chunks:
+        for row in rows:
+            phone_hash = row[0]
+            if phone_hash in adds:
+                adds[phone_hash] = row
+                continue
+            prof = get_profile(phone_hash)
+            if prof is None:
+                adds[phone_hash] = row
+                continue
+            if prof[2] != source:
+                diff.conflicts.add(phone_hash)
+                continue
+            seen.add(bytes.fromhex(phone_hash))
+            if prof[0] != row[1] or prof[1] != row[2]:
+                changes[phone_hash] = row
+            else:
+                changes.pop(phone_hash, None)  # a later duplicate restored the stored values
+
+    diff.unchanged = len(seen) - len(changes)
+    if remove_missing:
+        diff.removes = [
+            h for h in store.phone_hashes()
+            if bytes.fromhex(h) not in seen and get_profile(h)[2] == source
+        ]
+    return diff
+
+
+def apply_diff(diff: ListDiff, sink: ImportSink, *, chunk_size: int = 20_000) -> int:
+    """
+    Writes adds + changes, then removes, then close(). With PgCopySink that is one transaction.
+    Returns the number of rows written or deleted.
+    """
+    try:
+        rows = diff.rows()
+        for i in range(0, len(rows), max(1, chunk_size)):
+            sink.write(rows[i:i + chunk_size])
+        sink.remove(diff.removes)
+    except BaseException:
+        abort = getattr(sink, "abort", None)
+        if abort is not None:
+            abort()
+        raise
+    sink.close()
+    return diff.writes
+
+
+def import_csv_delta(
+    path: Path,
+    store: Any,
+    sink: Optional[ImportSink],
+    *,
+    target: ImportTarget,
+    source: str = "import_csv",
+    remove_missing: bool = True,
+    workers: int = 0,
+    chunk_size: int = 20_000,
+    tenant_salt: str = TENANT_SALT,
+) -> ListDiff:
+    """
+    store: current state (dict/compact store, mapped snapshot or PgListProvider.store).
+    sink:  where the delta goes (StoreSink on the same store, PgCopySink); None = dry run.
+    """
+    diff = ListDiff()
+    t0 = time.perf_counter()
+    chunks = iter_normalized_chunks(
+        path, target=target, source=source, workers=workers, chunk_size=chunk_size, tenant_salt=tenant_salt, report=diff.report
+    )
+    compute_diff(chunks, store, source=source, remove_missing=remove_missing, diff=diff)
+    if sink is not None:
+        diff.report.imported = apply_diff(diff, sink, chunk_size=chunk_size)
+    diff.report.elapsed_s = time.perf_counter() - t0
+    return diff
+
+# END_OF_FILE
@@ -1,5 +1,7 @@
 # File: app/services/lists/providers.py
-# Version: v0.1.0
+# Version: v0.2.2
+# Changes: VENDOR_FEED blacklist = BloomFrontedBlacklist (configurable capacity/fp rate);
+#          its exact store is the dict BlacklistStore again (compact lookups are slower)
 # Purpose: provider switch for lists (blacklist/whitelist) by deployment mode
 
 from __future__ import annotations
@@ -24,11 +26,19 @@ class ListsProviders:
     mode: DeploymentMode
 
 
-def get_lists_providers(*, mode: Optional[DeploymentMode] = None) -> ListsProviders:
+def get_lists_providers(
+    *,
+    mode: Optional[DeploymentMode] = None,
+    bloom_capacity: Optional[int] = None,
+    bloom_fp_rate: Optional[float] = None,
+) -> ListsProviders:
     """
     Returns the correct provider set for current deployment mode.
     IMPORTANT: This function does not create/keep 'disabled' lists in DB.
     In vendor_feed mode we simply never instantiate/use agency-import related providers.
+
+    bloom_capacity/bloom_fp_rate: VENDOR_FEED blacklist filter sizing
+    (default AICP_VENDOR_BLOOM_CAPACITY / AICP_VENDOR_BLOOM_FP_RATE).
     """
     mode = mode or get_deployment_mode()
 
@@ -38,9 +48,15 @@ def get_lists_providers(*, mode: Optional[DeploymentMode] = None) -> ListsProvid
 
     if mode == DeploymentMode.VENDOR_FEED:
         # Vendor feed server: vendor-only lists.
-        # For MVP we reuse the same store classes, but the instance/data on this server is vendor-owned only.
-        # Later we can swap to specialized vendor index (e.g., redis/bloom/cached sets) without changing callers.
-        blacklist = BlacklistStore()
+        # Vendor blacklists are tens of millions of hashes and most lookups miss: a Bloom filter answers
+        # negatives without touching the exact store. Same store API, so callers do not change.
+        from app.core.config import VENDOR_BLOOM_CAPACITY, VENDOR_BLOOM_FP_RATE
+        from app.services.lists.bloom import BloomFrontedBlacklist
+
+        blacklist = BloomFrontedBlacklist(
+            capacity=bloom_capacity or VENDOR_BLOOM_CAPACITY,
+            fp_rate=bloom_fp_rate or VENDOR_BLOOM_FP_RATE,
+        )
         whitelist = WhitelistStore()
         return ListsProviders(blacklist=blacklist, whitelist=whitelist, mode=mode)
 
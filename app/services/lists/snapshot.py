@@ -0,0 +1,312 @@
+# File: app/services/lists/snapshot.py
+# Version: v0.1.5
+# Changes: get_profile() (delta imports diff against a snapshot without building entries);
+#          version property (content-fingerprint cache);
+#          version hashes the file sections (creation time is not a content identity);
+#          lookups bisect an in-memory 8-byte prefix table from C (was a 32-byte mmap slice per Python probe);
+#          format 2: the prefix table is a file section bisected in place (no per-process copy at open)
+# Purpose: versioned binary list snapshots (sorted digests + metadata) queried in place via mmap
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+from app.core.contracts import ListingCanonical
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistMatch
+from app.services.lists.whitelist_store import WhitelistEntry, WhitelistMatch
+
+SnapshotKind = Literal["blacklist", "whitelist"]
+
+SNAPSHOT_MAGIC = b"AICPLST1"
+SNAPSHOT_VERSION = 2
+DIGEST_SIZE = 32
+FANOUT_SIZE = 1 << 16  # buckets by the first 2 digest bytes
+
+_KINDS: Tuple[SnapshotKind, ...] = ("blacklist", "whitelist")
+_LABEL_FIELD = {"blacklist": "category", "whitelist": "label"}
+
+# magic, version, kind, count, fanout_off, digests_off, meta_off, profiles_off, profiles_len, created_at (epoch s),
+# prefixes_off
+_HEADER = struct.Struct("<8sHHQQQQQQdQ")
+_HEADER_SIZE = 128  # header is padded: room for future fields without moving sections
+_U32 = struct.Struct("<I")
+_META = struct.Struct("<Id")  # per entry, in digest order: profile id, added_at epoch seconds
+
+# File layout (all integers little-endian):
+#   [0, 128)       header (_HEADER, zero padded)
+#   fanout_off     (FANOUT_SIZE + 1) x u32: fanout[p] = first entry whose 2-byte prefix >= p
+#   prefixes_off   count x u64, 8-aligned: first 8 bytes of each digest read big-endian (sorts like the digests)
+#   digests_off    count x 32 bytes, sorted ascending (raw sha256 phone hashes)
+#   meta_off       count x _META, same order as digests
+#   profiles_off   UTF-8 JSON {"profiles": [[label, notes, source, confidence], ...],
+#                              "phone_e164": {"<entry index>": "+380..."}}
+
+
+def write_snapshot(path: Path, store: Any, *, kind: SnapshotKind) -> int:
+    """
+    store: anything with entries() -> BlacklistEntry/WhitelistEntry (dict, compact or mapped store).
+    Atomic (tmp + rename): readers that already mapped the old file keep their view.
+    Returns the number of entries written.
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"snapshot kind must be one of {_KINDS}")
+    label_field = _LABEL_FIELD[kind]
+
+    profile_ids: Dict[Tuple[Any, ...], int] = {}
+    rows: List[Tuple[bytes, int, float, Optional[str]]] = []
+    for e in store.entries():
+        prof = (getattr(e, label_field), e.notes, e.source, float(e.confidence))
+        pid = profile_ids.setdefault(prof, len(profile_ids))
+        rows.append((bytes.fromhex(e.phone_hash), pid, e.added_at_utc.timestamp(), e.phone_e164))
+    rows.sort(key=lambda r: r[0])
+
+    n = len(rows)
+    fanout = [0] * (FANOUT_SIZE + 1)
+    for d, _pid, _ts, _ph in rows:
+        fanout[(d[0] << 8 | d[1]) + 1] += 1
+    for p in range(FANOUT_SIZE):
+        fanout[p + 1] += fanout[p]
+    prefixes = array("Q", (int.from_bytes(r[0][:8], "big") for r in rows))
+    if sys.byteorder != "little":
+        prefixes.byteswap()
+
+    extras = json.dumps(
+        {
+            "profiles": [list(p) for p in profile_ids],
+            "phone_e164": {str(i): r[3] for i, r in enumerate(rows) if r[3]},
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    fanout_off = _HEADER_SIZE
+    prefixes_off = fanout_off + 4 * (FANOUT_SIZE + 1) + 4  # u32 table has an odd length: pad to 8
+    digests_off = prefixes_off + 8 * n
+    meta_off = digests_off + DIGEST_SIZE * n
+    profiles_off = meta_off + _META.size * n
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _KINDS.index(kind), n,
+        fanout_off, digests_off, meta_off, profiles_off, len(extras),
+        datetime.now(timezone.utc).timestamp(), prefixes_off,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        f.write(struct.pack(f"<{FANOUT_SIZE + 1}I", *fanout))
+        f.write(bytes(prefixes_off - f.tell()))
+        prefixes.tofile(f)
+        for d, _pid, _ts, _ph in rows:
+            f.write(d)
+        for _d, pid, ts, _ph in rows:
+            f.write(_META.pack(pid, ts))
+        f.write(extras)
+    os.replace(tmp, path)
+    return n
+
+
+class MappedListSnapshot:
+    """
+    Read-only list opened with mmap; all processes on a host share one page-cached copy of the
+    file. The prefix section (first 8 bytes of every digest as u64, which sorts like the digests)
+    is bisected in place through a memoryview cast: a lookup is one C bisect over a fanout bucket,
+    and the 32-byte digest is compared only on a prefix match (misses almost never touch the
+    digest section). Opening reads the header, the 256 KiB fanout and the profile/phone JSON block
+    (small for vendor lists), nothing per entry; on big-endian hosts the prefix table is copied
+    and byteswapped instead.
+    """
+
+    kind: SnapshotKind
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._views: List[memoryview] = []  # released before the mapping is closed
+        self._f = path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            self._f.close()
+            raise ValueError(f"snapshot {path}: empty file")
+        try:
+            self._open_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def _open_sections(self) -> None:
+        mm = self._mm
+        if len(mm) < _HEADER_SIZE:
+            raise ValueError(f"snapshot {self.path}: truncated header")
+        (magic, ver, kind, n, fanout_off, digests_off, meta_off, profiles_off, profiles_len, created_at, prefixes_off) = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC or ver != SNAPSHOT_VERSION:
+            raise ValueError(f"snapshot {self.path}: unsupported format")
+        if kind >= len(_KINDS) or _KINDS[kind] != self.kind:
+            raise ValueError(f"snapshot {self.path}: not a {self.kind} snapshot")
+        if (
+            profiles_off + profiles_len != len(mm) or meta_off != digests_off + DIGEST_SIZE * n
+            or digests_off != prefixes_off + 8 * n or prefixes_off % 8
+        ):
+            raise ValueError(f"snapshot {self.path}: section sizes do not match header")
+
+        self.count = n
+        self.created_at_utc = datetime.fromtimestamp(created_at, tz=timezone.utc)
+        self._fanout_off = fanout_off
+        self._digests_off = digests_off
+        self._meta_off = meta_off
+        self._version: Optional[str] = None
+        self._fanout = array("I", mm[fanout_off:fanout_off + 4 * (FANOUT_SIZE + 1)])
+        self._prefixes: Any
+        if sys.byteorder == "little":
+            mv = memoryview(mm)
+            self._views.append(mv)
+            table = mv[prefixes_off:digests_off]
+            self._views.append(table)
+            self._prefixes = table.cast("Q")
+            self._views.append(self._prefixes)
+        else:  # file integers are little-endian
+            self._fanout.byteswap()
+            self._prefixes = array("Q", mm[prefixes_off:digests_off])
+            self._prefixes.byteswap()
+        extras = json.loads(mm[profiles_off:profiles_off + profiles_len].decode("utf-8"))
+        self._profiles: List[Tuple[Any, ...]] = [tuple(p) for p in extras["profiles"]]
+        self._phone_e164: Dict[int, str] = {int(k): v for k, v in extras["phone_e164"].items()}
+
+    def close(self) -> None:
+        while self._views:  # mmap.close() refuses while views are exported
+            self._views.pop().release()
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "MappedListSnapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def version(self) -> str:
+        # immutable file: one hash over digests/meta/profiles (C speed, computed once on first use)
+        if self._version is None:
+            with memoryview(self._mm) as mv, mv[self._digests_off:] as body:  # released before close()
+                h = hashlib.blake2b(body, digest_size=8)
+            self._version = f"snap:{self.count}:{h.hexdigest()}"
+        return self._version
+
+    def _find(self, phone_hash: Optional[str]) -> int:
+        if not phone_hash or len(phone_hash) != DIGEST_SIZE * 2:
+            return -1
+        try:
+            digest = bytes.fromhex(phone_hash)
+        except ValueError:
+            return -1
+        prefixes, fanout = self._prefixes, self._fanout
+        key = int.from_bytes(digest[:8], "big")
+        b = digest[0] << 8 | digest[1]
+        hi = fanout[b + 1]
+        i = bisect_left(prefixes, key, fanout[b], hi)
+        mm, base = self._mm, self._digests_off
+        while i < hi and prefixes[i] == key:
+            o = base + i * DIGEST_SIZE
+            if mm[o:o + DIGEST_SIZE] == digest:
+                return i
+            i += 1
+        return -1
+
+    def _profile(self, idx: int) -> Tuple[Any, ...]:
+        pid = _META.unpack_from(self._mm, self._meta_off + idx * _META.size)[0]
+        return self._profiles[pid]
+
+    def contains_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._find(phone_hash) >= 0
+
+    def phone_hashes(self) -> Iterator[str]:
+        mm, base = self._mm, self._digests_off
+        for i in range(self.count):
+            o = base + i * DIGEST_SIZE
+            yield mm[o:o + DIGEST_SIZE].hex()
+
+    def _entry(self, idx: int) -> Any:
+        pid, ts = _META.unpack_from(self._mm, self._meta_off + idx * _META.size)
+        label, notes, source, confidence = self._profiles[pid]
+        o = self._digests_off + idx * DIGEST_SIZE
+        cls = BlacklistEntry if self.kind == "blacklist" else WhitelistEntry
+        return cls(
+            phone_hash=self._mm[o:o + DIGEST_SIZE].hex(),
+            phone_e164=self._phone_e164.get(idx),
+            notes=notes,
+            source=source,
+            confidence=confidence,
+            added_at_utc=datetime.fromtimestamp(ts, tz=timezone.utc),
+            **{_LABEL_FIELD[self.kind]: label},
+        )
+
+    def get_profile(self, phone_hash: Optional[str]) -> Optional[Tuple[Any, ...]]:
+        idx = self._find(phone_hash)
+        return self._profile(idx) if idx >= 0 else None
+
+    def get_entry(self, phone_hash: Optional[str]) -> Any:
+        idx = self._find(phone_hash)
+        return self._entry(idx) if idx >= 0 else None
+
+    def entries(self) -> Iterator[Any]:
+        for i in range(self.count):
+            yield self._entry(i)
+
+
+class MappedBlacklist(MappedListSnapshot):
+    """
+    Read-only BlacklistStore replacement (is_blacklisted_phone_hash/match_listing).
+    """
+
+    kind: SnapshotKind = "blacklist"
+
+    def is_blacklisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._find(phone_hash) >= 0
+
+    def match_listing(self, listing: ListingCanonical) -> BlacklistMatch:
+        idx = self._find(listing.phone_hash)
+        if idx < 0:
+            return BlacklistMatch(matched=False)
+        category, _notes, source, confidence = self._profile(idx)
+        return BlacklistMatch(
+            matched=True,
+            reasons=["BLACKLIST_PHONE"],
+            evidence=[f"category={category} conf={confidence} source={source}"],
+        )
+
+
+class MappedWhitelist(MappedListSnapshot):
+    """
+    Read-only WhitelistStore replacement (is_whitelisted_phone_hash/match_listing).
+    """
+
+    kind: SnapshotKind = "whitelist"
+
+    def is_whitelisted_phone_hash(self, phone_hash: Optional[str]) -> bool:
+        return self._find(phone_hash) >= 0
+
+    def match_listing(self, listing: ListingCanonical) -> WhitelistMatch:
+        idx = self._find(listing.phone_hash)
+        if idx < 0:
+            return WhitelistMatch(matched=False)
+        label, _notes, source, confidence = self._profile(idx)
+        return WhitelistMatch(
+            matched=True,
+            reasons=["WHITELIST_PHONE"],
+            evidence=[f"label={label} conf={confidence} source={source}"],
+        )
+
+# END_OF_FILE
@@ -0,0 +1,345 @@
+# File: app/services/pipeline/async_pipeline.py
+# Version: v0.1.2
+# Changes: optional ContentCache short-circuit (unchanged listings skip every stage incl. the sink);
+#          canon/identity/decide run in a stage thread pool, one hop per micro-batch (were on the loop,
+#          so *_concurrency changed nothing); invalid packets are counted as rejected instead of failing the run
+# Purpose: asyncio pipeline (ingest -> canon -> identity -> decision -> sink) with bounded queues/backpressure
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.core.contracts import (
+    DecisionAction,
+    DecisionPacket,
+    IdentityResultPacket,
+    ListingCanonicalPacket,
+    ListingRawPacket,
+    Meta,
+)
+from app.core.events import Event, EventPacket
+from app.main import canonize, decide, identity_cluster
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.whitelist_store import WhitelistStore
+from app.services.pipeline.content_cache import ContentCache, content_fingerprint, pipeline_versions, raw_listing_uid
+
+IFACE_EVENT_ID = "IFACE-EVENT-001"
+IFACE_EVENT_VER = "v0.1.0"
+
+_STOP = object()
+_SKIP = object()  # content cache hit: dropped before canonize
+
+
+@dataclass(frozen=True)
+class PipelineItem:
+    canon: ListingCanonicalPacket
+    ident: IdentityResultPacket
+    decision: DecisionPacket
+    fingerprint: str = ""  # content fingerprint, recorded in the ContentCache once the sink succeeded
+
+
+SinkFn = Callable[[PipelineItem], Awaitable[None]]
+RawSource = Union[AsyncIterable[ListingRawPacket], Iterable[ListingRawPacket]]
+
+
+@dataclass(frozen=True)
+class AsyncPipelineConfig:
+    """
+    queue_size bounds every inter-stage queue: when the sink is slow, queues fill up and
+    ingest blocks on put() instead of buffering the whole crawl in memory.
+
+    *_concurrency of canon/identity/decide: micro-batches of that stage in flight at once, each on
+    a thread of the stage pool. The stages are pure Python, so under the GIL more than one
+    overlaps a stage with the others and with the loop rather than multiplying its throughput.
+    stage_batch: most items one worker takes per thread hop (a hop costs about two items' work).
+    """
+    queue_size: int = 1000
+    canon_concurrency: int = 1
+    identity_concurrency: int = 1
+    decide_concurrency: int = 1
+    sink_concurrency: int = 4
+    stage_batch: int = 64
+    cache_flush_every: int = 500  # ContentCache repo writes are batched
+
+
+@dataclass
+class QueueStats:
+    name: str
+    queue: asyncio.Queue
+    puts: int = 0
+    max_depth: int = 0
+    put_wait_s: float = 0.0  # time producers spent blocked on a full queue (backpressure)
+
+    async def put(self, item: Any) -> None:
+        if self.queue.full():
+            t0 = time.perf_counter()
+            await self.queue.put(item)
+            self.put_wait_s += time.perf_counter() - t0
+        else:
+            self.queue.put_nowait(item)
+        self.puts += 1
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "depth": float(self.queue.qsize()),
+            "max_depth": float(self.max_depth),
+            "capacity": float(self.queue.maxsize),
+            "puts": float(self.puts),
+            "put_wait_s": self.put_wait_s,
+        }
+
+
+@dataclass
+class AsyncRunStats:
+    ingested: int = 0
+    rejected: int = 0  # contract violations (ValidationError/ValueError in a stage); the run goes on
+    skipped: int = 0  # content cache hits (never reached canonize)
+    sunk: int = 0
+    elapsed_s: float = 0.0
+    queues: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def _map_valid(fn: Callable[[Any], Any], items: List[Any]) -> Tuple[List[Any], int]:
+    """
+    fn over one micro-batch (in a stage thread). Like jsonl_runner, a packet that violates a
+    contract is counted as rejected and dropped; it does not stop the run.
+    """
+    out: List[Any] = []
+    rejected = 0
+    for item in items:
+        try:
+            out.append(fn(item))
+        except (ValidationError, ValueError):
+            rejected += 1
+    return out, rejected
+
+
+class AsyncPipeline:
+    """
+    Stage workers are connected by bounded asyncio.Queues.
+    CPU stages (canon/identity/decide) take what is queued (up to stage_batch items) and run it
+    in a thread pool, so the loop keeps feeding the sink and ingest meanwhile; the sink is expected
+    to off-load blocking I/O (see RepoSink, which uses asyncio.to_thread for psycopg/clickhouse calls).
+    Output order is not guaranteed when any stage concurrency > 1.
+    """
+
+    def __init__(
+        self,
+        *,
+        sink: SinkFn,
+        cfg: Optional[AsyncPipelineConfig] = None,
+        blacklist: Optional[BlacklistStore] = None,
+        whitelist: Optional[WhitelistStore] = None,
+        content_cache: Optional[ContentCache] = None,
+        rule_pack: Any = None,
+    ) -> None:
+        self.sink = sink
+        self.cfg = cfg or AsyncPipelineConfig()
+        self.blacklist = blacklist
+        self.whitelist = whitelist
+        self.content_cache = content_cache
+        self.rule_pack = rule_pack
+        self._queues: Dict[str, QueueStats] = {}
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Live queue-depth metrics (safe to call from another task while run() is active).
+        """
+        return {name: q.snapshot() for name, q in self._queues.items()}
+
+    async def run(self, source: RawSource) -> AsyncRunStats:
+        cfg = self.cfg
+        size = max(1, int(cfg.queue_size))
+        q_raw = QueueStats("raw", asyncio.Queue(maxsize=size))
+        q_canon = QueueStats("canon", asyncio.Queue(maxsize=size))
+        q_ident = QueueStats("identity", asyncio.Queue(maxsize=size))
+        q_decision = QueueStats("decision", asyncio.Queue(maxsize=size))
+        self._queues = {q.name: q for q in (q_raw, q_canon, q_ident, q_decision)}
+
+        stats = AsyncRunStats()
+        t0 = time.perf_counter()
+
+        async def ingest() -> None:
+            if isinstance(source, AsyncIterable):
+                async for pkt in source:
+                    await q_raw.put(pkt)
+                    stats.ingested += 1
+            else:
+                for pkt in source:
+                    await q_raw.put(pkt)
+                    stats.ingested += 1
+
+        cache = self.content_cache
+        loop = asyncio.get_running_loop()
+        batch_max = max(1, int(cfg.stage_batch))
+
+        def canon_one(pkt: ListingRawPacket) -> Any:
+            fp = ""
+            if cache is not None:
+                versions = pipeline_versions(blacklist=self.blacklist, whitelist=self.whitelist, rule_pack=self.rule_pack)
+                fp = content_fingerprint(pkt.data, versions)
+                if cache.is_unchanged(raw_listing_uid(pkt.data), fp):
+                    return _SKIP
+            return canonize(pkt), fp
+
+        def identity_one(pair: Tuple[ListingCanonicalPacket, str]) -> Any:
+            c, fp = pair
+            return c, identity_cluster(c), fp
+
+        def decide_one(triple: Tuple[ListingCanonicalPacket, IdentityResultPacket, str]) -> PipelineItem:
+            c, i, fp = triple
+            d = decide(c, i, blacklist=self.blacklist, whitelist=self.whitelist)
+            return PipelineItem(canon=c, ident=i, decision=d, fingerprint=fp)
+
+        async def cpu_worker(src: QueueStats, dst: QueueStats, fn: Callable[[Any], Any]) -> None:
+            while True:
+                # one waited get, then whatever is already queued: one thread hop per micro-batch
+                batch: List[Any] = []
+                done = (item := await src.queue.get()) is _STOP
+                if not done:
+                    batch.append(item)
+                while not done and len(batch) < batch_max and not src.queue.empty():
+                    done = (item := src.queue.get_nowait()) is _STOP
+                    if not done:
+                        batch.append(item)
+                if batch:
+                    out, rejected = await loop.run_in_executor(executor, _map_valid, fn, batch)
+                    stats.rejected += rejected
+                    for x in out:
+                        if x is _SKIP:
+                            stats.skipped += 1
+                        else:
+                            await dst.put(x)
+                if done:  # each worker consumes exactly one STOP
+                    return
+
+        async def sink_worker() -> None:
+            while (item := await q_decision.queue.get()) is not _STOP:
+                await self.sink(item)
+                stats.sunk += 1
+                if cache is not None and item.fingerprint:
+                    cache.record(item.canon.data.listing_uid, item.fingerprint)
+                    if cache.pending >= cfg.cache_flush_every:
+                        await asyncio.to_thread(cache.flush)
+
+        async def stage(workers: List[Callable[[], Awaitable[None]]], downstream: Optional[QueueStats], n_down: int) -> None:
+            # When every worker of a stage is done, hand one STOP per downstream worker.
+            await asyncio.gather(*(w() for w in workers))
+            if downstream is not None:
+                for _ in range(n_down):
+                    await downstream.queue.put(_STOP)
+
+        n_canon = max(1, cfg.canon_concurrency)
+        n_ident = max(1, cfg.identity_concurrency)
+        n_decide = max(1, cfg.decide_concurrency)
+        n_sink = max(1, cfg.sink_concurrency)
+
+        executor = ThreadPoolExecutor(max_workers=n_canon + n_ident + n_decide, thread_name_prefix="pipeline-stage")
+
+        def workers(n: int, src: QueueStats, dst: QueueStats, fn: Callable[[Any], Any]) -> List[Callable[[], Awaitable[None]]]:
+            return [lambda: cpu_worker(src, dst, fn)] * n
+
+        tasks = [
+            asyncio.create_task(stage([ingest], q_raw, n_canon)),
+            asyncio.create_task(stage(workers(n_canon, q_raw, q_canon, canon_one), q_canon, n_ident)),
+            asyncio.create_task(stage(workers(n_ident, q_canon, q_ident, identity_one), q_ident, n_decide)),
+            asyncio.create_task(stage(workers(n_decide, q_ident, q_decision, decide_one), q_decision, n_sink)),
+            asyncio.create_task(stage([sink_worker] * n_sink, None, 0)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            executor.shutdown(wait=False)
+        if cache is not None:
+            await asyncio.to_thread(cache.flush)
+
+        stats.elapsed_s = time.perf_counter() - t0
+        stats.queues = self.metrics()
+        return stats
+
+
+class RepoSink:
+    """
+    Default sink: listings_current upsert + ClickHouse decision event + lead enqueue.
+    Every repo is optional; blocking repo calls run in worker threads so the loop keeps serving
+    the other stages while Postgres/ClickHouse are slow.
+    Leads are enqueued for ALLOW decisions that are not whitelist hits (own agents are not leads).
+    """
+
+    def __init__(
+        self,
+        *,
+        tenant_id: str = "default",
+        pg_repo: Any = None,        # PostgresRepo
+        event_writer: Any = None,   # ClickHouseEventWriter
+        leads_repo: Any = None,     # LeadsQueueRepo
+    ) -> None:
+        self.tenant_id = tenant_id
+        self.pg_repo = pg_repo
+        self.event_writer = event_writer
+        self.leads_repo = leads_repo
+
+    async def __call__(self, item: PipelineItem) -> None:
+        listing = item.canon.data
+        decision = item.decision.data
+        cluster_id = item.ident.data.cluster_id or ""
+
+        if self.pg_repo is not None:
+            await asyncio.to_thread(
+                self.pg_repo.upsert_listing_current,
+                tenant_id=self.tenant_id,
+                listing=listing,
+                cluster_id=cluster_id,
+                decision=decision,
+            )
+
+        if self.event_writer is not None:
+            evt = EventPacket(
+                meta=Meta.now(
+                    iface_id=IFACE_EVENT_ID,
+                    iface_version=IFACE_EVENT_VER,
+                    trace_id=item.decision.meta.trace_id,
+                    producer="async_pipeline",
+                ),
+                data=Event(
+                    tenant_id=self.tenant_id,
+                    event="decision_made",
+                    source=listing.source,
+                    listing_uid=listing.listing_uid,
+                    cluster_id=cluster_id,
+                    action=decision.action,
+                    risk_score=decision.risk_score,
+                    reasons=list(decision.reasons),
+                    evidence=list(decision.evidence),
+                ),
+            )
+            await asyncio.to_thread(self.event_writer.insert, evt)
+
+        if self.leads_repo is not None and decision.action == DecisionAction.ALLOW and "WHITELIST_PHONE" not in decision.reasons:
+            await asyncio.to_thread(
+                self.leads_repo.enqueue,
+                tenant_id=self.tenant_id,
+                payload={
+                    "listing_uid": listing.listing_uid,
+                    "url": listing.url,
+                    "title": listing.title,
+                    "cluster_id": cluster_id,
+                    "score": decision.risk_score,
+                },
+            )
+
+# END_OF_FILE
@@ -0,0 +1,232 @@
+# File: app/services/pipeline/content_cache.py
+# Version: v0.1.2
+# Changes: list versions are content hashes (stable across restarts, so warmed fingerprints stay valid);
+#          versions cover the phone-hash settings (tenant salt, default region) and the identity stage
+# Purpose: exact-duplicate short-circuit: content fingerprint per listing_uid (TTL + LRU, optional Postgres persistence)
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import PHONE_DEFAULT_REGION, TENANT_SALT
+from app.core.contracts import ListingRaw
+
+_SEP = "\x1f"
+
+
+def list_version(store: Any) -> str:
+    """
+    Version tag of a list store. Dict/compact stores (and PgListProvider, BloomFrontedBlacklist
+    through them) hash their contents, snapshots hash their file: the tag is equal for equal lists
+    in any process, which fingerprints persisted in Postgres rely on. Stores without one fall back
+    to their size, which misses same-size edits - give such stores a `version` attribute.
+    """
+    if store is None:
+        return "-"
+    v = getattr(store, "version", None)
+    if v is not None:
+        return str(v)
+    return f"n{len(store)}"
+
+
+def identity_version(engine: Any) -> str:
+    """
+    Configuration tag of the identity stage: "-" for the stateless phone-hash cluster, else a hash
+    of the engine's signal policies and near-duplicate index parameters.
+    """
+    if engine is None:
+        return "-"
+    near_dup = getattr(engine, "near_dup", None)
+    lsh = f"{near_dup.num_perm}x{near_dup.bands}@{near_dup.threshold}" if near_dup is not None else "-"
+    text = f"{sorted(getattr(engine, 'policies', {}).items())!r}{_SEP}{lsh}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _phone_settings_version(tenant_salt: str, region: str) -> str:
+    # hashed: the salt must not end up in persisted fingerprints or logs
+    return hashlib.blake2b(f"{tenant_salt}{_SEP}{region}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+def pipeline_versions(
+    *,
+    blacklist: Any = None,
+    whitelist: Any = None,
+    rule_pack: Any = None,
+    identity: Any = None,
+    tenant_salt: str = TENANT_SALT,
+    region: str = PHONE_DEFAULT_REGION,
+    extra: str = "",
+) -> str:
+    """
+    Everything besides the listing itself that changes a decision. Part of every fingerprint:
+    a rule-pack swap, a list edit, another tenant salt or default phone region (both change
+    phone_hash) or another identity engine setup makes all cached fingerprints miss once.
+    """
+    rules = getattr(rule_pack, "version", "-") if rule_pack is not None else "-"
+    return (
+        f"rules={rules};bl={list_version(blacklist)};wl={list_version(whitelist)};"
+        f"id={identity_version(identity)};ph={_phone_settings_version(tenant_salt, region)};{extra}"
+    )
+
+
+def raw_listing_uid(raw: ListingRaw) -> str:
+    # same id canonize() assigns (ListingCanonical.listing_uid)
+    return f"{raw.source}:{raw.source_listing_id}"
+
+
+def content_fingerprint(raw: ListingRaw, versions: str) -> str:
+    """
+    Stable hash over the fields canonize() reads (raw_payload is not one of them) + versions.
+    Canonization is deterministic, so equal raw fields mean an equal canonical listing: the
+    check runs before canonize and saves it as well.
+    """
+    parts = (
+        raw.source,
+        raw.source_listing_id,
+        raw.url or "",
+        raw.title or "",
+        raw.description or "",
+        raw.published_at.isoformat() if raw.published_at else "",
+        repr(raw.price) if raw.price is not None else "",
+        raw.currency or "",
+        raw.contact_name or "",
+        raw.phone_raw or "",
+        versions,
+    )
+    return hashlib.blake2b(_SEP.join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    checked: int = 0
+    skipped: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "skip_ratio": round(self.skip_ratio, 4),
+        }
+
+
+class ContentCache:
+    """
+    listing_uid -> fingerprint of the last version that went through the whole pipeline.
+
+      is_unchanged(uid, fp): True -> skip canonize/identity/decide/sink for this listing
+      record(uid, fp):       call only after the sink succeeded (a failed write is retried)
+
+    Entries expire after ttl_s (a periodic full re-evaluation even without changes) and the
+    least recently used are evicted beyond maxsize. With a repo (ContentFingerprintRepo),
+    record() also queues the fingerprint; flush() writes the queue in one batch and warm()
+    reloads the most recent fingerprints after a restart.
+    """
+
+    def __init__(self, *, maxsize: int = 500_000, ttl_s: float = 24 * 3600.0, repo: Any = None, tenant_id: str = "default") -> None:
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.repo = repo
+        self.tenant_id = tenant_id
+        self.stats = CacheStats()
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def is_unchanged(self, listing_uid: str, fingerprint: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self.stats.checked += 1
+            v = self._data.get(listing_uid)
+            if v is None:
+                return False
+            fp, expires = v
+            if expires <= now:
+                del self._data[listing_uid]
+                self.stats.expired += 1
+                return False
+            if fp != fingerprint:
+                return False
+            self._data.move_to_end(listing_uid)
+            self.stats.skipped += 1
+            return True
+
+    def _put(self, listing_uid: str, fingerprint: str, expires: float) -> None:
+        data = self._data
+        data[listing_uid] = (fingerprint, expires)
+        data.move_to_end(listing_uid)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.stats.evicted += 1
+
+    def record(self, listing_uid: str, fingerprint: str) -> None:
+        with self._lock:
+            self._put(listing_uid, fingerprint, time.monotonic() + self.ttl_s)
+            if self.repo is not None:
+                self._pending.append((listing_uid, fingerprint))
+
+    def flush(self) -> int:
+        """
+        Writes queued fingerprints to the repo (one batch). Returns rows written.
+        """
+        if self.repo is None:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            return self.repo.upsert_many(tenant_id=self.tenant_id, items=pending)
+        except BaseException:
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+
+    def warm(self, *, limit: Optional[int] = None) -> int:
+        """
+        Loads the most recent fingerprints younger than ttl_s from the repo. Returns entries loaded.
+        """
+        if self.repo is None:
+            return 0
+        rows: Iterable[Tuple[str, str, float]] = self.repo.load_recent(
+            tenant_id=self.tenant_id, max_age_s=self.ttl_s, limit=limit or self.maxsize
+        )
+        now = time.monotonic()
+        n = 0
+        with self._lock:
+            for listing_uid, fingerprint, age_s in rows:  # newest first
+                if listing_uid not in self._data:
+                    self._data[listing_uid] = (fingerprint, now + self.ttl_s - age_s)
+                    self._data.move_to_end(listing_uid, last=False)
+                    n += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._pending.clear()
+
+# END_OF_FILE
@@ -0,0 +1,157 @@
+# File: app/services/pipeline/executor.py
+# Version: v0.1.1
+# Changes: stage latencies merged per record (worker chunk seconds / processed records)
+# Purpose: multi-process pipeline executor (chunked raw listings -> ordered decisions, all cores)
+
+from __future__ import annotations
+
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from app.core.contracts import DecisionPacket, ListingRawPacket
+from app.main import process_batch
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.whitelist_store import WhitelistStore
+from app.services.pipeline.jsonl_runner import STAGES, RunReport, chunked, run_jsonl
+
+# ---- worker side (module globals live once per worker process) ----
+
+_WORKER_BLACKLIST: Optional[BlacklistStore] = None
+_WORKER_WHITELIST: Optional[WhitelistStore] = None
+
+
+def _init_worker(blacklist_path: Optional[str], whitelist_path: Optional[str]) -> None:
+    """
+    Pool initializer: loads list stores once per worker at startup (never per task).
+    """
+    global _WORKER_BLACKLIST, _WORKER_WHITELIST
+    _WORKER_BLACKLIST = BlacklistStore.load_json(Path(blacklist_path)) if blacklist_path else None
+    _WORKER_WHITELIST = WhitelistStore.load_json(Path(whitelist_path)) if whitelist_path else None
+
+
+def _work_packets(chunk: Sequence[ListingRawPacket]) -> List[DecisionPacket]:
+    return process_batch(chunk, blacklist=_WORKER_BLACKLIST, whitelist=_WORKER_WHITELIST)
+
+
+@dataclass(frozen=True)
+class LineChunkResult:
+    text: str                   # decision JSONL for the chunk
+    read: int
+    processed: int
+    rejected: int
+    stage_s: Dict[str, float]   # worker-side seconds per stage
+
+
+def _work_lines(lines: Sequence[str]) -> LineChunkResult:
+    # Raw JSONL lines in, decision JSONL text out: strings are far cheaper to pickle than models.
+    buf = io.StringIO()
+    report = run_jsonl(lines, buf, chunk_size=max(1, len(lines)), blacklist=_WORKER_BLACKLIST, whitelist=_WORKER_WHITELIST)
+    return LineChunkResult(
+        text=buf.getvalue(),
+        read=report.read,
+        processed=report.processed,
+        rejected=report.rejected,
+        stage_s={name: report.stages[name].total_s for name in STAGES},
+    )
+
+
+# ---- parent side ----
+
+
+class PipelineExecutor:
+    """
+    Process-pool pipeline.
+
+    - each worker loads blacklist/whitelist (save_json files) once via the pool initializer
+    - work is submitted per chunk; at most max_in_flight chunks are pending at a time,
+      so a huge input never materializes in memory
+    - results are yielded strictly in submission order
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        blacklist_path: Optional[Path] = None,
+        whitelist_path: Optional[Path] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.max_in_flight = max(1, int(max_in_flight or self.workers * 2))
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                str(blacklist_path) if blacklist_path else None,
+                str(whitelist_path) if whitelist_path else None,
+            ),
+        )
+
+    def _ordered(self, fn: Callable[[Any], Any], chunks: Iterable[Any]) -> Iterator[Any]:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(self._pool.submit(fn, chunk))
+            if len(pending) >= self.max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def map_chunks(self, chunks: Iterable[Sequence[ListingRawPacket]]) -> Iterator[List[DecisionPacket]]:
+        """
+        Packets in, DecisionPackets out (one result list per input chunk, same order).
+        """
+        return self._ordered(_work_packets, chunks)
+
+    def map_line_chunks(self, chunks: Iterable[Sequence[str]]) -> Iterator[LineChunkResult]:
+        """
+        JSONL lines in, decision JSONL text + counters out, same order.
+        """
+        return self._ordered(_work_lines, chunks)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "PipelineExecutor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def run_jsonl_parallel(
+    src: Iterable[str],
+    dst: IO[str],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    blacklist_path: Optional[Path] = None,
+    whitelist_path: Optional[Path] = None,
+) -> RunReport:
+    """
+    Same contract as run_jsonl(), but parsing + canonize/identity/decide run in worker processes.
+    Stage latencies are the worker-side time per record (chunk time / records in the chunk).
+    """
+    chunk_size = max(1, int(chunk_size))
+    report = RunReport(chunk_size=chunk_size)
+
+    t_start = time.perf_counter()
+    with PipelineExecutor(workers=workers, blacklist_path=blacklist_path, whitelist_path=whitelist_path) as ex:
+        for part in ex.map_line_chunks(chunked(src, chunk_size)):
+            dst.write(part.text)
+            report.read += part.read
+            report.processed += part.processed
+            report.rejected += part.rejected
+            for name, seconds in part.stage_s.items():
+                report.stages[name].add(seconds, part.processed)
+
+    dst.flush()
+    report.elapsed_s = time.perf_counter() - t_start
+    return report
+
+# END_OF_FILE
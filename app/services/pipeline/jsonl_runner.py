@@ -0,0 +1,200 @@
+# File: app/services/pipeline/jsonl_runner.py
+# Version: v0.1.3
+# Changes: optional ContentCache: unchanged listings skip canonize/identity/decide/write (skip ratio in report);
+#          stage latencies are per record (chunk time / chunk records), labelled so in the report;
+#          report labels the percentiles as chunk means; a fully skipped chunk's read time is its own
+# Purpose: streaming JSONL replay (ListingRawPacket lines -> decision lines) with bounded memory
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from pydantic import ValidationError
+
+from app.core.contracts import DecisionPacket, ListingCanonicalPacket, ListingRawPacket, guard_iface
+from app.main import (
+    IFACE_INGEST_RAW_ID,
+    IFACE_INGEST_RAW_VER,
+    canonize_batch,
+    decide_batch,
+    identity_cluster_batch,
+)
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.whitelist_store import WhitelistStore
+from app.services.pipeline.content_cache import ContentCache, content_fingerprint, pipeline_versions, raw_listing_uid
+from app.services.pipeline.stats import LatencyStats
+
+T = TypeVar("T")
+
+STAGES = ("parse", "canonize", "identity", "decide", "write")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class RunReport:
+    read: int = 0
+    processed: int = 0
+    rejected: int = 0
+    skipped: int = 0  # unchanged since last run (content cache hit)
+    elapsed_s: float = 0.0
+    chunk_size: int = 0
+    stages: Dict[str, LatencyStats] = field(default_factory=lambda: {s: LatencyStats() for s in STAGES})
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"OK: read={self.read} processed={self.processed} rejected={self.rejected} skipped={self.skipped} "
+            f"elapsed={self.elapsed_s:.3f}s rate={self.records_per_sec:,.0f} rec/s chunk_size={self.chunk_size}"
+        ]
+        for name in STAGES:
+            s = self.stages[name].summary_ms()
+            lines.append(
+                f"  stage={name} records={int(s['count'])} chunk-mean p50={s['p50_ms']:.4f}ms p99={s['p99_ms']:.4f}ms "
+                f"avg={s['avg_ms']:.4f}ms/record"
+            )
+        return "\n".join(lines)
+
+
+# ---- io helpers ----
+
+
+def open_input(path: str) -> IO[str]:
+    """
+    Opens JSONL input for streaming reads. "-" = stdin.
+    gzip is detected by magic bytes (not by extension), so piped .gz dumps work too.
+    """
+    raw: IO[bytes] = sys.stdin.buffer if path == "-" else open(path, "rb")
+    buffered = raw if isinstance(raw, io.BufferedReader) else io.BufferedReader(raw)  # type: ignore[arg-type]
+    if buffered.peek(2)[:2] == _GZIP_MAGIC:
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=buffered), encoding="utf-8", errors="replace")
+    return io.TextIOWrapper(buffered, encoding="utf-8", errors="replace")
+
+
+def open_output(path: str) -> IO[str]:
+    """
+    "-" = stdout; *.gz => gzip output.
+    """
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "wb"), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    buf: List[T] = []
+    for item in items:
+        buf.append(item)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def iter_raw_packets(lines: Iterable[str], report: RunReport) -> Iterator[ListingRawPacket]:
+    """
+    Lazily parses ListingRawPacket lines. Broken JSON / contract violations / iface mismatches
+    are counted as rejected and skipped (one bad crawler line must not stop a replay).
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        report.read += 1
+        try:
+            pkt = ListingRawPacket.model_validate_json(line)
+            guard_iface(pkt.meta, IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER, mode="STRICT")
+        except (ValidationError, ValueError):
+            report.rejected += 1
+            continue
+        yield pkt
+
+
+def format_decision_line(canon_pkt: ListingCanonicalPacket, decision_pkt: DecisionPacket) -> str:
+    # DecisionPacket has no listing id of its own; prefix it so output lines can be joined back.
+    body = decision_pkt.model_dump_json()
+    return '{"listing_uid":' + json.dumps(canon_pkt.data.listing_uid, ensure_ascii=False) + "," + body[1:] + "\n"
+
+
+# ---- runner ----
+
+
+def run_jsonl(
+    src: Iterable[str],
+    dst: IO[str],
+    *,
+    chunk_size: int = 500,
+    blacklist: Optional[BlacklistStore] = None,
+    whitelist: Optional[WhitelistStore] = None,
+    content_cache: Optional[ContentCache] = None,
+    rule_pack: Any = None,
+) -> RunReport:
+    """
+    Streams src lines through canonize -> identity -> decide in chunks and writes decision JSONL to dst.
+    Only one chunk is alive at a time, so memory stays flat for any input size.
+    content_cache: listings whose content fingerprint (fields + list/rule-pack versions) matches
+    the last processed one are dropped before canonize and produce no output line.
+    """
+    chunk_size = max(1, int(chunk_size))
+    report = RunReport(chunk_size=chunk_size)
+    stages = report.stages
+
+    t_start = t_prev = time.perf_counter()
+    for chunk in chunked(iter_raw_packets(src, report), chunk_size):
+        n_parsed = len(chunk)
+        fps: List[str] = []
+        if content_cache is not None:
+            versions = pipeline_versions(blacklist=blacklist, whitelist=whitelist, rule_pack=rule_pack)
+            fresh = []
+            for p in chunk:
+                fp = content_fingerprint(p.data, versions)
+                if content_cache.is_unchanged(raw_listing_uid(p.data), fp):
+                    report.skipped += 1
+                else:
+                    fresh.append(p)
+                    fps.append(fp)
+            chunk = fresh
+            if not chunk:
+                t_next = time.perf_counter()
+                stages["parse"].add(t_next - t_prev, n_parsed)  # else the next chunk's parse time includes this one
+                t_prev = t_next
+                continue
+        t0 = time.perf_counter()
+        canon = canonize_batch(chunk)
+        t1 = time.perf_counter()
+        ident = identity_cluster_batch(canon)
+        t2 = time.perf_counter()
+        decisions = decide_batch(canon, ident, blacklist=blacklist, whitelist=whitelist)
+        t3 = time.perf_counter()
+        dst.write("".join(format_decision_line(c, d) for c, d in zip(canon, decisions)))
+        t4 = time.perf_counter()
+        if content_cache is not None:
+            for c, fp in zip(canon, fps):
+                content_cache.record(c.data.listing_uid, fp)
+            content_cache.flush()
+
+        n = len(chunk)
+        stages["parse"].add(t0 - t_prev, n_parsed)  # read + decode + validate (+ cache check) of this chunk
+        stages["canonize"].add(t1 - t0, n)
+        stages["identity"].add(t2 - t1, n)
+        stages["decide"].add(t3 - t2, n)
+        stages["write"].add(t4 - t3, n)
+        report.processed += n
+        t_prev = t4
+
+    dst.flush()
+    report.elapsed_s = time.perf_counter() - t_start
+    return report
+
+# END_OF_FILE
@@ -0,0 +1,61 @@
+# File: app/services/pipeline/stats.py
+# Version: v0.1.2
+# Changes: add(seconds, n): one timing covering n records (per-record samples, records counted);
+#          documented as chunk-mean percentiles (a chunk timing cannot show per-record tails)
+# Purpose: bounded-memory latency stats (p50/p99) for pipeline runners
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class LatencyStats:
+    """
+    Reservoir-sampled latency collector.
+    Memory is capped at max_samples regardless of how many observations are added,
+    so a 50M-record replay costs the same as a 10k one.
+
+    add(seconds, n) records one timing that covered n records (a chunk): the sample is the
+    chunk mean seconds / n, count grows by n and total_s by seconds. avg is exact per record;
+    the percentiles are over chunk means, so one slow record inside a chunk is averaged with the
+    rest - they show slow chunks, not the per-record tail. With n=1 per record they are per record.
+    """
+    max_samples: int = 10_000
+    count: int = 0
+    total_s: float = 0.0
+    _timings: int = 0  # add() calls (reservoir position)
+    _samples: List[float] = field(default_factory=list)
+    _rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def add(self, seconds: float, n: int = 1) -> None:
+        n = max(1, n)
+        self.count += n
+        self.total_s += seconds
+        self._timings += 1
+        sample = seconds / n
+        if len(self._samples) < self.max_samples:
+            self._samples.append(sample)
+            return
+        j = self._rng.randrange(self._timings)
+        if j < self.max_samples:
+            self._samples[j] = sample
+
+    def percentile(self, p: float) -> float:
+        if not self._samples:
+            return 0.0
+        s = sorted(self._samples)
+        idx = min(len(s) - 1, max(0, int(round(p / 100.0 * (len(s) - 1)))))
+        return s[idx]
+
+    def summary_ms(self) -> Dict[str, float]:
+        return {
+            "count": float(self.count),
+            "avg_ms": (self.total_s / self.count * 1000.0) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+        }
+
+# END_OF_FILE
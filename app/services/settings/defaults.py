@@ -1,5 +1,6 @@
 # File: app/services/settings/defaults.py
-# Version: v0.1.0
+# Version: v0.1.1
+# Changes: add decision.rule_pack key (hot-reloadable text rules; no default value)
 # Purpose: canonical default settings keys/values
 
 from __future__ import annotations
@@ -10,6 +11,10 @@ KEY_LEADS_MAX_PENDING = "leads.max_pending"
 KEY_LEADS_CLAIM_TIMEOUT_MIN = "leads.claim_timeout_minutes"
 KEY_LEADS_OVERFLOW_POLICY = "leads.overflow_policy"  # DROP_OLDEST_NEW | REJECT
 
+# Decision text rules: {"version": ..., "agent": [...], "fraud": [...]} (see decision/rule_packs.py).
+# Not in DEFAULTS: missing key => engines keep the builtin pack.
+KEY_DECISION_RULE_PACK = "decision.rule_pack"
+
 # Alerts/monitor defaults
 KEY_ALERT_COOLDOWN_MIN = "alerts.cooldown_minutes"
 
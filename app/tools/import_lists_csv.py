@@ -0,0 +1,86 @@
+# File: app/tools/import_lists_csv.py
+# Version: v0.2.0
+# Changes: --mode delta (diff against the current list, apply only adds/changes/removes), --dry-run
+# Purpose: CLI: stream a (multi-million row) agency CSV into Postgres blacklist/whitelist via COPY, or into a JSON store
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.services.lists.compact_store import CompactBlacklistStore, CompactWhitelistStore
+from app.services.lists.import_delta import import_csv_delta
+from app.services.lists.import_stream import PgCopySink, StoreSink, import_csv_stream
+from app.services.lists.pg_store import PgListProvider
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", required=True, help="CSV with a phone column (category/label, notes, name optional)")
+    ap.add_argument("--target", choices=["blacklist", "whitelist"], required=True)
+    ap.add_argument("--tenant", default="default")
+    ap.add_argument("--source", default="import_csv")
+    ap.add_argument("--mode", choices=["full", "delta"], default="full",
+                    help="delta = diff against the current list (same --source) and write only adds/changes/removes")
+    ap.add_argument("--keep-missing", action="store_true", help="delta: do not remove entries missing from the file")
+    ap.add_argument("--dry-run", action="store_true", help="delta: print the diff summary, write nothing")
+    ap.add_argument("--workers", type=int, default=0, help="0 = single process; N = normalize/hash in N worker processes")
+    ap.add_argument("--chunk-size", type=int, default=20_000)
+    ap.add_argument("--json-out", default=None, help="write a store JSON (save_json format) instead of Postgres")
+    args = ap.parse_args()
+
+    store_cls = CompactBlacklistStore if args.target == "blacklist" else CompactWhitelistStore
+
+    if args.mode == "delta":
+        json_out = Path(args.json_out) if args.json_out else None
+        if json_out is not None:
+            store = store_cls.load_json(json_out)
+            delta_sink = None if args.dry_run else StoreSink(store, target=args.target)
+        else:
+            provider = PgListProvider(kind=args.target, tenant_id=args.tenant)
+            provider.bulk_load()
+            store = provider.store
+            delta_sink = None if args.dry_run else PgCopySink(target=args.target, tenant_id=args.tenant)
+        diff = import_csv_delta(
+            Path(args.file),
+            store,
+            delta_sink,
+            target=args.target,
+            source=args.source,
+            remove_missing=not args.keep_missing,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        if json_out is not None and not args.dry_run:
+            store.save_json(json_out)
+        print(json.dumps(diff.summary()))
+        print(f"OK: {args.target} delta {diff.format()}", file=sys.stderr)
+        return 0
+
+    if args.json_out:
+        store = store_cls()
+        sink = StoreSink(store, target=args.target)
+    else:
+        sink = PgCopySink(target=args.target, tenant_id=args.tenant)
+
+    report = import_csv_stream(
+        Path(args.file),
+        sink,
+        target=args.target,
+        source=args.source,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    if args.json_out:
+        store.save_json(Path(args.json_out))
+
+    print(f"OK: {args.target} {report.format()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
@@ -0,0 +1,72 @@
+# File: app/tools/ingest_jsonl.py
+# Version: v0.2.1
+# Changes: add --workers (process-pool executor); --skip-unchanged / --fingerprints-pg (content cache)
+# Purpose: CLI: replay ListingRawPacket JSONL(.gz) dumps through the pipeline -> decisions JSONL
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.whitelist_store import WhitelistStore
+from app.services.pipeline.content_cache import ContentCache
+from app.services.pipeline.executor import run_jsonl_parallel
+from app.services.pipeline.jsonl_runner import open_input, open_output, run_jsonl
+from app.services.storage.fingerprint_repo import ContentFingerprintRepo
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default="-", help="JSONL or gzip JSONL file; '-' = stdin")
+    ap.add_argument("--output", default="-", help="decisions JSONL; '-' = stdout; *.gz = gzip")
+    ap.add_argument("--chunk-size", type=int, default=500)
+    ap.add_argument("--blacklist", default=None, help="BlacklistStore JSON (save_json format)")
+    ap.add_argument("--whitelist", default=None, help="WhitelistStore JSON (save_json format)")
+    ap.add_argument("--workers", type=int, default=0, help="0 = single process; N = process pool (-1 = all cores)")
+    ap.add_argument("--skip-unchanged", action="store_true", help="drop listings whose content did not change (single process)")
+    ap.add_argument("--fingerprints-pg", action="store_true", help="with --skip-unchanged: warm/persist fingerprints in Postgres")
+    ap.add_argument("--tenant", default="default")
+    args = ap.parse_args()
+    if args.skip_unchanged and args.workers:
+        ap.error("--skip-unchanged needs the single-process runner (--workers 0)")
+
+    cache = None
+    if args.skip_unchanged:
+        repo = ContentFingerprintRepo() if args.fingerprints_pg else None
+        cache = ContentCache(repo=repo, tenant_id=args.tenant)
+        cache.warm()
+
+    src = open_input(args.input)
+    dst = open_output(args.output)
+    try:
+        if args.workers:
+            report = run_jsonl_parallel(
+                src,
+                dst,
+                workers=(None if args.workers < 0 else args.workers),
+                chunk_size=args.chunk_size,
+                blacklist_path=Path(args.blacklist) if args.blacklist else None,
+                whitelist_path=Path(args.whitelist) if args.whitelist else None,
+            )
+        else:
+            blacklist = BlacklistStore.load_json(Path(args.blacklist)) if args.blacklist else None
+            whitelist = WhitelistStore.load_json(Path(args.whitelist)) if args.whitelist else None
+            report = run_jsonl(src, dst, chunk_size=args.chunk_size, blacklist=blacklist, whitelist=whitelist, content_cache=cache)
+    finally:
+        src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    # stats go to stderr so stdout stays clean JSONL
+    print(report.format(), file=sys.stderr)
+    if cache is not None:
+        print(f"content_cache: {cache.stats.as_dict()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
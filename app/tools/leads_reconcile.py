@@ -0,0 +1,31 @@
+# File: app/tools/leads_reconcile.py
+# Version: v0.1.0
+# Purpose: reconcile per-tenant pending lead counters (leads_pending_counts) with the leads queue
+
+from __future__ import annotations
+
+import argparse
+
+from app.services.leads.queue_repo import LeadsQueueRepo
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tenant", default=None, help="one tenant (default: every tenant with a counter or pending leads)")
+    ap.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    args = ap.parse_args()
+
+    repo = LeadsQueueRepo()
+    drifted = repo.reconcile_pending(tenant_id=args.tenant, fix=not args.dry_run)
+
+    for d in drifted:
+        print(f"DRIFT: tenant={d.tenant_id} counted={d.counted} actual={d.actual} drift={d.drift:+d}")
+    action = "would fix" if args.dry_run else "fixed"
+    print(f"OK: tenant={args.tenant or '*'} drifted={len(drifted)} ({action})")
+    return 1 if drifted and args.dry_run else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
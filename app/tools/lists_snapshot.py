@@ -0,0 +1,40 @@
+# File: app/tools/lists_snapshot.py
+# Version: v0.1.1
+# Changes: entry-count check raises SystemExit with a message (an assert vanishes under python -O)
+# Purpose: CLI: convert a blacklist/whitelist JSON (save_json format) into an mmap binary snapshot
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from app.services.lists.compact_store import CompactBlacklistStore, CompactWhitelistStore
+from app.services.lists.snapshot import MappedBlacklist, MappedWhitelist, write_snapshot
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--kind", choices=["blacklist", "whitelist"], required=True)
+    ap.add_argument("--input", required=True, help="store JSON (save_json format)")
+    ap.add_argument("--output", required=True, help="snapshot file, e.g. data/lists/blacklist.snap")
+    args = ap.parse_args()
+
+    store_cls = CompactBlacklistStore if args.kind == "blacklist" else CompactWhitelistStore
+    store = store_cls.load_json(Path(args.input))
+    n = write_snapshot(Path(args.output), store, kind=args.kind)
+
+    t0 = time.perf_counter()
+    mapped_cls = MappedBlacklist if args.kind == "blacklist" else MappedWhitelist
+    with mapped_cls(Path(args.output)) as snap:
+        open_ms = (time.perf_counter() - t0) * 1000
+        if len(snap) != n:
+            raise SystemExit(f"FAIL: {args.output}: snapshot holds {len(snap)} entries, {n} were written")
+    print(f"OK: {args.kind} snapshot {args.output}: entries={n} open_ms={open_ms:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
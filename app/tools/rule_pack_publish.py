@@ -0,0 +1,37 @@
+# File: app/tools/rule_pack_publish.py
+# Version: v0.1.0
+# Purpose: validate a decision rule pack JSON and publish it to tenant_settings (workers hot-reload it)
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from app.services.decision.rule_packs import load_rule_pack_json
+from app.services.settings.defaults import KEY_DECISION_RULE_PACK
+from app.services.settings.repo import SettingsRepo
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", required=True, help='{"version": "...", "agent": [...], "fraud": [...]}')
+    ap.add_argument("--tenant", default="default")
+    ap.add_argument("--dry-run", action="store_true", help="Only compile/validate the pack")
+    args = ap.parse_args()
+
+    pack = load_rule_pack_json(Path(args.file))  # raises ValueError on bad patterns
+    counts = " ".join(f"{g}={len(ps)}" for g, ps in pack.patterns.items())
+
+    if args.dry_run:
+        print(f"DRY_RUN: rule pack version={pack.version} {counts} is valid")
+        return 0
+
+    SettingsRepo().set_json(tenant_id=args.tenant, key=KEY_DECISION_RULE_PACK, value=pack.to_json_obj())
+    print(f"OK: tenant={args.tenant} published rule pack version={pack.version} {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
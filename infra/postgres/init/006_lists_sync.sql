@@ -0,0 +1,11 @@
+-- File: infra/postgres/init/006_lists_sync.sql
+-- Version: v0.1.0
+-- Purpose: indexes for incremental list sync (added_at_utc watermark per tenant)
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_tenant_added
+  ON blacklist (tenant_id, added_at_utc);
+
+CREATE INDEX IF NOT EXISTS idx_whitelist_tenant_added
+  ON whitelist (tenant_id, added_at_utc);
+
+-- END_OF_FILE
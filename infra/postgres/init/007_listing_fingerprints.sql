@@ -0,0 +1,16 @@
+-- File: infra/postgres/init/007_listing_fingerprints.sql
+-- Version: v0.1.0
+-- Purpose: last processed content fingerprint per listing (pipeline exact-duplicate short-circuit)
+
+CREATE TABLE IF NOT EXISTS listing_fingerprints (
+  tenant_id         TEXT NOT NULL DEFAULT 'default',
+  listing_uid       TEXT NOT NULL,
+  fingerprint       TEXT NOT NULL,
+  processed_at_utc  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (tenant_id, listing_uid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_listing_fingerprints_tenant_time
+  ON listing_fingerprints (tenant_id, processed_at_utc DESC);
+
+-- END_OF_FILE
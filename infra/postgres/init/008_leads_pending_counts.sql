@@ -0,0 +1,82 @@
+-- File: infra/postgres/init/008_leads_pending_counts.sql
+-- Version: v0.1.0
+-- Purpose: per-tenant pending (NEW+CLAIMED) lead counter for the O(1) max_pending overflow guard
+
+CREATE TABLE IF NOT EXISTS leads_pending_counts (
+  tenant_id       TEXT PRIMARY KEY,
+  pending         BIGINT NOT NULL DEFAULT 0,
+  updated_at_utc  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Statement-level triggers with transition tables: one counter upsert per tenant per statement
+-- (a 10k-row batch insert or a bulk expire touches the counter once), in the same transaction
+-- as the status change. Transitions that keep a lead pending (NEW -> CLAIMED, CLAIMED -> NEW)
+-- net to zero and leave the counter row alone, so claims never contend on it.
+CREATE OR REPLACE FUNCTION leads_pending_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO leads_pending_counts AS c (tenant_id, pending, updated_at_utc)
+    SELECT tenant_id, COUNT(*), NOW()
+    FROM new_rows
+    WHERE status IN ('NEW','CLAIMED')
+    GROUP BY tenant_id
+    ON CONFLICT (tenant_id) DO UPDATE SET
+      pending = c.pending + EXCLUDED.pending,
+      updated_at_utc = NOW();
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO leads_pending_counts AS c (tenant_id, pending, updated_at_utc)
+    SELECT tenant_id, -COUNT(*), NOW()
+    FROM old_rows
+    WHERE status IN ('NEW','CLAIMED')
+    GROUP BY tenant_id
+    ON CONFLICT (tenant_id) DO UPDATE SET
+      pending = c.pending + EXCLUDED.pending,
+      updated_at_utc = NOW();
+  ELSE
+    INSERT INTO leads_pending_counts AS c (tenant_id, pending, updated_at_utc)
+    SELECT tenant_id, SUM(delta), NOW()
+    FROM (
+      SELECT tenant_id, 1 AS delta FROM new_rows WHERE status IN ('NEW','CLAIMED')
+      UNION ALL
+      SELECT tenant_id, -1 AS delta FROM old_rows WHERE status IN ('NEW','CLAIMED')
+    ) d
+    GROUP BY tenant_id
+    HAVING SUM(delta) <> 0
+    ON CONFLICT (tenant_id) DO UPDATE SET
+      pending = c.pending + EXCLUDED.pending,
+      updated_at_utc = NOW();
+  END IF;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS leads_pending_counts_ins ON leads_queue;
+CREATE TRIGGER leads_pending_counts_ins
+  AFTER INSERT ON leads_queue
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION leads_pending_counts_apply();
+
+DROP TRIGGER IF EXISTS leads_pending_counts_upd ON leads_queue;
+CREATE TRIGGER leads_pending_counts_upd
+  AFTER UPDATE ON leads_queue
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION leads_pending_counts_apply();
+
+DROP TRIGGER IF EXISTS leads_pending_counts_del ON leads_queue;
+CREATE TRIGGER leads_pending_counts_del
+  AFTER DELETE ON leads_queue
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION leads_pending_counts_apply();
+
+-- backfill from existing rows; later drift is fixed with app.tools.leads_reconcile
+INSERT INTO leads_pending_counts (tenant_id, pending, updated_at_utc)
+SELECT tenant_id, COUNT(*), NOW()
+FROM leads_queue
+WHERE status IN ('NEW','CLAIMED')
+GROUP BY tenant_id
+ON CONFLICT (tenant_id) DO UPDATE SET
+  pending = EXCLUDED.pending,
+  updated_at_utc = NOW();
+
+-- END_OF_FILE
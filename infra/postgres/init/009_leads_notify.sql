@@ -0,0 +1,29 @@
+-- File: infra/postgres/init/009_leads_notify.sql
+-- Version: v0.1.0
+-- Purpose: NOTIFY leads_queue_new (payload: tenant_id) whenever leads become NEW (enqueue, released claims)
+
+-- Statement-level: one notification per tenant per statement, sent on commit (Postgres also folds
+-- duplicates within a transaction). Consumers blocked in claim_batch(wait_seconds=...) wake on it.
+CREATE OR REPLACE FUNCTION leads_queue_notify_new() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('leads_queue_new', t.tenant_id)
+  FROM (SELECT DISTINCT tenant_id FROM new_rows WHERE status = 'NEW') t;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS leads_queue_notify_ins ON leads_queue;
+CREATE TRIGGER leads_queue_notify_ins
+  AFTER INSERT ON leads_queue
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION leads_queue_notify_new();
+
+-- claims (NEW -> CLAIMED) leave no NEW row in new_rows and stay silent; releases (CLAIMED -> NEW) notify
+DROP TRIGGER IF EXISTS leads_queue_notify_upd ON leads_queue;
+CREATE TRIGGER leads_queue_notify_upd
+  AFTER UPDATE ON leads_queue
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION leads_queue_notify_new();
+
+-- END_OF_FILE
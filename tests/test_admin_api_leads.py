@@ -0,0 +1,127 @@
+# File: tests/test_admin_api_leads.py
+# Version: v0.1.1
+# Changes: waiting claims beyond the per-process cap get 429
+# Purpose: lead delivery API tests (NDJSON claim stream, gzip, batch ack/fail, role checks) against a fake repo
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.admin_api.main import app
+from app.admin_api.routes import leads as leads_routes
+from app.admin_api.routes.leads import get_leads_repo
+from app.services.leads.queue_repo import ClaimedLead
+
+SYSTEM = {"X-AICP-Role": "system", "X-AICP-Actor": "crm-test"}
+
+
+class FakeLeadsRepo:
+    def __init__(self, n: int) -> None:
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.leads = [ClaimedLead(f"lead-{i}", now, now + timedelta(days=14), {"i": i, "title": "квартира"}) for i in range(n)]
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def claim_stream(self, *, tenant_id: str, limit: int, wait_seconds: float = 0.0, chunk_size: int = 1000) -> Tuple[str, int, Iterator[ClaimedLead]]:
+        self.calls.append(("claim", {"tenant_id": tenant_id, "limit": limit, "wait_seconds": wait_seconds}))
+        batch = self.leads[:limit]
+        return "tok-1", len(batch), iter(batch)
+
+    def ack_delivered(self, *, tenant_id: str, claim_token: str, lead_ids: Sequence[str]) -> int:
+        self.calls.append(("ack", {"claim_token": claim_token, "lead_ids": list(lead_ids)}))
+        return len(lead_ids) - 1  # one id lost its claim
+
+    def mark_failed_many(self, *, tenant_id: str, claim_token: str, lead_ids: Sequence[str], error: str) -> int:
+        self.calls.append(("fail", {"claim_token": claim_token, "lead_ids": list(lead_ids), "error": error}))
+        return len(lead_ids)
+
+    def pending_count(self, *, tenant_id: str) -> int:
+        return 42
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.delenv("AICP_ADMIN_TOKEN", raising=False)
+    fake = FakeLeadsRepo(500)
+    app.dependency_overrides[get_leads_repo] = lambda: fake
+    yield fake
+    app.dependency_overrides.pop(get_leads_repo, None)
+
+
+def test_claim_streams_ndjson(repo):
+    c = TestClient(app)
+    r = c.post("/api/leads/t1/claim", params={"limit": 3, "wait_seconds": 2.5}, headers=SYSTEM)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert r.headers["X-Claim-Token"] == "tok-1"
+    assert r.headers["X-Lead-Count"] == "3"
+
+    lines = [json.loads(line) for line in r.text.splitlines() if line]
+    assert lines[0] == {"claim_token": "tok-1", "count": 3}
+    assert [x["lead_id"] for x in lines[1:]] == ["lead-0", "lead-1", "lead-2"]
+    assert lines[1]["payload"] == {"i": 0, "title": "квартира"}
+    assert lines[1]["created_at_utc"] == "2026-01-01T00:00:00+00:00"
+    assert repo.calls[0] == ("claim", {"tenant_id": "t1", "limit": 3, "wait_seconds": 2.5})
+
+
+def test_claim_large_batch_is_gzipped(repo):
+    c = TestClient(app)
+    r = c.post("/api/leads/t1/claim", params={"limit": 500}, headers={**SYSTEM, "Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers.get("content-encoding") == "gzip"
+    lines = [line for line in r.text.splitlines() if line]  # httpx decodes transparently
+    assert len(lines) == 501
+    assert r.num_bytes_downloaded < len(r.content)
+
+
+def test_claim_validates_limits(repo):
+    c = TestClient(app)
+    assert c.post("/api/leads/t1/claim", params={"limit": 0}, headers=SYSTEM).status_code == 422
+    assert c.post("/api/leads/t1/claim", params={"wait_seconds": 31}, headers=SYSTEM).status_code == 422
+    assert repo.calls == []
+
+
+def test_waiting_claims_are_capped(repo, monkeypatch):
+    monkeypatch.setattr(leads_routes, "_long_polls", threading.BoundedSemaphore(1))
+    c = TestClient(app)
+    assert c.post("/api/leads/t1/claim", params={"wait_seconds": 1}, headers=SYSTEM).status_code == 200
+    assert c.post("/api/leads/t1/claim", params={"wait_seconds": 1}, headers=SYSTEM).status_code == 200  # slot released
+
+    leads_routes._long_polls.acquire()  # the one slot is taken by another waiting client
+    r = c.post("/api/leads/t1/claim", params={"wait_seconds": 1}, headers=SYSTEM)
+    assert r.status_code == 429 and r.headers["Retry-After"] == "1"
+    assert c.post("/api/leads/t1/claim", params={"limit": 2}, headers=SYSTEM).status_code == 200  # no wait: not capped
+    assert len(repo.calls) == 3
+
+
+def test_ack_and_fail_batches(repo):
+    c = TestClient(app)
+    r = c.post("/api/leads/t1/ack", json={"claim_token": "tok-1", "lead_ids": ["a", "b", "c"]}, headers=SYSTEM)
+    assert r.status_code == 200
+    assert r.json() == {"requested": 3, "updated": 2}
+
+    r = c.post("/api/leads/t1/fail", json={"claim_token": "tok-1", "lead_ids": ["d"], "error": "crm 500"}, headers=SYSTEM)
+    assert r.status_code == 200
+    assert r.json() == {"requested": 1, "updated": 1}
+    assert repo.calls[-1] == ("fail", {"claim_token": "tok-1", "lead_ids": ["d"], "error": "crm 500"})
+
+    r = c.post("/api/leads/t1/ack", json={"claim_token": "tok-1", "lead_ids": []}, headers=SYSTEM)
+    assert r.status_code == 422
+
+    r = c.get("/api/leads/t1/pending", headers=SYSTEM)
+    assert r.json() == {"tenant_id": "t1", "pending": 42}
+
+
+def test_leads_api_requires_system_role(repo):
+    c = TestClient(app)
+    assert c.post("/api/leads/t1/claim", headers={"X-AICP-Role": "admin"}).status_code == 403
+    assert c.post("/api/leads/t1/ack", json={"claim_token": "x", "lead_ids": ["a"]}).status_code == 403
+    assert c.get("/api/leads/t1/pending", headers={"X-AICP-Role": "agent"}).status_code == 403
+    assert repo.calls == []
+
+# END_OF_FILE
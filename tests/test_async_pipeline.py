@@ -0,0 +1,115 @@
+# File: tests/test_async_pipeline.py
+# Version: v0.1.1
+# Changes: stages run in threads (micro-batches held by workers count toward the ingest lead); bad packets are rejected, not fatal
+# Purpose: asyncio pipeline: all items reach the sink, bounded queues throttle ingest behind a slow sink
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta
+from app.main import IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.pipeline import async_pipeline
+from app.services.pipeline.async_pipeline import AsyncPipeline, AsyncPipelineConfig, PipelineItem, RepoSink
+
+
+def _pkts(n: int) -> list[ListingRawPacket]:
+    meta = Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=IFACE_INGEST_RAW_VER, trace_id="t", producer="test")
+    return [
+        ListingRawPacket(meta=meta, data=ListingRaw(source="manual", source_listing_id=f"x{i}", phone_raw=f"+38067{i:07d}"))
+        for i in range(n)
+    ]
+
+
+def test_async_pipeline_delivers_everything_with_bounded_queues():
+    bl = BlacklistStore()
+    bl.add_phone(phone_e164="+380670000005", category="FRAUD", source="test")
+
+    seen: list[PipelineItem] = []
+    max_ingest_lead = 0
+
+    async def slow_sink(item: PipelineItem) -> None:
+        await asyncio.sleep(0.001)
+        seen.append(item)
+
+    pipe = AsyncPipeline(
+        sink=slow_sink,
+        cfg=AsyncPipelineConfig(queue_size=4, decide_concurrency=2, sink_concurrency=2),
+        blacklist=bl,
+    )
+
+    async def source():
+        nonlocal max_ingest_lead
+        for i, p in enumerate(_pkts(60)):
+            # ingest may only run ahead of the sink by queue capacity (4 queues x 4) + items held by
+            # workers: a micro-batch of up to queue_size + 1 per CPU worker (4) + one per sink worker (2)
+            max_ingest_lead = max(max_ingest_lead, i - len(seen))
+            yield p
+
+    stats = asyncio.run(pipe.run(source()))
+
+    assert stats.ingested == 60
+    assert stats.sunk == 60
+    assert sorted(it.canon.data.listing_uid for it in seen) == sorted(f"manual:x{i}" for i in range(60))
+    assert [it.decision.data.action.value for it in seen if it.canon.data.source_listing_id == "x5"] == ["BLOCK"]
+
+    assert max_ingest_lead <= 4 * 4 + 4 * (4 + 1) + 2
+    assert all(q["max_depth"] <= 4 for q in stats.queues.values())
+    assert stats.queues["raw"]["put_wait_s"] > 0.0  # ingest was throttled by the slow sink
+
+
+def test_invalid_packet_is_rejected_and_the_run_continues():
+    pkts = _pkts(20)
+    pkts[7] = pkts[7].model_copy(update={"meta": pkts[7].meta.model_copy(update={"iface_version": "v9.9.9"})})
+    seen: list[PipelineItem] = []
+
+    async def sink(item: PipelineItem) -> None:
+        seen.append(item)
+
+    cfg = AsyncPipelineConfig(queue_size=4, canon_concurrency=2, identity_concurrency=2, decide_concurrency=2, stage_batch=3)
+    stats = asyncio.run(AsyncPipeline(sink=sink, cfg=cfg).run(pkts))
+    assert (stats.ingested, stats.rejected, stats.sunk) == (20, 1, 19)
+    assert "manual:x7" not in {it.canon.data.listing_uid for it in seen}
+
+
+def test_cpu_stages_run_off_the_event_loop(monkeypatch):
+    threads = set()
+    real_canonize = async_pipeline.canonize
+
+    def canonize(pkt):
+        threads.add(threading.current_thread().name)
+        return real_canonize(pkt)
+
+    monkeypatch.setattr(async_pipeline, "canonize", canonize)
+
+    async def sink(item: PipelineItem) -> None:
+        pass
+
+    assert asyncio.run(AsyncPipeline(sink=sink).run(_pkts(10))).sunk == 10
+    assert threads and all(name.startswith("pipeline-stage") for name in threads)
+
+
+def test_repo_sink_routes_to_repos():
+    class FakeRepo:
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, dict]] = []
+
+        def upsert_listing_current(self, **kw) -> None:
+            self.calls.append(("upsert", kw))
+
+        def insert(self, pkt) -> None:
+            self.calls.append(("event", {"pkt": pkt}))
+
+        def enqueue(self, **kw) -> str:
+            self.calls.append(("enqueue", kw))
+            return "lead-1"
+
+    repo = FakeRepo()
+    sink = RepoSink(tenant_id="t1", pg_repo=repo, event_writer=repo, leads_repo=repo)
+    asyncio.run(AsyncPipeline(sink=sink).run(_pkts(2)))
+
+    kinds = [k for k, _ in repo.calls]
+    assert kinds.count("upsert") == 2 and kinds.count("event") == 2 and kinds.count("enqueue") == 2
+    assert all(kw["tenant_id"] == "t1" for k, kw in repo.calls if k != "event")
@@ -0,0 +1,102 @@
+# File: tests/test_bloom.py
+# Version: v0.1.2
+# Changes: stale-filter detection by key-set checksum (same size / duplicate adds); dict exact store by default
+# Purpose: bloom filter (no false negatives, fp rate, disk round-trip) + vendor-feed bloom-fronted blacklist
+
+from pathlib import Path
+
+import pytest
+
+from app.core.crypto import phone_hash_e164
+from app.core.deployment import DeploymentMode
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistStore
+from app.services.lists.bloom import BloomFilter, BloomFrontedBlacklist, keyset_checksum
+from app.services.lists.compact_store import CompactBlacklistStore
+from app.services.lists.providers import get_lists_providers
+
+
+def _hashes(n: int, offset: int = 0) -> list[str]:
+    return [phone_hash_e164(f"+38099{i + offset:07d}") for i in range(n)]
+
+
+def test_bloom_no_false_negatives_and_fp_rate_close_to_target():
+    bf = BloomFilter(capacity=5000, fp_rate=0.01)
+    members = _hashes(5000)
+    bf.update(members)
+
+    assert all(h in bf for h in members)
+    others = _hashes(20000, offset=1_000_000)
+    fp = sum(h in bf for h in others) / len(others)
+    assert fp < 0.02
+    assert bf.size_bytes < 5000 * 2
+
+
+def test_bloom_save_load_roundtrip(tmp_path: Path):
+    bf = BloomFilter(capacity=100, fp_rate=0.001)
+    bf.update(["a", "b", "c"] + _hashes(10))
+    path = tmp_path / "vendor.bloom"
+    bf.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert (loaded.m, loaded.k, len(loaded)) == (bf.m, bf.k, len(bf))
+    assert all(k in loaded for k in ["a", "b", "c"] + _hashes(10))
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
+
+
+def test_bloom_fronted_blacklist_negatives_skip_exact_store(tmp_path: Path):
+    bl = BloomFrontedBlacklist(capacity=1000, fp_rate=0.001)
+    bl.add_phone(phone_e164="+380991112233", category="FRAUD")
+
+    assert bl.is_blacklisted_phone("+380991112233")
+    for h in _hashes(500, offset=2_000_000):
+        assert not bl.is_blacklisted_phone_hash(h)
+    assert bl.filter_negatives + bl.false_positives == 500
+    assert bl.exact_probes == 1 + bl.false_positives
+
+    path = tmp_path / "vendor.bloom"
+    bl.save_filter(path)
+    fresh = BloomFrontedBlacklist(capacity=10, fp_rate=0.01, exact=bl.exact)
+    fresh.load_filter(path)
+    assert fresh.filter.m == bl.filter.m
+    assert fresh.is_blacklisted_phone("+380991112233")
+
+    stale = BloomFilter(capacity=10, fp_rate=0.01)
+    stale.save(path)
+    with pytest.raises(ValueError):
+        fresh.load_filter(path)
+
+
+def test_load_filter_rejects_other_key_set_of_same_size(tmp_path: Path):
+    path = tmp_path / "vendor.bloom"
+    old = BloomFrontedBlacklist(capacity=100, fp_rate=0.01)
+    for h in _hashes(10):
+        old.add_entry(BlacklistEntry(phone_hash=h, category="FRAUD"))
+    old.add_entry(BlacklistEntry(phone_hash=_hashes(1)[0], category="FRAUD"))  # duplicate add: filter count 11, key set 10
+    old.save_filter(path)
+    assert BloomFilter.load(path).keyset == keyset_checksum(_hashes(10))
+
+    # the list was re-fetched: one hash replaced, same size -> the saved filter would miss the new one
+    current = CompactBlacklistStore()
+    for h in _hashes(9) + _hashes(1, offset=500):
+        current.add_hash(h, label="FRAUD")
+    bl = BloomFrontedBlacklist(capacity=100, fp_rate=0.01, exact=current)
+    with pytest.raises(ValueError, match="stale filter"):
+        bl.load_filter(path)
+    assert bl.is_blacklisted_phone_hash(_hashes(1, offset=500)[0])
+
+    # same key set, different insertion order: the saved filter is accepted
+    same = CompactBlacklistStore()
+    for h in reversed(_hashes(10)):
+        same.add_hash(h, label="SCAM")
+    BloomFrontedBlacklist(capacity=100, fp_rate=0.01, exact=same).load_filter(path)
+
+
+def test_vendor_feed_provider_uses_bloom_front():
+    p = get_lists_providers(mode=DeploymentMode.VENDOR_FEED, bloom_capacity=1000, bloom_fp_rate=0.01)
+    assert isinstance(p.blacklist, BloomFrontedBlacklist)
+    assert isinstance(p.blacklist.exact, BlacklistStore)
+    assert p.blacklist.filter.fp_rate == 0.01
+    assert isinstance(BloomFrontedBlacklist(capacity=10).exact, BlacklistStore)
@@ -0,0 +1,132 @@
+# File: tests/test_compact_store.py
+# Version: v0.1.2
+# Changes: sorted-key index: bulk loads (duplicates keep the last row), delta merges, removals across merges;
+#          keys come from the digest bytes (shared 8-byte prefixes, pickle round trip)
+# Purpose: compact array-backed list stores behave like the dict stores
+
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.crypto import phone_hash_e164
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.compact_store import CompactBlacklistStore, CompactWhitelistStore, PhoneHashIndex
+from app.services.lists.whitelist_store import WhitelistStore
+
+
+class _Listing:
+    def __init__(self, phone_hash):
+        self.phone_hash = phone_hash
+
+
+def test_phone_hash_index_grows_and_finds_every_digest():
+    idx = PhoneHashIndex()
+    digests = [bytes.fromhex(phone_hash_e164(f"+38099{i:07d}")) for i in range(2000)]
+    for i, d in enumerate(digests):
+        assert idx.add(d) == (i, True)
+    assert idx.add(digests[7]) == (7, False)
+    assert len(idx) == 2000
+    assert all(idx.find(d) == i for i, d in enumerate(digests))
+    assert idx.find(bytes(32)) == -1
+
+
+def test_phone_hash_index_merges_delta_and_drops_removed_keys():
+    rnd = random.Random(3)
+    idx = PhoneHashIndex()
+    digests = [rnd.randbytes(32) for _ in range(20_000)]  # several delta merges
+    for i, d in enumerate(digests):
+        assert idx.add(d) == (i, True)
+    gone = digests[::3]
+    for d in gone:
+        assert idx.remove(d) >= 0
+    for d in digests[:5000]:
+        idx.add(d)  # re-adds the removed ones among them, merges again
+    missing = set(gone) - set(digests[:5000])
+    for d in digests:
+        assert (idx.find(d) >= 0) == (d not in missing)
+        assert idx.contains_hex(d.hex()) == (d not in missing)
+    assert len(idx) == len(digests) - len(missing)
+    assert not idx.contains_hex(None) and not idx.contains_hex("zz") and not idx.contains_hex(bytes(32).hex())
+
+
+def test_index_keys_are_digest_prefixes_and_pickle():
+    rnd = random.Random(5)
+    head = rnd.randbytes(8)
+    twins = [head + rnd.randbytes(24) for _ in range(3)]  # equal sorted-array keys
+    digests = [rnd.randbytes(32) for _ in range(6000)] + twins
+    idx = PhoneHashIndex()
+    with idx.bulk():
+        for d in digests:
+            idx.insert(d)
+    idx.add(twins[0][:8] + bytes(24))  # one more twin, in the delta
+    keys, ids = idx._state[:2]
+    assert list(keys) == sorted(int(idx.digest(e).hex()[:16], 16) for e in ids)
+    assert all(idx.find(d) == i for i, d in enumerate(digests))
+    assert idx.find(head + b"\x01" * 24) == -1
+
+    copy = pickle.loads(pickle.dumps(idx))  # no per-process hash seed in the keys
+    assert all(copy.contains_hex(d.hex()) for d in digests) and copy.find(twins[0][:8] + bytes(24)) == len(digests)
+    assert not copy.contains_hex(("-" + "0" * 15) + "0" * 48) and not copy.contains_hex("_" * 64)
+
+
+def test_bulk_load_keeps_last_duplicate_and_matches_per_row_adds():
+    rows = [(phone_hash_e164(f"+38099{i % 700:07d}"), "FRAUD" if i < 700 else "SCAM") for i in range(1000)]
+    per_row, bulk = CompactBlacklistStore(), CompactBlacklistStore()
+    for h, cat in rows:
+        per_row.add_hash(h, label=cat)
+    with bulk.bulk():
+        for h, cat in rows:
+            bulk.add_hash(h, label=cat)
+            assert not bulk.is_blacklisted_phone_hash(h)  # not visible until the block exits
+    assert len(bulk) == len(per_row) == 700
+    assert bulk.version == per_row.version
+    assert bulk.get_profile(rows[0][0])[0] == "SCAM" and bulk.get_profile(rows[699][0])[0] == "FRAUD"
+    assert sorted(bulk.phone_hashes()) == sorted(per_row.phone_hashes())
+    assert all(bulk.is_blacklisted_phone_hash(h) for h, _ in rows)
+
+
+def test_compact_blacklist_matches_dict_store(tmp_path: Path):
+    ref = BlacklistStore()
+    compact = CompactBlacklistStore()
+    for i in range(300):
+        kw = dict(phone_e164=f"+38099{i:07d}", category=("FRAUD" if i % 3 else "RESELLER"), source="vendor", confidence=0.5 + (i % 2) / 2)
+        ref.add_phone(**kw)
+        compact.add_phone(**kw)
+    compact.add_phone(phone_e164="+380990000001", category="SCAM", store_phone_e164=True)
+    ref.add_phone(phone_e164="+380990000001", category="SCAM", store_phone_e164=True)
+
+    assert len(compact) == len(ref) == 300
+    for i in range(310):
+        h = phone_hash_e164(f"+38099{i:07d}")
+        assert compact.is_blacklisted_phone_hash(h) == ref.is_blacklisted_phone_hash(h)
+        assert compact.match_listing(_Listing(h)) == ref.match_listing(_Listing(h))
+    for bad in (None, "", "zz", "g" * 64):
+        assert compact.is_blacklisted_phone_hash(bad) is False
+
+    path = tmp_path / "bl.json"
+    CompactBlacklistStore.from_store(ref).save_json(path)
+    reloaded = BlacklistStore.load_json(path)
+    assert {e.phone_hash: e for e in reloaded.entries()} == {e.phone_hash: e for e in ref.entries()}
+    assert len(CompactBlacklistStore.load_json(path)) == 300
+
+    h = phone_hash_e164("+380990000001")
+    assert CompactBlacklistStore.from_store(ref).get_entry(h) == ref._by_phone_hash[h]
+
+
+def test_compact_whitelist_match_and_invalid_hash():
+    wl = CompactWhitelistStore()
+    wl.add_phone(phone_e164="+380991112233", label="PARTNER")
+    h = phone_hash_e164("+380991112233")
+
+    m = wl.match_listing(_Listing(h))
+    assert m.matched and m.reasons == ["WHITELIST_PHONE"]
+    assert m.evidence == ["label=PARTNER conf=1.0 source=manual"]
+
+    ref = WhitelistStore()
+    ref.add_phone(phone_e164="+380991112233", label="PARTNER")
+    assert CompactWhitelistStore.from_store(ref).is_whitelisted_phone_hash(h)
+
+    with pytest.raises(ValueError):
+        wl.add_hash("not-a-hash", label="X")
@@ -0,0 +1,161 @@
+# File: tests/test_content_cache.py
+# Version: v0.1.2
+# Changes: list versions are content hashes (restart with an edited same-size list must not skip);
+#          tenant salt, phone region and identity engine setup are part of the versions
+# Purpose: content-fingerprint short-circuit (fingerprint/versions, TTL/LRU, repo warm/flush, pipeline skips)
+
+from __future__ import annotations
+
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta
+from app.core.crypto import phone_hash_e164
+from app.main import IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER
+from app.services.identity.engine import DEFAULT_POLICIES, IdentityEngine, SignalPolicy
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.compact_store import CompactBlacklistStore
+from app.services.pipeline.async_pipeline import AsyncPipeline, PipelineItem
+from app.services.pipeline.content_cache import ContentCache, content_fingerprint, pipeline_versions
+from app.services.pipeline.jsonl_runner import run_jsonl
+
+
+def _pkt(i: int, title: str = "t") -> ListingRawPacket:
+    meta = Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=IFACE_INGEST_RAW_VER, trace_id="t", producer="test")
+    return ListingRawPacket(meta=meta, data=ListingRaw(source="olx", source_listing_id=f"x{i}", title=title, phone_raw=f"+38067{i:07d}"))
+
+
+class FakeRepo:
+    def __init__(self) -> None:
+        self.rows: dict[str, str] = {}
+
+    def upsert_many(self, *, tenant_id: str, items) -> int:
+        self.rows.update(items)
+        return len(items)
+
+    def load_recent(self, *, tenant_id: str, max_age_s: float, limit: int):
+        return [(uid, fp, 1.0) for uid, fp in list(self.rows.items())[:limit]]
+
+
+def test_fingerprint_tracks_content_and_versions():
+    bl = BlacklistStore()
+    v1 = pipeline_versions(blacklist=bl)
+    a = content_fingerprint(_pkt(1).data, v1)
+    assert a == content_fingerprint(_pkt(1).data, v1)
+    assert a != content_fingerprint(_pkt(1, title="edited").data, v1)
+
+    bl.add_phone(phone_e164="+380670000009", category="FRAUD")
+    v2 = pipeline_versions(blacklist=bl)
+    assert v2 != v1
+    bl.add_phone(phone_e164="+380670000009", category="SCAM")
+    assert pipeline_versions(blacklist=bl) != v2  # same size, different profile
+    assert bl.remove_phone_hash(next(bl.phone_hashes()))
+    assert pipeline_versions(blacklist=bl) == v1  # same content, same version
+
+
+def test_versions_cover_phone_hash_settings_and_identity():
+    base = pipeline_versions()
+    assert base == pipeline_versions()
+    assert pipeline_versions(tenant_salt="other-salt") != base
+    assert pipeline_versions(region="PL") != base
+    assert "other-salt" not in pipeline_versions(tenant_salt="other-salt")
+
+    eng = pipeline_versions(identity=IdentityEngine())
+    assert eng != base and eng == pipeline_versions(identity=IdentityEngine())  # config, not state
+    policies = {**DEFAULT_POLICIES, "url": ("URL_FP_SHARED", SignalPolicy(weight=0.85, max_degree=10))}
+    assert pipeline_versions(identity=IdentityEngine(policies=policies)) != eng
+
+
+@pytest.mark.parametrize("store_cls", [BlacklistStore, CompactBlacklistStore])
+def test_list_version_is_content_not_history(store_cls):
+    a, b, c = store_cls(), store_cls(), store_cls()
+    a.add_phone(phone_e164="+380670000001")
+    a.add_phone(phone_e164="+380670000002")
+    b.add_phone(phone_e164="+380670000003")
+    b.add_phone(phone_e164="+380670000002")
+    b.add_phone(phone_e164="+380670000001")
+    b.remove_phone_hash(phone_hash_e164("+380670000003"))
+    c.add_phone(phone_e164="+380670000001")
+    c.add_phone(phone_e164="+380670000004")
+    assert a.version == b.version  # different insertion order and mutation count
+    assert a.version != c.version  # same size, different phones
+
+
+def test_ttl_lru_and_skip_ratio():
+    cache = ContentCache(maxsize=2)
+    cache.record("a", "f1")
+    assert cache.is_unchanged("a", "f1") and not cache.is_unchanged("a", "f2")
+    cache.record("b", "f")
+    cache.record("c", "f")  # evicts "a"
+    assert not cache.is_unchanged("a", "f1")
+    assert cache.stats.evicted == 1 and (cache.stats.checked, cache.stats.skipped) == (3, 1)
+
+    expired = ContentCache(ttl_s=0)
+    expired.record("a", "f")
+    assert not expired.is_unchanged("a", "f") and expired.stats.expired == 1
+
+
+def test_repo_flush_and_warm_start():
+    repo = FakeRepo()
+    cache = ContentCache(repo=repo)
+    cache.record("a", "f1")
+    cache.record("a", "f2")
+    assert cache.flush() == 2 and repo.rows == {"a": "f2"} and cache.pending == 0
+
+    restarted = ContentCache(repo=repo)
+    assert restarted.warm() == 1
+    assert restarted.is_unchanged("a", "f2")
+
+
+def test_restart_with_edited_same_size_list_reevaluates(tmp_path: Path):
+    lines = [_pkt(i).model_dump_json() for i in range(3)]
+    for phone, name in (("+380670000000", "a.json"), ("+380670000001", "b.json")):
+        bl = BlacklistStore()
+        bl.add_phone(phone_e164=phone, category="FRAUD")
+        bl.save_json(tmp_path / name)
+
+    repo = FakeRepo()
+    run_jsonl(lines, io.StringIO(), blacklist=BlacklistStore.load_json(tmp_path / "a.json"), content_cache=ContentCache(repo=repo))
+
+    # "restart": fresh process state, fingerprints warmed from the repo
+    same = ContentCache(repo=repo)
+    same.warm()
+    report = run_jsonl(lines, io.StringIO(), blacklist=BlacklistStore.load_json(tmp_path / "a.json"), content_cache=same)
+    assert (report.processed, report.skipped) == (0, 3)
+
+    edited = ContentCache(repo=repo)
+    edited.warm()
+    report = run_jsonl(lines, io.StringIO(), blacklist=BlacklistStore.load_json(tmp_path / "b.json"), content_cache=edited)
+    assert (report.processed, report.skipped) == (3, 0)
+
+
+def test_jsonl_runner_skips_unchanged_listings():
+    lines = [_pkt(i).model_dump_json() for i in range(5)]
+    cache = ContentCache()
+    run_jsonl(lines, io.StringIO(), content_cache=cache)
+
+    changed = [_pkt(0, title="new").model_dump_json()] + lines[1:]
+    out = io.StringIO()
+    report = run_jsonl(changed, out, content_cache=cache)
+    assert (report.processed, report.skipped) == (1, 4)
+    assert out.getvalue().count("\n") == 1
+
+
+def test_async_pipeline_skips_unchanged_listings():
+    sunk: list[PipelineItem] = []
+
+    async def sink(item: PipelineItem) -> None:
+        sunk.append(item)
+
+    repo = FakeRepo()
+    pipe = AsyncPipeline(sink=sink, content_cache=ContentCache(repo=repo))
+    asyncio.run(pipe.run([_pkt(i) for i in range(4)]))
+    stats = asyncio.run(pipe.run([_pkt(i) for i in range(4)] + [_pkt(9)]))
+
+    assert (stats.skipped, stats.sunk) == (4, 1)
+    assert len(sunk) == 5 and len(repo.rows) == 5  # flushed at the end of each run
+
+# END_OF_FILE
@@ -48,3 +48,161 @@ def test_accept_clean_text():
     eng = DecisionEngine(lists)
     res = eng.decide({"phone_e164": "", "text": "Сдам квартиру, собственник. Центр."})
     assert res.action == "ACCEPT"
+
+
+def test_compiled_rules_match_legacy_first_hit_semantics():
+    import re
+
+    from app.services.decision.engine import AGENT_PATTERNS, FRAUD_PATTERNS
+    from app.services.decision.rules import CompiledPatternSet
+
+    def legacy(text: str, patterns: list[str]):
+        for p in patterns:
+            if re.search(p, text, flags=re.IGNORECASE):
+                return p
+        return None
+
+    rules = CompiledPatternSet({"agent": AGENT_PATTERNS, "fraud": FRAUD_PATTERNS})
+    texts = [
+        "",
+        "сдам квартиру, собственник",
+        "агентство недвижимости, комиссия 50%",
+        "комиссия агентства не берется",           # later agent pattern appears first in text
+        "перевод на карту, агент",                 # fraud match spans over an agent word
+        "нужен задаток и предоплата",
+        "посредник. перевод только на  карту",
+        "риелтор",
+    ]
+    for t in texts:
+        hits = rules.first_hits(t)
+        assert hits["agent"] == legacy(t, AGENT_PATTERNS), t
+        assert hits["fraud"] == legacy(t, FRAUD_PATTERNS), t
+
+
+def test_stem_prefilter_matches_like_ignorecase():
+    import re
+
+    from app.services.decision.rules import CompiledPatternSet
+
+    patterns = {
+        "case": [r"\bİstanbul\b", r"\bsale\b", r"\bKmh\b", r"\bавтор"],  # "İ"/"I", "ſ"/"s", Kelvin sign, "ᲀ"/"в"
+        "nested": [r"\bнтст", r"агентство", r"агент\b", r"гент(ы)?\b", r"нтура", r"(?:x)y+z"],  # nested/overlapping stems, no stem
+    }
+    rules = CompiledPatternSet(patterns)
+    texts = [
+        "ISTANBUL", "istanbul", "İSTANBUL", "ſale today", "SALE", "\u212amh", "kmh", "аᲀтор", "АВТОР",
+        "агентство", "АГЕНТСТВО нтсти", "агент", "агенты", "агентура", "xyyz", "нет совпадений",
+    ]
+    for t in texts:
+        for g, ps in patterns.items():
+            legacy = next((p for p in ps if re.search(p, t, flags=re.IGNORECASE)), None)
+            assert rules.first_hits(t)[g] == legacy, (t, g)
+    assert rules.first_hits("ISTANBUL")["case"] == r"\bİstanbul\b"  # lowercasing would have skipped it
+    assert rules.first_hits("ſale")["case"] == r"\bsale\b"
+    assert rules.first_hits("аᲀтор")["case"] == r"\bавтор"
+
+
+def test_decide_reports_first_pattern_in_list_order():
+    lists = InMemoryListsFacade(black_phones=set(), white_phones=set())
+    eng = DecisionEngine(lists)
+    res = eng.decide({"phone_e164": "", "text": "Комиссия 3%, посредник, перевод на карту"})
+    assert res.evidence["agent_pattern"] == r"\bкомисси(я|онные)\b"
+    assert res.evidence["fraud_pattern"] == r"\bперевод\b.*\bна\s*карт"
+
+
+def test_literal_stem_extraction_is_conservative():
+    from app.services.decision.rules import literal_stem
+
+    assert literal_stem(r"\bагент(ство)?\b") == "агент"
+    assert literal_stem(r"\bперевод\b.*\bна\s*карт") == "перевод"
+    assert literal_stem(r"abcd?") == "abc"          # optional last char is not required
+    assert literal_stem(r"foo|bar") is None          # top-level alternation: no single stem
+    assert literal_stem(r"(?:x)yz") is None          # leading group: always evaluated
+
+
+def test_decide_many_matches_decide_per_listing():
+    lists = InMemoryListsFacade(black_phones={"+380991112233", "+380990000000"}, white_phones={"+380990000000", "+380501234567"})
+    eng = DecisionEngine(lists)
+    listings = [
+        {"phone_e164": "+380991112233", "text": "Any"},
+        {"phone_e164": " +380990000000 ", "text": "агент"},   # whitelist wins over blacklist
+        {"phone_e164": "+380501234567", "text": "Owner"},
+        {"phone_e164": "", "text": "  Комиссия\t3%,\n  ПОСРЕДНИК  "},
+        {"phone_e164": None, "text": "Предоплата, перевод на карту"},
+        {"text": "Квартира от хозяина"},
+        {"phone_e164": "+380671111111", "text": None},
+        {"phone_e164": "+380671111111", "text": "a\x00b задаток"},  # separator inside text -> per-item fallback
+    ]
+    batch = eng.decide_many(listings)
+
+    assert len(batch) == len(listings)
+    assert batch.rule_pack_version == "builtin"
+    assert [r.model_dump() for r in batch] == [eng.decide(x).model_dump() for x in listings]
+    assert batch.action[:3] == ["DROP", "DROP", "DROP"]
+    assert batch.hard_block[:3] == [True, True, True]
+    assert eng.decide_many([]).action == []
+
+
+def test_store_lists_facade_resolves_lookups_once():
+    from app.services.decision.lists_facade import StoreListsFacade
+    from app.services.lists.blacklist_store import BlacklistStore
+
+    class PhoneSetStore:
+        def __init__(self, phones):
+            self.phone_e164_set = set(phones)
+
+    class MethodStore:
+        def __init__(self, phones):
+            self._phones = set(phones)
+
+        def has_phone(self, phone_e164):
+            return phone_e164 in self._phones
+
+    bl = BlacklistStore()
+    bl.add_phone(phone_e164="+380991112233")
+    for black, kind in (
+        (bl, "hash_method"),
+        (PhoneSetStore({"+380991112233"}), "set"),
+        (MethodStore({"+380991112233"}), "method"),
+    ):
+        f = StoreListsFacade(blacklist_store=black, whitelist_store=None)
+        assert f.black.kind == kind
+        assert f.is_blacklisted_phone("+380991112233") is True
+        assert f.is_blacklisted_phone("+380990000000") is False
+        assert f.blacklisted_many(["+380991112233", "+380990000000"]) == {"+380991112233"}
+        assert f.is_whitelisted_phone("+380991112233") is False
+        assert f.whitelisted_many(["+380991112233"]) == set()
+
+    res = DecisionEngine(StoreListsFacade(blacklist_store=bl, whitelist_store=None)).decide({"phone_e164": "+380991112233", "text": ""})
+    assert RC_BLACKLIST_PHONE in res.reason_codes
+
+
+def test_store_lists_facade_keeps_empty_set_live():
+    from app.services.decision.lists_facade import StoreListsFacade
+
+    class PhoneSetStore:
+        def __init__(self):
+            self.phone_e164_set = set()
+
+    store = PhoneSetStore()
+    f = StoreListsFacade(blacklist_store=store, whitelist_store=None)
+    assert f.black.kind == "set"
+    store.phone_e164_set.add("+380991112233")
+    assert f.is_blacklisted_phone("+380991112233") is True
+    assert f.blacklisted_many(["+380991112233", "+380990000000"]) == {"+380991112233"}
+
+
+def test_store_lists_facade_skips_non_bool_methods():
+    from app.services.decision.lists_facade import StoreListsFacade
+    from app.services.lists.blacklist_store import BlacklistStore
+
+    class EntryStore(BlacklistStore):
+        def match_phone(self, phone_e164):  # returns an entry or None, not a bool
+            return {"phone": phone_e164} if phone_e164 == "+380990000000" else None
+
+    store = EntryStore()
+    store.add_phone(phone_e164="+380991112233")
+    f = StoreListsFacade(blacklist_store=store, whitelist_store=None)
+    assert f.black.kind == "hash_method"
+    assert f.is_blacklisted_phone("+380991112233") is True
+    assert f.is_blacklisted_phone("+380990000000") is False
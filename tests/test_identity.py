@@ -0,0 +1,127 @@
+# File: tests/test_identity.py
+# Version: v0.1.2
+# Changes: a shared name alone never merges sellers (exact count); save() compresses outside the assign lock;
+#          re-assigning one listing does not trip the hub guard
+# Purpose: union-find + incremental multi-signal identity clustering (linking, hub guard, persistence)
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.core.contracts import ListingCanonical
+from app.services.identity.engine import IdentityEngine, text_fingerprint, url_fingerprint
+from app.services.identity.union_find import UnionFind
+
+_TEXT = "Продам двокімнатну квартиру в центрі, поруч парк і метро, свіжий ремонт"
+
+
+def _listing(i: int, *, phone: str = None, name: str = None, text: str = "", url: str = None) -> ListingCanonical:
+    return ListingCanonical(
+        listing_uid=f"olx:{i}", source="olx", source_listing_id=str(i), url=url,
+        title="", description=text, phone_hash=phone, contact_name_norm=name,
+    )
+
+
+def test_union_find_sizes_and_compression():
+    uf = UnionFind()
+    for _ in range(6):
+        uf.add()
+    uf.union(0, 1)
+    uf.union(2, 3)
+    assert uf.union(1, 3) == uf.find(0)
+    assert uf.set_size(2) == 4 and uf.set_size(5) == 1
+    uf.compress()
+    assert all(uf._parent[x] == uf.find(0) for x in range(4))
+
+
+def test_fingerprints_ignore_noise():
+    assert text_fingerprint("", _TEXT) == text_fingerprint("", _TEXT.upper().replace(",", " ") + " 45000$")
+    assert text_fingerprint("", "short text") is None
+    assert url_fingerprint("https://www.olx.ua/d/obyavlenie/abc/?utm=1#x") == "olx.ua/d/obyavlenie/abc"
+    assert url_fingerprint("https://olx.ua/") is None
+
+
+def test_rotating_phones_are_linked_through_text_and_name():
+    eng = IdentityEngine()
+    a = eng.assign(_listing(1, phone="p1", text=_TEXT))
+    b = eng.assign(_listing(2, phone="p2", text=_TEXT + ", 45000 $"))  # digits/punctuation -> same text key
+    c = eng.assign(_listing(3, phone="p3"))
+
+    assert a.cluster_id == b.cluster_id != c.cluster_id
+    assert "TEXT_NEAR_DUP" in b.signals and b.confidence == pytest.approx(0.95)
+    assert eng.cluster_size("phone", "p2") == 3  # p1, p2, text key
+
+    d = eng.assign(_listing(4, phone="p3", text=_TEXT))  # bridges two clusters
+    assert "CLUSTERS_MERGED" in d.signals
+    assert eng.assign(_listing(5, phone="p1")).cluster_id == d.cluster_id == eng.assign(_listing(6, phone="p3")).cluster_id
+    assert eng.assign(_listing(7)).cluster_id is None
+
+
+def test_common_name_does_not_glue_sellers():
+    eng = IdentityEngine()
+    ids = {eng.assign(_listing(i, phone=f"p{i}", name="ivan")).cluster_id for i in range(60)}
+    assert len(ids) == 60  # a shared first name alone never merges two sellers
+    assert "CONTACT_NAME_SHARED_HUB_IGNORED" in eng.assign(_listing(99, phone="px", name="ivan")).signals
+
+    a = eng.assign(_listing(100, phone="q1", name="petro"))
+    b = eng.assign(_listing(101, phone="q2", name="petro"))
+    assert a.cluster_id != b.cluster_id and "CONTACT_NAME_SHARED_NOT_MERGED" in b.signals
+    c = eng.assign(_listing(102, phone="q1", name="petro"))  # name corroborates a shared phone
+    assert c.cluster_id == a.cluster_id and "CONTACT_NAME_SHARED" in c.signals
+    assert eng.assign(_listing(103, name="petro")).cluster_id == a.cluster_id  # name only: joins, merges nothing
+    assert eng.cluster_size("phone", "q2") == 1
+
+
+def test_recrawled_listing_counts_once_towards_hub_guard(tmp_path: Path):
+    eng = IdentityEngine(path=tmp_path / "clusters.bin", persist_every_s=3600)
+    again = _listing(1, name="ivan", url="https://olx.ua/a/1")
+    for _ in range(60):  # crawlers resend the same listing many times a day
+        res = eng.assign(again)
+    assert res.cluster_id is not None and not any(s.endswith("_HUB_IGNORED") for s in res.signals)
+    other = eng.assign(_listing(2, url="https://olx.ua/a/1"))
+    assert other.cluster_id == res.cluster_id and "URL_FP_SHARED" in other.signals
+
+    eng.save(eng.path)
+    loaded = IdentityEngine.load(eng.path)
+    assert loaded.assign(again).cluster_id == res.cluster_id and len(loaded._listings) == 2
+    for i in range(3, 3 + 48):  # 50 distinct listings on the URL is still below the guard
+        assert "URL_FP_SHARED" in loaded.assign(_listing(i, url="https://olx.ua/a/1")).signals
+    assert "URL_FP_SHARED_HUB_IGNORED" in loaded.assign(_listing(99, url="https://olx.ua/a/1")).signals
+
+
+def test_save_compresses_outside_the_assign_lock(tmp_path: Path, monkeypatch):
+    eng = IdentityEngine(path=tmp_path / "clusters.bin", persist_every_s=3600)
+    for i in range(10):
+        eng.assign(_listing(i, phone=f"p{i % 3}", url=f"https://olx.ua/a/{i}"))
+    held = []
+    real_compress = UnionFind.compress
+
+    def compress(uf):
+        held.append(eng._lock.locked())
+        real_compress(uf)
+
+    monkeypatch.setattr(UnionFind, "compress", compress)
+    eng.save(eng.path)
+    assert held == [False]
+    assert [eng._uf.find(x) for x in range(len(eng))] == [IdentityEngine.load(eng.path)._uf._parent[x] for x in range(len(eng))]
+
+
+def test_state_round_trip(tmp_path: Path):
+    path = tmp_path / "identity" / "clusters.bin"
+    eng = IdentityEngine(path=path, persist_every_s=0)
+    first = eng.assign(_listing(1, phone="p1", url="https://olx.ua/a/1"))
+    eng.assign(_listing(2, phone="p2", url="https://olx.ua/a/1?ref=x"))
+    assert path.exists()  # persist_if_due with interval 0
+
+    loaded = IdentityEngine.load(path)
+    assert len(loaded) == len(eng)
+    assert loaded.assign(_listing(3, phone="p2")).cluster_id == first.cluster_id
+    assert len(IdentityEngine.load(tmp_path / "missing.bin")) == 0
+
+    path.write_bytes(b"garbage" * 10)
+    with pytest.raises(ValueError):
+        IdentityEngine.load(path)
+
+# END_OF_FILE
@@ -0,0 +1,128 @@
+# File: tests/test_import_delta.py
+# Version: v0.1.1
+# Changes: rows owned by another source are conflicts; removed compact-store slots are reused
+# Purpose: delta list import (diff summary, source-scoped removals, store removal paths)
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.crypto import phone_hash_e164
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistStore
+from app.services.lists.compact_store import CompactBlacklistStore, PhoneHashIndex
+from app.services.lists.import_delta import import_csv_delta
+from app.services.lists.import_stream import StoreSink, import_csv_stream
+
+
+def _write(path: Path, rows) -> None:
+    path.write_text("phone,category,notes\n" + "".join(f"{p},{c},{n}\n" for p, c, n in rows), encoding="utf-8")
+
+
+def _phone(i: int) -> str:
+    return f"+38099{i:07d}"
+
+
+@pytest.mark.parametrize("store_cls", [CompactBlacklistStore, BlacklistStore])
+def test_delta_reimport_applies_only_changes(tmp_path: Path, store_cls):
+    base = [(_phone(i), "FRAUD", f"n{i}") for i in range(100)]
+    path = tmp_path / "agency.csv"
+    _write(path, base)
+    store = store_cls()
+    import_csv_stream(path, StoreSink(store, target="blacklist"), target="blacklist", source="agency_a")
+    store.add_entry(BlacklistEntry(phone_hash=phone_hash_e164(_phone(500)), category="SPAM", source="manual"))
+
+    upd = base[:90] + [(_phone(500 + 1), "FRAUD", "new")]  # 10 dropped, 1 new
+    upd[3] = (_phone(3), "SCAM", "n3")
+    upd[4] = (_phone(4), "FRAUD", "moved")
+    upd.append((_phone(4), "FRAUD", "n4"))  # later duplicate restores the stored value
+    upd.append((_phone(500), "FRAUD", "agency says fraud"))  # owned by the manual entry: conflict
+    _write(path, upd)
+
+    diff = import_csv_delta(path, store, StoreSink(store, target="blacklist"), target="blacklist", source="agency_a")
+    s = diff.summary()
+    assert (s["added"], s["changed"], s["removed"], s["unchanged"], s["conflicts"]) == (1, 1, 10, 89, 1)
+    assert diff.conflicts == {phone_hash_e164(_phone(500))}
+    assert diff.report.imported == 12
+    assert len(store) == 100 - 10 + 1 + 1  # manual entry untouched
+    assert store.get_profile(phone_hash_e164(_phone(500)))[:3] == ("SPAM", "", "manual")
+    assert store.get_profile(phone_hash_e164(_phone(3)))[0] == "SCAM"
+    assert store.is_blacklisted_phone_hash(phone_hash_e164(_phone(500)))
+    assert not store.is_blacklisted_phone_hash(phone_hash_e164(_phone(95)))
+
+    again = import_csv_delta(path, store, StoreSink(store, target="blacklist"), target="blacklist", source="agency_a")
+    assert again.writes == 0 and again.unchanged == 91 and len(again.conflicts) == 1
+
+
+def test_delta_dry_run_writes_nothing(tmp_path: Path):
+    path = tmp_path / "a.csv"
+    _write(path, [(_phone(1), "FRAUD", "")])
+    store = CompactBlacklistStore()
+    diff = import_csv_delta(path, store, None, target="blacklist", source="agency_a")
+    assert diff.summary()["added"] == 1 and len(store) == 0
+
+
+def test_phone_hash_index_remove_keeps_probe_chains():
+    rnd = random.Random(7)
+    idx = PhoneHashIndex()
+    digests = [rnd.randbytes(32) for _ in range(3000)]
+    for d in digests:
+        idx.add(d)
+    removed = set(rnd.sample(range(len(digests)), 1500))
+    for i in removed:
+        assert idx.remove(digests[i]) >= 0
+    assert idx.remove(digests[next(iter(removed))]) == -1
+    assert len(idx) == 1500
+    for i, d in enumerate(digests):
+        assert (idx.find(d) >= 0) == (i not in removed)
+    assert sorted(idx.iter_digests()) == sorted(d for i, d in enumerate(digests) if i not in removed)
+
+    eid, created = idx.add(digests[next(iter(removed))])
+    assert created and idx.find(digests[next(iter(removed))]) == eid
+
+
+def test_compact_store_remove_round_trips_json(tmp_path: Path):
+    store = CompactBlacklistStore()
+    for i in range(5):
+        store.add_phone(phone_e164=_phone(i), category="FRAUD")
+    assert store.remove_phone_hash(phone_hash_e164(_phone(2)))
+    assert not store.remove_phone_hash(phone_hash_e164(_phone(2)))
+    assert not store.remove_phone_hash("zz")
+    p = tmp_path / "bl.json"
+    store.save_json(p)
+    loaded = CompactBlacklistStore.load_json(p)
+    assert len(loaded) == 4 and not loaded.is_blacklisted_phone_hash(phone_hash_e164(_phone(2)))
+    assert loaded.get_profile(phone_hash_e164(_phone(1)))[0] == "FRAUD"
+
+
+def test_compact_store_reuses_removed_slots():
+    store = CompactBlacklistStore()
+    with store.bulk():
+        for i in range(100):
+            store.add_phone(phone_e164=_phone(i), category="FRAUD")
+    for i in range(50):
+        assert store.remove_phone_hash(phone_hash_e164(_phone(i)))
+    store._index._merge()  # the next merge drops the dead keys (removals trigger it past n/8 stale keys)
+
+    for i in range(200, 250):
+        store.add_phone(phone_e164=_phone(i), category="SCAM", source="agency_b")
+    assert len(store) == 100 and len(store._profile) == len(store._added_at) == 100  # no new slots
+    assert store.get_profile(phone_hash_e164(_phone(210)))[:3] == ("SCAM", "", "agency_b")
+    assert store.get_profile(phone_hash_e164(_phone(60)))[0] == "FRAUD"
+    assert not store.is_blacklisted_phone_hash(phone_hash_e164(_phone(10)))
+
+    # delta-only entries are reusable at once
+    h = phone_hash_e164(_phone(245))
+    eid = store._index.find_hex(h)
+    store.remove_phone_hash(h)
+    store.add_phone(phone_e164=_phone(300), category="FRAUD")
+    assert store._index.find_hex(phone_hash_e164(_phone(300))) == eid
+
+    fresh = CompactBlacklistStore()
+    for e in store.entries():
+        fresh.add_entry(e)
+    assert fresh.version == store.version
+
+# END_OF_FILE
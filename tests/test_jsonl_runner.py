@@ -0,0 +1,94 @@
+# File: tests/test_jsonl_runner.py
+# Version: v0.1.2
+# Changes: stage latencies are per record (chunk time / chunk records);
+#          percentiles labelled as chunk means; skipped chunks count towards parse
+# Purpose: streaming JSONL runner (plain + gzip input, rejects, ordered decision output, bounded stats)
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta
+from app.main import IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.pipeline.content_cache import ContentCache
+from app.services.pipeline.jsonl_runner import open_input, run_jsonl
+from app.services.pipeline.stats import LatencyStats
+
+
+def _line(i: int, phone_raw: str) -> str:
+    pkt = ListingRawPacket(
+        meta=Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=IFACE_INGEST_RAW_VER, trace_id="dump", producer="test"),
+        data=ListingRaw(source="manual", source_listing_id=f"x{i}", phone_raw=phone_raw),
+    )
+    return pkt.model_dump_json()
+
+
+def _dump_lines() -> list[str]:
+    return [
+        _line(0, "+38 (067) 123-45-67"),
+        "{not json",
+        _line(1, "+38 (063) 555-44-33"),
+        "",
+        _line(2, "+38 (067) 123-45-67"),
+    ]
+
+
+def test_run_jsonl_writes_decisions_in_order():
+    bl = BlacklistStore()
+    bl.add_phone(phone_e164="+380671234567", category="FRAUD", source="test")
+
+    out = io.StringIO()
+    report = run_jsonl(iter(_dump_lines()), out, chunk_size=2, blacklist=bl)
+
+    rows = [json.loads(x) for x in out.getvalue().splitlines()]
+    assert [r["listing_uid"] for r in rows] == ["manual:x0", "manual:x1", "manual:x2"]
+    assert [r["data"]["action"] for r in rows] == ["BLOCK", "ALLOW", "BLOCK"]
+
+    assert report.read == 4
+    assert report.processed == 3
+    assert report.rejected == 1
+    assert report.stages["decide"].count == 3  # records, not chunks
+    assert "stage=decide records=3 chunk-mean p50=" in report.format()
+
+
+def test_fully_cached_chunk_is_timed_as_parse_only():
+    cache = ContentCache()
+    run_jsonl(iter(_dump_lines()), io.StringIO(), chunk_size=2, content_cache=cache)
+
+    report = run_jsonl(iter(_dump_lines()), io.StringIO(), chunk_size=2, content_cache=cache)
+    assert report.processed == 0
+    assert report.stages["parse"].count == 3  # every parsed record, skipped chunks included
+    assert report.stages["decide"].count == 0
+
+
+def test_open_input_detects_gzip(tmp_path: Path):
+    p = tmp_path / "dump.jsonl"  # no .gz suffix on purpose: detection is by magic bytes
+    with gzip.open(p, "wt", encoding="utf-8") as f:
+        f.write("\n".join(_dump_lines()) + "\n")
+
+    out = io.StringIO()
+    with open_input(str(p)) as src:
+        report = run_jsonl(src, out, chunk_size=100)
+    assert report.processed == 3
+
+
+def test_latency_stats_memory_is_bounded():
+    st = LatencyStats(max_samples=100)
+    for i in range(10_000):
+        st.add(i / 1000.0)
+    assert st.count == 10_000
+    assert len(st._samples) == 100
+    assert 0.0 < st.percentile(50) < st.percentile(99) <= 9.999
+
+
+def test_latency_stats_chunk_timing_is_per_record():
+    st = LatencyStats()
+    st.add(0.5, 500)  # one chunk of 500 records in 0.5 s
+    st.add(0.3, 100)
+    assert st.count == 600 and st.total_s == 0.8
+    assert st.percentile(50) == 0.001 and st.percentile(99) == 0.003
+    assert st.summary_ms()["avg_ms"] == 0.8 / 600 * 1000.0
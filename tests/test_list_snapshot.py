@@ -0,0 +1,88 @@
+# File: tests/test_list_snapshot.py
+# Version: v0.1.2
+# Changes: digests sharing an 8-byte prefix (prefix-table lookups confirm the full digest);
+#          the prefix table is a file section used in place
+# Purpose: mmap list snapshots: round-trip, in-place lookups, matching parity with the dict stores
+
+from pathlib import Path
+
+import pytest
+import sys
+
+from app.core.crypto import phone_hash_e164
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistStore
+from app.services.lists.snapshot import MappedBlacklist, MappedWhitelist, write_snapshot
+from app.services.lists.whitelist_store import WhitelistStore
+
+
+class _Listing:
+    def __init__(self, phone_hash):
+        self.phone_hash = phone_hash
+
+
+def test_blacklist_snapshot_matches_dict_store(tmp_path: Path):
+    ref = BlacklistStore()
+    for i in range(500):
+        ref.add_phone(phone_e164=f"+38099{i:07d}", category=("FRAUD" if i % 2 else "SCAM"), source="vendor", store_phone_e164=(i == 3))
+    path = tmp_path / "bl.snap"
+    assert write_snapshot(path, ref, kind="blacklist") == 500
+
+    with MappedBlacklist(path) as snap:
+        assert len(snap) == 500
+        for i in range(520):
+            h = phone_hash_e164(f"+38099{i:07d}")
+            assert snap.is_blacklisted_phone_hash(h) == ref.is_blacklisted_phone_hash(h)
+            assert snap.match_listing(_Listing(h)) == ref.match_listing(_Listing(h))
+        for bad in (None, "", "x" * 64, "00" * 32, "ff" * 32):
+            assert snap.is_blacklisted_phone_hash(bad) is False
+
+        h3 = phone_hash_e164("+380990000003")
+        assert snap.get_entry(h3) == ref._by_phone_hash[h3]
+        assert sorted(snap.phone_hashes()) == sorted(ref.phone_hashes())
+        assert {e.phone_hash: e for e in snap.entries()} == {e.phone_hash: e for e in ref.entries()}
+
+
+def test_whitelist_snapshot_and_kind_check(tmp_path: Path):
+    wl = WhitelistStore()
+    wl.add_phone(phone_e164="+380991112233", label="PARTNER")
+    path = tmp_path / "wl.snap"
+    write_snapshot(path, wl, kind="whitelist")
+
+    with MappedWhitelist(path) as snap:
+        m = snap.match_listing(_Listing(phone_hash_e164("+380991112233")))
+        assert m.matched and m.evidence == ["label=PARTNER conf=1.0 source=manual"]
+
+    with pytest.raises(ValueError):
+        MappedBlacklist(path)
+
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError):
+        MappedWhitelist(path)
+
+
+def test_empty_snapshot(tmp_path: Path):
+    path = tmp_path / "empty.snap"
+    write_snapshot(path, BlacklistStore(), kind="blacklist")
+    with MappedBlacklist(path) as snap:
+        assert len(snap) == 0
+        assert not snap.is_blacklisted_phone_hash(phone_hash_e164("+380991112233"))
+
+
+def test_lookup_confirms_digests_sharing_a_prefix(tmp_path: Path):
+    prefix = "0123456789abcdef"
+    listed = [prefix + f"{i:048x}" for i in (1, 5, 9)] + ["ff" * 32]
+    ref = BlacklistStore()
+    for h in listed:
+        ref.add_entry(BlacklistEntry(phone_hash=h, category="FRAUD"))
+    path = tmp_path / "bl.snap"
+    write_snapshot(path, ref, kind="blacklist")
+
+    with MappedBlacklist(path) as snap:
+        assert all(snap.is_blacklisted_phone_hash(h) for h in listed)
+        for h in (prefix + f"{i:048x}" for i in (0, 3, 10)):
+            assert not snap.is_blacklisted_phone_hash(h)
+        assert [e.phone_hash for e in snap.entries()] == sorted(listed)
+        if sys.byteorder == "little":
+            assert isinstance(snap._prefixes, memoryview)  # bisected in the mapping, not copied
+        assert list(snap._prefixes) == sorted(int(h[:16], 16) for h in listed)
+    assert snap._mm.closed and not snap._views
@@ -0,0 +1,108 @@
+# File: tests/test_minhash.py
+# Version: v0.1.1
+# Changes: band merges are spread over inserts and keep every band sorted and complete
+# Purpose: MinHash/LSH near-duplicate index (edited reposts found, unrelated text not, persistence, identity link)
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.contracts import ListingCanonical
+from app.services.identity.engine import IdentityEngine
+from app.services.identity import minhash
+from app.services.identity.minhash import LshIndex, MinHasher, similarity
+
+_VOCAB = [f"слово{i}" for i in range(3000)]
+
+
+def _text(rnd: random.Random, n: int = 60) -> str:
+    return " ".join(rnd.choice(_VOCAB) for _ in range(n))
+
+
+def _edit(text: str, rnd: random.Random, edits: int = 2) -> str:
+    words = text.split()
+    for _ in range(edits):
+        words[rnd.randrange(len(words))] = "ред"
+    return " ".join(words)
+
+
+def test_signature_similarity_tracks_edits():
+    rnd = random.Random(1)
+    h = MinHasher()
+    a = _text(rnd)
+    assert similarity(h.signature(a), h.signature(a)) == 1.0
+    assert similarity(h.signature(a), h.signature(_edit(a, rnd))) > 0.6
+    assert similarity(h.signature(a), h.signature(_text(rnd))) < 0.2
+    assert h.signature("  ,, ") is None
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=48)
+
+
+def test_observe_groups_edited_reposts(tmp_path: Path):
+    rnd = random.Random(2)
+    idx = LshIndex()
+    originals = [_text(rnd) for _ in range(300)]
+    for i, t in enumerate(originals):
+        assert not idx.observe(f"olx:{i}", t).is_duplicate
+
+    found = 0
+    for i in range(50):
+        res = idx.observe(f"repost:{i}", _edit(originals[i], rnd))
+        found += res.is_duplicate and res.group == f"olx:{i}"
+    assert found >= 45
+    assert idx.observe("olx:3", "ignored").group == "olx:3"  # known doc: stored group
+
+    path = tmp_path / "lsh.bin"
+    idx.save(path)
+    loaded = LshIndex.load(path)
+    assert len(loaded) == len(idx)
+    assert loaded.query(originals[7])[0].doc_id == "olx:7"
+    assert loaded.observe("repost:x", _edit(originals[8], rnd, edits=1)).group == "olx:8"
+
+
+def test_band_merges_are_staggered_and_lossless(monkeypatch):
+    merges = []
+    real_merge = minhash._Band.merge
+
+    def tracked(band):
+        merges.append(len(idx))
+        real_merge(band)
+
+    monkeypatch.setattr(minhash._Band, "merge", tracked)
+    rnd = random.Random(3)
+    idx = LshIndex()
+    texts = [_text(rnd, 12) for _ in range(3000)]
+    for i, t in enumerate(texts):
+        idx.observe(f"d:{i}", t)
+
+    assert len(merges) >= idx.bands  # every band merged at least once...
+    assert len(set(merges)) == len(merges)  # ...but never two on the same observe()
+    for band in idx._bands:
+        assert list(band.keys) == sorted(band.keys)
+        assert len(band.keys) + band.delta_n == len(texts)
+    for i in range(0, 3000, 97):
+        assert idx.query(texts[i], threshold=1.0)[0].doc_id == f"d:{i}"
+
+
+def test_identity_engine_links_edited_reposts_through_lsh(tmp_path: Path):
+    rnd = random.Random(3)
+    text = _text(rnd)
+
+    def listing(i: int, phone: str, description: str) -> ListingCanonical:
+        return ListingCanonical(listing_uid=f"olx:{i}", source="olx", source_listing_id=str(i), description=description, phone_hash=phone)
+
+    path = tmp_path / "identity.bin"
+    eng = IdentityEngine(path=path, near_dup=LshIndex())
+    a = eng.assign(listing(1, "p1", text))
+    b = eng.assign(listing(2, "p2", _edit(text, rnd)))
+    assert a.cluster_id == b.cluster_id and "TEXT_NEAR_DUP" in b.signals
+
+    eng.save(path)
+    loaded = IdentityEngine.load(path, with_near_dup=True)
+    c = loaded.assign(listing(3, "p3", _edit(text, rnd)))
+    assert c.cluster_id == a.cluster_id
+
+# END_OF_FILE
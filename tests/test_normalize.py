@@ -0,0 +1,49 @@
+# File: tests/test_normalize.py
+# Version: v0.1.0
+# Purpose: country-aware phone normalization (trunk/country/international prefixes per region, batch API)
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.normalize import normalize_many, normalize_phone_e164
+
+
+@pytest.mark.parametrize(
+    "raw, region, expected",
+    [
+        ("+38 (099) 123-45-67", "UA", "+380991234567"),
+        ("0991234567", "UA", "+380991234567"),
+        ("991234567", "UA", "+380991234567"),
+        ("380991234567", "UA", "+380991234567"),
+        ("0048 123 456 789", "UA", "+48123456789"),
+        ("8 (916) 123-45-67", "RU", "+79161234567"),
+        ("79161234567", "RU", "+79161234567"),
+        ("810 380 99 123 45 67", "RU", "+380991234567"),
+        ("87011234567", "KZ", "+77011234567"),
+        ("8 029 123-45-67", "BY", "+375291234567"),
+        ("123 456 789", "PL", "+48123456789"),
+        ("+1 415 555 0100", "UA", "+14155550100"),
+        ("4915112345678", "UA", "+4915112345678"),  # unknown market without "+": legacy rule
+        ("067.123.45.67", "UA", "+380671234567"),
+        ("+380 99 123 45 67", "UA", "+380991234567"),
+        ("12", "UA", None),
+        ("abc", "UA", None),
+        ("", "UA", None),
+    ],
+)
+def test_normalize_phone_e164_by_region(raw, region, expected):
+    assert normalize_phone_e164(raw, region=region) == expected
+
+
+def test_normalize_many_matches_single_calls_in_order():
+    raws = ["0991234567", None, "+380991234567", "bad", "0991234567", "8 916 123 45 67"]
+    assert normalize_many(raws) == [normalize_phone_e164(r) for r in raws]
+    assert normalize_many(raws, region="RU")[-1] == "+79161234567"
+
+
+def test_unknown_region_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_phone_e164("0991234567", region="XX")
+
+# END_OF_FILE
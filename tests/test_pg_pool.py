@@ -0,0 +1,144 @@
+# File: tests/test_pg_pool.py
+# Version: v0.1.1
+# Changes: pool_stats labels never contain credentials (URI, query-string and keyword DSNs)
+# Purpose: shared Postgres connection pool (reuse, limits/wait metrics, health checks) with fake connections
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.services.storage.pg_pool import PgPool, PoolTimeout, _label, close_pools, get_pool, pool_stats
+
+
+class FakeConn:
+    def __init__(self) -> None:
+        self.closed = False
+        self.broken = False
+        self.dead = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, query: str, *a):
+        if self.dead:
+            raise OSError("server closed the connection")
+        return self
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _pool(**kw) -> tuple[PgPool, list[FakeConn]]:
+    opened: list[FakeConn] = []
+
+    def connect(dsn: str) -> FakeConn:
+        opened.append(FakeConn())
+        return opened[-1]
+
+    return PgPool("postgresql://u:secret@h/db", connect=connect, **kw), opened
+
+
+def test_reuses_connections_and_commits_or_rolls_back():
+    pool, opened = _pool(max_size=2)
+    with pool.connection() as c1:
+        pass
+    with pool.connection() as c2:
+        pass
+    assert c1 is c2 and len(opened) == 1 and c1.commits == 2
+
+    with pytest.raises(ValueError):
+        with pool.connection() as c3:
+            raise ValueError("boom")
+    assert c3 is c1 and c1.rollbacks == 1
+    assert pool.snapshot()["acquired"] == 3 and pool.snapshot()["idle"] == 1
+
+
+def test_exhausted_pool_waits_then_times_out():
+    pool, _ = _pool(max_size=1, timeout_s=0.05)
+    release = threading.Event()
+
+    def holder() -> None:
+        with pool.connection():
+            release.wait(1.0)
+
+    t = threading.Thread(target=holder)
+    t.start()
+    time.sleep(0.01)
+    with pytest.raises(PoolTimeout):
+        with pool.connection():
+            pass
+
+    threading.Timer(0.02, release.set).start()
+    pool.timeout_s = 1.0
+    with pool.connection():
+        pass
+    t.join()
+    st = pool.snapshot()
+    assert st["timeouts"] == 1 and st["waited"] == 2 and st["max_wait_s"] > 0.0 and st["opened"] == 1
+
+
+def test_dead_idle_and_broken_connections_are_replaced():
+    pool, opened = _pool(check_idle_s=0.0)
+    with pool.connection() as c1:
+        pass
+    c1.dead = True
+    with pool.connection() as c2:
+        c2.broken = True
+    assert c2 is not c1 and c1.closed and c2.closed
+    st = pool.snapshot()
+    assert st["checks_failed"] == 1 and st["discarded"] == 1 and st["in_use"] == 0 and st["idle"] == 0
+
+
+def test_idle_connections_above_min_size_are_closed():
+    pool, opened = _pool(min_size=1, max_size=3, max_idle_s=0.0)
+    with pool.connection():
+        with pool.connection():
+            pass
+    assert pool.snapshot()["idle"] == 1 and sum(c.closed for c in opened) == 1
+
+
+def test_get_pool_is_shared_per_dsn():
+    try:
+        a = get_pool("postgresql://x:pw@h1/db")
+        assert get_pool("postgresql://x:pw@h1/db") is a and get_pool("postgresql://x:pw@h2/db") is not a
+    finally:
+        close_pools()
+
+
+@pytest.mark.parametrize(
+    "dsn",
+    [
+        "postgresql://aicp:s3cret@db:5433/aicp",
+        "postgresql://aicp@db:5433/aicp?password=s3cret&sslmode=require",
+        "host=db port=5433 user=aicp password=s3cret dbname=aicp",
+    ],
+)
+def test_pool_stats_label_hides_credentials(dsn):
+    assert _label(dsn) == "db:5433/aicp"
+    try:
+        get_pool(dsn)
+        stats = pool_stats()
+        assert list(stats) == ["db:5433/aicp"]
+        assert "s3cret" not in repr(stats) and "aicp@" not in repr(stats)
+    finally:
+        close_pools()
+
+
+def test_pool_stats_labels_do_not_collide():
+    try:
+        get_pool("host=db user=a password=x dbname=aicp")
+        get_pool("host=db user=b password=y dbname=aicp")
+        assert sorted(pool_stats()) == ["db:5432/aicp", "db:5432/aicp#2"]
+    finally:
+        close_pools()
+    assert _label("not a dsn ===") == "<invalid dsn>"
+
+# END_OF_FILE
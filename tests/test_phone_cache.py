@@ -0,0 +1,68 @@
+# File: tests/test_phone_cache.py
+# Version: v0.1.0
+# Purpose: phone normalize+hash LRU (same results as uncached, LRU eviction, per-salt isolation, threads)
+
+from __future__ import annotations
+
+import threading
+
+from app.core.crypto import phone_hash_e164
+from app.core.normalize import normalize_phone_e164
+from app.core.phone_cache import PhoneHashCache, get_phone_cache
+
+
+def test_lookup_matches_uncached_and_counts_hits():
+    cache = PhoneHashCache(maxsize=10, tenant_salt="s1")
+    raw = "+38 (099) 123-45-67"
+    expected = (normalize_phone_e164(raw), phone_hash_e164(normalize_phone_e164(raw), tenant_salt="s1"))
+
+    assert cache.lookup(raw) == expected
+    assert cache.lookup(raw) == expected
+    assert cache.lookup("12") == (None, None)  # failed normalization is cached too
+    assert cache.lookup(None) == (None, None)  # not counted
+    assert cache.stats() == {"size": 2, "maxsize": 10, "hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = PhoneHashCache(maxsize=2)
+    cache.lookup("+380990000001")
+    cache.lookup("+380990000002")
+    cache.lookup("+380990000001")  # refresh
+    cache.lookup("+380990000003")  # evicts ...02
+    assert len(cache) == 2
+    cache.lookup("+380990000001")
+    cache.lookup("+380990000002")
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    disabled = PhoneHashCache(maxsize=0)
+    disabled.lookup("+380990000001")
+    assert len(disabled) == 0
+
+
+def test_caches_are_isolated_per_tenant_salt():
+    a, b = get_phone_cache("tenant-a"), get_phone_cache("tenant-b")
+    assert a is get_phone_cache("tenant-a") and a is not b
+    assert a.phone_hash("+380990000001") != b.phone_hash("+380990000001")
+
+
+def test_shared_across_threads():
+    cache = PhoneHashCache(maxsize=50)
+    phones = [f"+38099{i % 80:07d}" for i in range(2000)]
+    expected = {p: phone_hash_e164(p) for p in set(phones)}
+    bad = []
+
+    def work() -> None:
+        for p in phones:
+            if cache.phone_hash(p) != expected[p]:
+                bad.append(p)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not bad
+    assert cache.hits + cache.misses == 4 * len(phones)
+    assert len(cache) <= 50
+
+# END_OF_FILE
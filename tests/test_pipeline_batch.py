@@ -0,0 +1,88 @@
+# File: tests/test_pipeline_batch.py
+# Version: v0.1.0
+# Purpose: process_batch() returns the same decisions as the per-listing pipeline, in input order
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta
+from app.main import (
+    IFACE_DECISION_ID,
+    IFACE_DECISION_VER,
+    IFACE_INGEST_RAW_ID,
+    IFACE_INGEST_RAW_VER,
+    canonize,
+    canonize_batch,
+    decide,
+    decide_batch,
+    identity_cluster,
+    identity_cluster_batch,
+    process_batch,
+)
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.lists.whitelist_store import WhitelistStore
+
+
+def _raw_pkt(i: int, phone_raw: str | None, *, iface_version: str = IFACE_INGEST_RAW_VER) -> ListingRawPacket:
+    return ListingRawPacket(
+        meta=Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=iface_version, trace_id="page-1", producer="test"),
+        data=ListingRaw(source="manual", source_listing_id=f"x{i}", title="t", description="d", phone_raw=phone_raw),
+    )
+
+
+def _page() -> list[ListingRawPacket]:
+    return [
+        _raw_pkt(0, "+38 (067) 123-45-67"),  # blacklisted
+        _raw_pkt(1, "+38 (050) 000-00-01"),  # whitelisted
+        _raw_pkt(2, "+38 (063) 555-44-33"),  # unknown
+        _raw_pkt(3, None),                   # no phone
+        _raw_pkt(4, "+38 (067) 123-45-67"),  # repost of blacklisted phone
+    ]
+
+
+def _stores() -> tuple[BlacklistStore, WhitelistStore]:
+    bl = BlacklistStore()
+    bl.add_phone(phone_e164="+380671234567", category="FRAUD", source="test")
+    wl = WhitelistStore()
+    wl.add_phone(phone_e164="+380500000001", label="INTERNAL_AGENT", source="test")
+    return bl, wl
+
+
+def test_process_batch_matches_per_listing_pipeline():
+    bl, wl = _stores()
+    pkts = _page()
+
+    expected = []
+    for p in pkts:
+        c = canonize(p)
+        expected.append(decide(c, identity_cluster(c), blacklist=bl, whitelist=wl))
+
+    got = process_batch(pkts, blacklist=bl, whitelist=wl)
+
+    assert [d.data for d in got] == [d.data for d in expected]
+    assert [d.data.action.value for d in got] == ["BLOCK", "ALLOW", "ALLOW", "ALLOW", "BLOCK"]
+    assert all(d.meta.iface_id == IFACE_DECISION_ID and d.meta.iface_version == IFACE_DECISION_VER for d in got)
+    assert all(d.meta.trace_id == "page-1" for d in got)
+
+
+def test_staged_batch_functions_match_process_batch():
+    bl, wl = _stores()
+    pkts = _page()
+
+    canon = canonize_batch(pkts)
+    ident = identity_cluster_batch(canon)
+    staged = decide_batch(canon, ident, blacklist=bl, whitelist=wl)
+
+    assert [c.data.listing_uid for c in canon] == [f"manual:x{i}" for i in range(len(pkts))]
+    assert [d.data for d in staged] == [d.data for d in process_batch(pkts, blacklist=bl, whitelist=wl)]
+
+
+def test_process_batch_rejects_iface_mismatch():
+    pkts = _page() + [_raw_pkt(9, "+380671112233", iface_version="v9.9.9")]
+    with pytest.raises(ValueError):
+        process_batch(pkts)
+
+
+def test_process_batch_empty():
+    assert process_batch([]) == []
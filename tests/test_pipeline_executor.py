@@ -0,0 +1,61 @@
+# File: tests/test_pipeline_executor.py
+# Version: v0.1.0
+# Purpose: process-pool executor: worker-loaded lists, ordered results, parity with in-process runner
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta
+from app.main import IFACE_INGEST_RAW_ID, IFACE_INGEST_RAW_VER, process_batch
+from app.services.lists.blacklist_store import BlacklistStore
+from app.services.pipeline.executor import PipelineExecutor, run_jsonl_parallel
+from app.services.pipeline.jsonl_runner import chunked, run_jsonl
+
+
+def _pkts(n: int) -> list[ListingRawPacket]:
+    meta = Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=IFACE_INGEST_RAW_VER, trace_id="t", producer="test")
+    return [
+        ListingRawPacket(meta=meta, data=ListingRaw(source="manual", source_listing_id=f"x{i}", phone_raw=f"+38067{i:07d}"))
+        for i in range(n)
+    ]
+
+
+def _blacklist_file(tmp_path: Path) -> tuple[Path, BlacklistStore]:
+    bl = BlacklistStore()
+    for i in (3, 17, 42):
+        bl.add_phone(phone_e164=f"+38067{i:07d}", category="FRAUD", source="test")
+    p = tmp_path / "bl.json"
+    bl.save_json(p)
+    return p, bl
+
+
+def test_executor_packets_ordered_and_use_worker_lists(tmp_path: Path):
+    bl_path, bl = _blacklist_file(tmp_path)
+    pkts = _pkts(60)
+
+    with PipelineExecutor(workers=2, blacklist_path=bl_path, max_in_flight=3) as ex:
+        got = [d for part in ex.map_chunks(chunked(pkts, 7)) for d in part]
+
+    expected = process_batch(pkts, blacklist=bl)
+    assert [d.data for d in got] == [d.data for d in expected]
+    assert [i for i, d in enumerate(got) if d.data.action.value == "BLOCK"] == [3, 17, 42]
+
+
+def test_run_jsonl_parallel_matches_single_process(tmp_path: Path):
+    bl_path, bl = _blacklist_file(tmp_path)
+    lines = [p.model_dump_json() for p in _pkts(50)] + ["garbage"]
+
+    single = io.StringIO()
+    run_jsonl(lines, single, chunk_size=8, blacklist=bl)
+
+    parallel = io.StringIO()
+    report = run_jsonl_parallel(lines, parallel, workers=2, chunk_size=8, blacklist_path=bl_path)
+
+    def strip_ts(text: str) -> list[str]:
+        return [line.split('"meta"')[0] + line.split('"data"')[1] for line in text.splitlines()]
+
+    assert strip_ts(parallel.getvalue()) == strip_ts(single.getvalue())
+    assert report.processed == 50
+    assert report.rejected == 1
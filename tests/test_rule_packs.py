@@ -0,0 +1,85 @@
+# File: tests/test_rule_packs.py
+# Version: v0.1.0
+# Purpose: rule packs: validation, hot swap into running engines, file/settings reload, version in decisions
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.decision.engine import BUILTIN_RULE_PACK_VERSION, DecisionEngine, RC_AGENT_TEXT
+from app.services.decision.lists_facade import InMemoryListsFacade
+from app.services.decision.rule_packs import RulePack, RulePackHolder
+
+
+def _engine(holder: RulePackHolder | None = None) -> DecisionEngine:
+    return DecisionEngine(InMemoryListsFacade(black_phones=set(), white_phones=set()), rule_packs=holder)
+
+
+def test_default_engine_uses_builtin_pack():
+    res = _engine().decide({"phone_e164": "", "text": "риелтор"})
+    assert res.rule_pack_version == BUILTIN_RULE_PACK_VERSION
+    assert RC_AGENT_TEXT in res.reason_codes
+
+
+def test_swap_is_seen_by_all_engines_sharing_holder():
+    holder = RulePackHolder(RulePack.build(version="v1", agent=[r"\bриелтор\b"], fraud=[]))
+    e1, e2 = _engine(holder), _engine(holder)
+    text = {"phone_e164": "", "text": "Маклер, звоните"}
+
+    assert e1.decide(text).action == "ACCEPT"
+
+    prev = holder.swap(RulePack.build(version="v2", agent=[r"\bмаклер\b"], fraud=[]))
+    assert prev.version == "v1"
+
+    for eng in (e1, e2):
+        res = eng.decide(text)
+        assert res.action == "DROP"
+        assert res.rule_pack_version == "v2"
+        assert res.evidence["agent_pattern"] == r"\bмаклер\b"
+
+
+def test_bad_pack_is_rejected():
+    with pytest.raises(ValueError):
+        RulePack.build(version="bad", agent=["(unclosed"], fraud=[])
+    with pytest.raises(ValueError):
+        RulePack.from_json_obj({"version": "", "agent": []})
+    with pytest.raises(ValueError):
+        RulePack.from_json_obj({"version": "x", "agents": []})
+
+
+def test_reload_file_if_changed(tmp_path: Path):
+    p = tmp_path / "rules.json"
+    p.write_text(json.dumps({"version": "f1", "agent": [r"\bриелтор\b"], "fraud": []}), encoding="utf-8")
+
+    holder = RulePackHolder(RulePack.build(version="boot", agent=[], fraud=[]))
+    assert holder.reload_file_if_changed(p) is True
+    assert holder.current.version == "f1"
+    assert holder.reload_file_if_changed(p) is False  # unchanged file -> no recompile
+
+    p.write_text(json.dumps({"version": "f2", "agent": ["(broken"], "fraud": []}), encoding="utf-8")
+    os.utime(p, (1, 1))
+    with pytest.raises(ValueError):
+        holder.reload_file_if_changed(p)
+    assert holder.current.version == "f1"  # running pack kept
+
+
+def test_reload_from_settings_skips_same_version():
+    class FakeSettings:
+        value: object = None
+
+        def get_json(self, *, tenant_id: str, key: str):
+            return self.value
+
+    repo = FakeSettings()
+    holder = RulePackHolder(RulePack.build(version="boot", agent=[], fraud=[]))
+    assert holder.reload_from_settings(repo, tenant_id="default", key="decision.rule_pack") is False
+
+    repo.value = {"version": "s1", "agent": [], "fraud": [r"\bзадаток\b"]}
+    assert holder.reload_from_settings(repo, tenant_id="default", key="decision.rule_pack") is True
+    first = holder.current
+    assert holder.reload_from_settings(repo, tenant_id="default", key="decision.rule_pack") is False
+    assert holder.current is first
@@ -0,0 +1,94 @@
+# File: tools/bench_compact_store.py
+# Version: v0.1.0
+# Purpose: micro-benchmark: CompactBlacklistStore vs BlacklistStore lookups (ns/lookup, hits and misses) and memory per entry
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List
+
+# --- path bootstrap (allows: uv run python tools/bench_compact_store.py ...) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.lists.blacklist_store import BlacklistEntry, BlacklistStore  # noqa: E402
+from app.services.lists.compact_store import CompactBlacklistStore  # noqa: E402
+
+
+def _hashes(prefix: str, n: int) -> List[str]:
+    return [hashlib.sha256(f"{prefix}{i}".encode()).hexdigest() for i in range(n)]
+
+
+def _ns_per_call(fn: Callable[[str], Any], keys: List[str], repeat: int) -> float:
+    def loop() -> None:
+        for k in keys:
+            fn(k)
+
+    best = min(timeit.repeat(loop, number=1, repeat=repeat))
+    return best / len(keys) * 1e9
+
+
+def _bytes_per_entry(build: Callable[[], Any], n: int) -> float:
+    tracemalloc.start()
+    try:
+        store = build()
+        cur, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del store
+    return cur / n
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--list-size", type=int, default=300_000)
+    ap.add_argument("--lookups", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    listed = _hashes("in", args.list_size)
+    rnd = random.Random(1)
+    hits = rnd.sample(listed, min(args.lookups, len(listed)))
+    misses = _hashes("out", args.lookups)
+
+    def build_dict() -> BlacklistStore:
+        s = BlacklistStore()
+        for h in listed:
+            s.add_entry(BlacklistEntry(phone_hash=h, category="FRAUD", source="vendor"))
+        return s
+
+    def build_compact() -> CompactBlacklistStore:
+        s = CompactBlacklistStore()
+        with s.bulk():
+            for h in listed:
+                s.add_hash(h, label="FRAUD", source="vendor")
+        return s
+
+    t0 = time.perf_counter()
+    compact = build_compact()
+    load_s = time.perf_counter() - t0
+    ref = build_dict()
+
+    print(f"list_size={args.list_size} lookups={args.lookups} (random order, so cache misses count)")
+    for name, store in (("dict", ref), ("compact", compact)):
+        hit_ns = _ns_per_call(store.is_blacklisted_phone_hash, hits, args.repeat)
+        miss_ns = _ns_per_call(store.is_blacklisted_phone_hash, misses, args.repeat)
+        print(f"{name:8s} hit={hit_ns:7.0f} ns  miss={miss_ns:7.0f} ns")
+    print(f"compact  bulk load {load_s:.2f}s, nbytes={compact.nbytes / args.list_size:.1f} B/entry")
+    for name, build in (("dict", build_dict), ("compact", build_compact)):
+        print(f"{name:8s} retained {_bytes_per_entry(build, args.list_size):.1f} B/entry (tracemalloc)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
@@ -0,0 +1,71 @@
+# File: tools/bench_lists_facade.py
+# Version: v0.1.0
+# Purpose: micro-benchmark: per-call overhead of StoreListsFacade vs InMemoryListsFacade (ns/lookup).
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# --- path bootstrap (allows: uv run python tools/bench_lists_facade.py ...) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.decision.lists_facade import InMemoryListsFacade, StoreListsFacade  # noqa: E402
+
+
+class _SetStore:
+    def __init__(self, phones: set[str]) -> None:
+        self.phone_e164_set = phones
+
+
+class _MethodStore:
+    def __init__(self, phones: set[str]) -> None:
+        self._phones = phones
+
+    def is_blacklisted_phone(self, phone_e164: str) -> bool:
+        return phone_e164 in self._phones
+
+
+def _ns_per_call(fn: Callable[[str], Any], phones: List[str], repeat: int) -> float:
+    def loop() -> None:
+        for p in phones:
+            fn(p)
+
+    best = min(timeit.repeat(loop, number=1, repeat=repeat))
+    return best / len(phones) * 1e9
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--list-size", type=int, default=100_000)
+    ap.add_argument("--lookups", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    listed = {f"+38099{i:07d}" for i in range(0, args.list_size * 2, 2)}
+    phones = [f"+38099{i % (args.list_size * 2):07d}" for i in range(args.lookups)]  # ~50% hits
+
+    facades: Dict[str, Any] = {
+        "InMemoryListsFacade": InMemoryListsFacade(black_phones=listed, white_phones=set()),
+        "StoreListsFacade(set attr)": StoreListsFacade(blacklist_store=_SetStore(listed), whitelist_store=None),
+        "StoreListsFacade(method)": StoreListsFacade(blacklist_store=_MethodStore(listed), whitelist_store=None),
+    }
+
+    base = None
+    for name, f in facades.items():
+        single = _ns_per_call(f.is_blacklisted_phone, phones, args.repeat)
+        bulk = min(timeit.repeat(lambda: f.blacklisted_many(phones), number=1, repeat=args.repeat)) / len(phones) * 1e9
+        base = base or single
+        print(f"{name:<28} is_blacklisted_phone {single:7.1f} ns/call ({single / base:4.2f}x)  blacklisted_many {bulk:7.1f} ns/phone")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
@@ -0,0 +1,78 @@
+# File: tools/bench_phone_cache.py
+# Version: v0.1.0
+# Purpose: benchmark: phone normalize+hash cost per listing, uncached vs PhoneHashCache, on a duplicate-heavy sample
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# --- path bootstrap (allows: uv run python tools/bench_phone_cache.py ...) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.crypto import phone_hash_e164  # noqa: E402
+from app.core.normalize import normalize_phone_e164  # noqa: E402
+from app.core.phone_cache import PhoneHashCache  # noqa: E402
+
+_FORMATS = ("+380{}", "0{}", "+38 (0{}) ", "380{}")
+
+
+def _sample(listings: int, distinct: int, zipf_s: float, seed: int) -> List[str]:
+    """
+    Agents repost the same phones: phone popularity ~ 1 / rank^s, each phone written in 1-2 formats.
+    """
+    rnd = random.Random(seed)
+    weights = [1.0 / (rank ** zipf_s) for rank in range(1, distinct + 1)]
+    ranks = rnd.choices(range(distinct), weights=weights, k=listings)
+    fmts = [rnd.sample(_FORMATS, 2) for _ in range(distinct)]
+
+    def raw(rank: int) -> str:
+        number = f"{67 + rank % 30}{rank:07d}"
+        return fmts[rank][rnd.random() < 0.8].format(number)
+
+    return [raw(r) for r in ranks]
+
+
+def _run(fn: Callable[[str], object], phones: List[str]) -> float:
+    t0 = time.perf_counter()
+    for p in phones:
+        fn(p)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--listings", type=int, default=500_000)
+    ap.add_argument("--distinct", type=int, default=50_000, help="distinct phones in the sample")
+    ap.add_argument("--zipf", type=float, default=1.1, help="repost skew (higher = more duplicates)")
+    ap.add_argument("--cache-size", type=int, default=200_000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    phones = _sample(args.listings, args.distinct, args.zipf, args.seed)
+    print(f"sample: listings={len(phones)} distinct_raw={len(set(phones))}")
+
+    base = _run(lambda p: phone_hash_e164(normalize_phone_e164(p)), phones)
+    print(f"{'uncached':<22} {base / len(phones) * 1e9:8.0f} ns/listing  total {base:.3f}s")
+
+    for size in sorted({args.cache_size, max(1, args.cache_size // 20)}, reverse=True):
+        cache = PhoneHashCache(maxsize=size)
+        t = _run(cache.lookup, phones)
+        s = cache.stats()
+        print(
+            f"{f'cache(maxsize={size})':<22} {t / len(phones) * 1e9:8.0f} ns/listing  total {t:.3f}s  "
+            f"hit_rate={s['hit_rate']:.3f} speedup={base / t:4.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
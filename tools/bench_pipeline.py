@@ -0,0 +1,96 @@
+# File: tools/bench_pipeline.py
+# Version: v0.1.0
+# Purpose: benchmark per-listing pipeline calls vs process_batch() (records/sec + speedup).
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# --- path bootstrap (allows: uv run python tools/bench_pipeline.py ...) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.contracts import ListingRaw, ListingRawPacket, Meta  # noqa: E402
+from app.main import (  # noqa: E402
+    IFACE_INGEST_RAW_ID,
+    IFACE_INGEST_RAW_VER,
+    canonize,
+    decide,
+    identity_cluster,
+    process_batch,
+)
+from app.services.lists.blacklist_store import BlacklistStore  # noqa: E402
+from app.services.lists.whitelist_store import WhitelistStore  # noqa: E402
+
+
+def make_raw_packets(n: int, *, distinct_phones: int = 0, trace_id: str = "bench-trace") -> list[ListingRawPacket]:
+    """
+    distinct_phones=0 -> every listing has its own phone; N -> phones repeat (agent reposts).
+    """
+    now = datetime.now(timezone.utc)
+    meta = Meta.now(iface_id=IFACE_INGEST_RAW_ID, iface_version=IFACE_INGEST_RAW_VER, trace_id=trace_id, producer="bench")
+    out: list[ListingRawPacket] = []
+    for i in range(n):
+        k = i % distinct_phones if distinct_phones > 0 else i
+        raw = ListingRaw(
+            source="bench",
+            source_listing_id=f"b-{i}",
+            url=f"https://example.com/listing/b-{i}",
+            title="2к квартира, центр",
+            description="Сдам квартиру, собственник. Без комиссии.",
+            published_at=now,
+            price=1000.0 + i,
+            currency="USD",
+            contact_name="Owner",
+            phone_raw=f"+38 (067) {k // 10000 % 1000:03d}-{k // 100 % 100:02d}-{k % 100:02d}",
+        )
+        out.append(ListingRawPacket(meta=meta, data=raw))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20_000)
+    ap.add_argument("--batch-size", type=int, default=500)
+    ap.add_argument("--distinct-phones", type=int, default=0, help="0 = all phones distinct")
+    ap.add_argument("--blacklisted", type=int, default=100, help="how many of the bench phones are blacklisted")
+    args = ap.parse_args()
+
+    pkts = make_raw_packets(int(args.n), distinct_phones=int(args.distinct_phones))
+
+    blacklist = BlacklistStore()
+    whitelist = WhitelistStore()
+    for p in pkts[: int(args.blacklisted)]:
+        c = canonize(p).data
+        if c.phone_e164:
+            blacklist.add_phone(phone_e164=c.phone_e164, category="BENCH", source="bench")
+
+    t0 = time.perf_counter()
+    single = [decide(c, identity_cluster(c), blacklist=blacklist, whitelist=whitelist) for c in map(canonize, pkts)]
+    t_single = time.perf_counter() - t0
+
+    bs = max(1, int(args.batch_size))
+    t0 = time.perf_counter()
+    batched = []
+    for i in range(0, len(pkts), bs):
+        batched.extend(process_batch(pkts[i : i + bs], blacklist=blacklist, whitelist=whitelist))
+    t_batch = time.perf_counter() - t0
+
+    same = all(a.data.action == b.data.action and a.data.reasons == b.data.reasons for a, b in zip(single, batched))
+
+    n = len(pkts)
+    print(f"per-listing: n={n} {t_single:.3f}s {n / t_single:,.0f} rec/s")
+    print(f"process_batch: n={n} batch_size={bs} {t_batch:.3f}s {n / t_batch:,.0f} rec/s")
+    print(f"speedup={t_single / t_batch:.2f}x decisions_equal={same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
@@ -0,0 +1,204 @@
+# File: tools/load_leads_api.py
+# Version: v0.1.0
+# Purpose: load test for the lead delivery API (N CRM clients claim -> ack); reports sustained leads/sec per client
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# --- path bootstrap (allows: uv run python tools/load_leads_api.py ...) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx  # noqa: E402
+
+from app.services.leads.queue_repo import ClaimedLead  # noqa: E402
+
+
+class MemoryLeadsQueue:
+    """
+    In-process stand-in for LeadsQueueRepo (--backend memory): measures the API layer (routing,
+    NDJSON streaming, gzip, JSON parsing) without Postgres. Claims are FIFO under one lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Condition()
+        self._new: List[ClaimedLead] = []
+        self._head = 0
+        self._claimed: Dict[str, str] = {}  # lead_id -> claim_token
+
+    def enqueue_many(self, *, tenant_id: str, payloads: Sequence[Dict[str, Any]], ttl_days: Optional[int] = None) -> List[str]:
+        now = datetime.now(timezone.utc)
+        leads = [ClaimedLead(str(uuid.uuid4()), now, now + timedelta(days=ttl_days or 14), p) for p in payloads]
+        with self._lock:
+            self._new.extend(leads)
+            self._lock.notify_all()
+        return [lead.lead_id for lead in leads]
+
+    def claim_stream(self, *, tenant_id: str, limit: int, wait_seconds: float = 0.0, chunk_size: int = 1000) -> Tuple[str, int, Iterator[ClaimedLead]]:
+        token = str(uuid.uuid4())
+        with self._lock:
+            self._lock.wait_for(lambda: self._head < len(self._new), wait_seconds)
+            batch = self._new[self._head:self._head + limit]
+            self._head += len(batch)
+            for lead in batch:
+                self._claimed[lead.lead_id] = token
+        return token, len(batch), iter(batch)
+
+    def _settle(self, claim_token: str, lead_ids: Sequence[str]) -> int:
+        n = 0
+        with self._lock:
+            for lead_id in lead_ids:
+                if self._claimed.get(lead_id) == claim_token:
+                    del self._claimed[lead_id]
+                    n += 1
+        return n
+
+    def ack_delivered(self, *, tenant_id: str, claim_token: str, lead_ids: Sequence[str]) -> int:
+        return self._settle(claim_token, lead_ids)
+
+    def mark_failed_many(self, *, tenant_id: str, claim_token: str, lead_ids: Sequence[str], error: str) -> int:
+        return self._settle(claim_token, lead_ids)
+
+    def pending_count(self, *, tenant_id: str) -> int:
+        with self._lock:
+            return len(self._new) - self._head + len(self._claimed)
+
+
+@dataclass
+class ClientResult:
+    client: int
+    leads: int = 0
+    claims: int = 0
+    empty_claims: int = 0
+    wire_bytes: int = 0
+    elapsed_s: float = 0.0  # until the last ack: a drained queue does not dilute the rate
+    claim_ms: List[float] = field(default_factory=list)
+
+    @property
+    def leads_per_sec(self) -> float:
+        return self.leads / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def run_client(i: int, client: httpx.Client, args: argparse.Namespace, headers: Dict[str, str], stop_at: float) -> ClientResult:
+    res = ClientResult(client=i)
+    t0 = time.perf_counter()
+    while time.perf_counter() < stop_at:
+        t_claim = time.perf_counter()
+        ids: List[str] = []
+        with client.stream(
+            "POST", f"/api/leads/{args.tenant}/claim", params={"limit": args.limit, "wait_seconds": args.wait}, headers=headers
+        ) as r:
+            r.raise_for_status()
+            lines = r.iter_lines()
+            head = json.loads(next(lines))
+            for line in lines:
+                if line:
+                    ids.append(json.loads(line)["lead_id"])
+            res.wire_bytes += r.num_bytes_downloaded
+        res.claim_ms.append((time.perf_counter() - t_claim) * 1000.0)
+        res.claims += 1
+        if not ids:
+            res.empty_claims += 1
+            if args.wait <= 0:
+                time.sleep(0.05)
+            continue
+        r = client.post(f"/api/leads/{args.tenant}/ack", json={"claim_token": head["claim_token"], "lead_ids": ids}, headers=headers)
+        r.raise_for_status()
+        res.leads += r.json()["updated"]
+        res.elapsed_s = time.perf_counter() - t0
+    return res
+
+
+def _make_client(args: argparse.Namespace) -> httpx.Client:
+    if args.url:
+        return httpx.Client(base_url=args.url, timeout=args.wait + 30.0)
+    from fastapi.testclient import TestClient
+
+    from app.admin_api.main import app
+
+    return TestClient(app)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Lead delivery API load test (claim -> ack loop per CRM client)")
+    p.add_argument("--url", default=None, help="base URL of a running Admin API (default: in-process app)")
+    p.add_argument("--backend", choices=["memory", "pg"], default="memory", help="in-process app only: queue backend")
+    p.add_argument("--tenant", default="loadtest")
+    p.add_argument("--clients", type=int, default=4)
+    p.add_argument("--duration", type=float, default=10.0, help="seconds")
+    p.add_argument("--limit", type=int, default=500, help="leads per claim")
+    p.add_argument("--wait", type=float, default=1.0, help="claim long-poll seconds")
+    p.add_argument("--seed", type=int, default=200_000, help="leads enqueued before the run (0 = none)")
+    p.add_argument("--no-gzip", action="store_true")
+    args = p.parse_args()
+
+    headers = {"X-AICP-Role": "system", "X-AICP-Actor": "load-test"}
+    token = os.environ.get("AICP_ADMIN_TOKEN", "")
+    if token:
+        headers["X-AICP-Token"] = token
+    headers["Accept-Encoding"] = "identity" if args.no_gzip else "gzip"
+
+    if args.url is None:
+        from app.admin_api.main import app
+        from app.admin_api.routes.leads import get_leads_repo
+        from app.services.leads.queue_repo import LeadsQueueRepo
+
+        repo: Any = MemoryLeadsQueue() if args.backend == "memory" else LeadsQueueRepo()
+        app.dependency_overrides[get_leads_repo] = lambda: repo
+        if args.seed:
+            payload = {"listing_uid": "olx:123456789", "url": "https://example.com/obyavlenie/123456789", "title": "2-к квартира, центр", "score": 0.12}
+            for start in range(0, args.seed, 10_000):
+                repo.enqueue_many(tenant_id=args.tenant, payloads=[payload] * min(10_000, args.seed - start), ttl_days=1)
+    elif args.seed:
+        print("WARN: --seed is ignored with --url (enqueue through the pipeline or leads repo)", file=sys.stderr)
+
+    clients = [_make_client(args) for _ in range(max(1, args.clients))]
+    results: List[Optional[ClientResult]] = [None] * len(clients)
+    stop_at = time.perf_counter() + args.duration
+
+    def worker(i: int) -> None:
+        results[i] = run_client(i, clients[i], args, headers, stop_at)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(clients))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for c in clients:
+        c.close()
+
+    done = [r for r in results if r is not None]
+    total = sum(r.leads for r in done)
+    wall = max((r.elapsed_s for r in done), default=0.0)
+    for r in done:
+        p50 = statistics.median(r.claim_ms) if r.claim_ms else 0.0
+        print(
+            f"client={r.client} leads={r.leads} leads_per_sec={r.leads_per_sec:.0f} claims={r.claims} "
+            f"empty={r.empty_claims} claim_p50_ms={p50:.1f} wire_kb={r.wire_bytes / 1024:.0f}"
+        )
+    per_client = [r.leads_per_sec for r in done]
+    print(
+        f"OK: clients={len(done)} leads={total} total_leads_per_sec={total / wall if wall else 0.0:.0f} "
+        f"min_client={min(per_client, default=0.0):.0f} max_client={max(per_client, default=0.0):.0f} "
+        f"gzip={'off' if args.no_gzip else 'on'} backend={args.backend if args.url is None else args.url}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+# END_OF_FILE
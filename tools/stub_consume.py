@@ -1,6 +1,6 @@
 # File: tools/stub_consume.py
-# Version: v0.1.1
-# Changes: fix ruff E741 (rename l->lead); full file rewrite
+# Version: v0.2.0
+# Changes: --wait (long-poll claim via LISTEN/NOTIFY) and --follow (keep consuming)
 # Purpose: Claim leads from Postgres queue and optionally ACK them (simulate CRM/agency).
 
 from __future__ import annotations
@@ -25,12 +25,26 @@ def main() -> int:
     p.add_argument("--limit", type=int, default=10)
     p.add_argument("--ack", action="store_true", help="mark claimed leads as DELIVERED")
     p.add_argument("--pretty", action="store_true", help="pretty-print JSON payload")
+    p.add_argument("--wait", type=float, default=0.0, help="block up to N seconds for leads when the queue is empty")
+    p.add_argument("--follow", action="store_true", help="keep claiming (requires --wait); stop with Ctrl+C")
     args = p.parse_args()
+    if args.follow and args.wait <= 0:
+        p.error("--follow requires --wait")
 
     dsn = os.environ.get("AICP_PG_DSN")
     repo = LeadsQueueRepo(dsn=dsn)
 
-    claim_token, leads = repo.claim_batch(tenant_id=args.tenant, limit=int(args.limit))
+    try:
+        while True:
+            consume_once(repo, args)
+            if not args.follow:
+                return 0
+    except KeyboardInterrupt:
+        return 0
+
+
+def consume_once(repo: LeadsQueueRepo, args: argparse.Namespace) -> None:
+    claim_token, leads = repo.claim_batch(tenant_id=args.tenant, limit=int(args.limit), wait_seconds=args.wait)
 
     print(f"OK: claimed {len(leads)} leads tenant={args.tenant} claim_token={claim_token}")
 
@@ -49,8 +63,6 @@ def main() -> int:
         )
         print(f"OK: ack_delivered={n}")
 
-    return 0
-
 
 if __name__ == "__main__":
     raise SystemExit(main())